@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de FormatadorABNT.formatar_citacoes (vazão em MB/s)
+Compara com a implementação anterior de duas passagens e confere que a saída é idêntica
+
+Uso:
+    python benchmarks/bench_citacoes.py [--mb 5] [--repeticoes 3]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor_abnt import FormatadorABNT  # noqa: E402
+from sintetico import texto_corrido  # noqa: E402
+
+
+def formatar_citacoes_duas_passagens(texto):
+    """Implementação anterior (duas passagens de re.sub), mantida como referência"""
+
+    def converter_maiusculas(match):
+        conteudo = match.group(1)
+        autores = conteudo.split(';')
+        autores_formatados = []
+
+        for autor in autores:
+            autor = autor.strip()
+            partes = re.split(r'(,\s*\d{4})', autor, maxsplit=1)
+
+            if len(partes) >= 2:
+                nome = partes[0].strip()
+                resto = ''.join(partes[1:])
+                palavras = nome.split()
+                palavras_maiusculas = [
+                    p.lower() if p.lower() in ['et', 'al', 'al.'] else p.upper()
+                    for p in palavras
+                ]
+                autores_formatados.append(' '.join(palavras_maiusculas) + resto)
+            else:
+                palavras = autor.split()
+                palavras_maiusculas = [
+                    p.lower() if p.lower() in ['et', 'al', 'al.'] else p.upper()
+                    for p in palavras
+                ]
+                autores_formatados.append(' '.join(palavras_maiusculas))
+
+        return f"({'; '.join(autores_formatados)})"
+
+    padrao = r'\(([A-Za-zÀ-ÿ][A-Za-zÀ-ÿ\s,;]+\d{4}[a-z]?(?:,\s*p\.\s*\d+(?:-\d+)?)?)\)'
+    texto = re.sub(padrao, converter_maiusculas, texto)
+
+    def converter_et_al(match):
+        conteudo = match.group(1)
+        autores = conteudo.split(';')
+
+        if len(autores) >= 4:
+            primeiro = autores[0].strip()
+            primeiro = re.sub(r',\s*\d{4}.*$', '', primeiro).strip()
+
+            ano_match = re.search(r',\s*(\d{4}[a-z]?(?:,\s*p\.\s*\d+(?:-\d+)?)?)', conteudo)
+            if ano_match:
+                ano = ano_match.group(1)
+                return f"({primeiro} et al., {ano})"
+
+        return match.group(0)
+
+    return re.sub(
+        r'\(([A-ZÀ-Ü][A-Za-zÀ-ü]+(?:\s+[a-zà-ü]+)*(?:;\s*[A-ZÀ-Ü][A-Za-zÀ-ü]+(?:\s+[a-zà-ü]+)*){3,}[,\s]+\d{4}[a-z]?(?:,\s*p\.\s*\d+(?:-\d+)?)?)\)',
+        converter_et_al, texto
+    )
+
+
+def medir(funcao, texto, repeticoes):
+    """Retorna o melhor tempo entre as repetições"""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(texto)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--mb', type=float, default=5.0, help="tamanho do texto em MB")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    texto = texto_corrido(int(args.mb * 1024 * 1024))
+    megabytes = len(texto.encode('utf-8')) / (1024 * 1024)
+
+    esperado = formatar_citacoes_duas_passagens(texto)
+    obtido = FormatadorABNT.formatar_citacoes(texto)
+    if obtido != esperado:
+        print("❌ Saída diferente da implementação de duas passagens")
+        return 1
+
+    print(f"Texto: {megabytes:.2f} MB")
+    for nome, funcao in [
+        ('duas passagens', formatar_citacoes_duas_passagens),
+        ('passagem única', FormatadorABNT.formatar_citacoes),
+    ]:
+        tempo = medir(funcao, texto, args.repeticoes)
+        print(f"  {nome:<16} {tempo:8.3f}s  {megabytes / tempo:8.2f} MB/s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de citações com entradas patológicas (tempo linear) e conferência por fuzzing
+Mede formatar_citacoes e extrair_citacoes em famílias de entradas feitas para provocar
+retrocesso em expressões regulares (parênteses longos sem ano, listas enormes de
+autores, espaços repetidos...), dobrando o tamanho a cada rodada. Em tempo linear a
+razão entre rodadas consecutivas fica perto de 2; falha se alguma rodada passar de
+--limite segundos.
+
+--referencia mede também as expressões regulares anteriores (só nos tamanhos menores:
+algumas levam minutos). --fuzz N confere, em N textos aleatórios sobre um alfabeto de
+citações, que a varredura dá o mesmo resultado dessas expressões.
+
+Uso:
+    python benchmarks/bench_citacoes_adversarial.py [--tamanhos 2000 4000 8000 16000]
+                                                    [--limite 1.0] [--referencia]
+                                                    [--fuzz 20000] [--semente 0]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Expressões regulares anteriores, mantidas como referência
+_RE_CITACAO = re.compile(
+    r'\(([A-Za-zÀ-ÿ][A-Za-zÀ-ÿ\s,;]+\d{4}[a-z]?(?:,\s*p\.\s*\d+(?:-\d+)?)?)\)'
+)
+_RE_CITACAO_ET_AL = re.compile(
+    r'[A-ZÀ-Ü][A-Za-zÀ-ü]+(?:\s+[a-zà-ü]+)*(?:;\s*[A-ZÀ-Ü][A-Za-zÀ-ü]+(?:\s+[a-zà-ü]+)*){3,}'
+    r'[,\s]+\d{4}[a-z]?(?:,\s*p\.\s*\d+(?:-\d+)?)?'
+)
+_RE_OBRAS = re.compile(r'(?:^|;)\s*([^\d,;]+?)(?:;[^\d,;]+?)*,\s*(\d{4})[a-z]?')
+_RE_ET_AL = re.compile(r'\s+et\s+al\.?', re.IGNORECASE)
+
+# Alfabeto do fuzzing: o suficiente para formar (e quase formar) citações
+ALFABETO = 'AaSsilvEetp.;,-() \n\t12À ü'
+PEDACOS = ['Silva', 'SOUZA', ' et al.', ', 2021', '2020a', ', p. 10', '-12', '; ', '(', ')', ' da ', '  ']
+
+# Famílias de entradas patológicas: n -> texto
+FAMILIAS = {
+    'autores sem ano': lambda n: '(' + 'Silva; ' * n + 'Souza 2020)',
+    'autores curtos': lambda n: '(' + 'A;' * n + 'A)',
+    'autores com ano no fim': lambda n: '(' + 'Silva; ' * n + 'Souza, 2020)',
+    'parênteses sem fechar': lambda n: '(Silva, 2020' * n,
+    'parênteses aninhados': lambda n: '(' * n + 'Silva, 2020',
+    'espaços sem ano': lambda n: '(A' + ' ' * (8 * n) + ')',
+    'espaços antes de et': lambda n: '(Silva' + ' ' * (8 * n) + 'et, 2020)',
+    'partículas': lambda n: '(Silva; Souza; Costa; Lima' + ' da' * n + ', 20)',
+    'vírgulas': lambda n: '(Silva' + ',' * (8 * n) + ')',
+    'dígitos': lambda n: '(Silva, ' + '1' * (8 * n) + 'x)',
+    'páginas': lambda n: '(Silva, 2020, p. 1' + '-' * n + ')' + '(Silva, 2020, p.' * n,
+}
+
+
+def obras_referencia(conteudo):
+    return _RE_OBRAS.findall(conteudo)
+
+
+def conferir(texto):
+    """Lista das diferenças entre a varredura e as expressões regulares anteriores"""
+    from varredura_citacoes import e_citacao_et_al, obras_citadas, remover_et_al, varrer_citacoes
+
+    diferencas = []
+    if list(varrer_citacoes(texto)) != [m.span() for m in _RE_CITACAO.finditer(texto)]:
+        diferencas.append('varrer_citacoes')
+    if e_citacao_et_al(texto) != bool(_RE_CITACAO_ET_AL.fullmatch(texto)):
+        diferencas.append('e_citacao_et_al')
+    if obras_citadas(texto) != obras_referencia(texto):
+        diferencas.append('obras_citadas')
+    if remover_et_al(texto) != _RE_ET_AL.sub('', texto):
+        diferencas.append('remover_et_al')
+    return diferencas
+
+
+def texto_aleatorio(gerador):
+    """Texto curto misturando caracteres soltos e pedaços de citação"""
+    partes = []
+    for _ in range(gerador.randint(1, 12)):
+        if gerador.random() < 0.5:
+            partes.append(gerador.choice(PEDACOS))
+        else:
+            partes.append(''.join(gerador.choice(ALFABETO) for _ in range(gerador.randint(1, 4))))
+    return ''.join(partes)
+
+
+def fuzz(quantidade, semente):
+    """Confere quantidade textos aleatórios; retorna o número de divergências"""
+    gerador = random.Random(semente)
+    divergencias = 0
+    for _ in range(quantidade):
+        texto = texto_aleatorio(gerador)
+        # Também sem o '(' inicial e em maiúsculas (como chega a e_citacao_et_al)
+        for variante in (texto, texto.lstrip('('), texto.upper()):
+            diferencas = conferir(variante)
+            if diferencas:
+                divergencias += 1
+                if divergencias <= 10:
+                    print(f"❌ {', '.join(diferencas)}: {variante!r}")
+    return divergencias
+
+
+def cronometrar(funcao, texto):
+    inicio = time.perf_counter()
+    funcao(texto)
+    return time.perf_counter() - inicio
+
+
+def main():
+    from conferencia_citacoes import _obras_citacao, extrair_citacoes
+    from motor_abnt import FormatadorABNT
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[2000, 4000, 8000, 16000])
+    parser.add_argument('--limite', type=float, default=1.0, help="segundos por rodada")
+    parser.add_argument('--referencia', action='store_true',
+                        help="mede também as expressões regulares anteriores (até 4000)")
+    parser.add_argument('--fuzz', type=int, default=0, help="número de textos aleatórios")
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+
+    def atual(texto):
+        _obras_citacao.cache_clear()
+        FormatadorABNT.formatar_citacoes(texto)
+        for _ in extrair_citacoes(texto):
+            pass
+
+    def anterior(texto):
+        _RE_CITACAO.sub('', texto)
+        for match in re.finditer(r'\(([^()]+)\)', texto):
+            obras_referencia(match.group(1))
+
+    implementacoes = [('varredura', atual)]
+    if args.referencia:
+        implementacoes.append(('regex anterior', anterior))
+
+    estourou = False
+    print(f"{'família':<24} {'implementação':<15} {'n':>7} {'tempo (ms)':>11} {'razão':>6}")
+    for familia, construir in FAMILIAS.items():
+        for nome, funcao in implementacoes:
+            tempo_anterior = None
+            for n in args.tamanhos:
+                if nome != 'varredura' and n > 4000:
+                    break
+                tempo = cronometrar(funcao, construir(n))
+                razao = f"{tempo / tempo_anterior:6.1f}" if tempo_anterior else ''
+                print(f"{familia:<24} {nome:<15} {n:>7} {tempo * 1000:>11.2f} {razao:>6}")
+                tempo_anterior = max(tempo, 1e-6)
+                if nome == 'varredura' and tempo > args.limite:
+                    estourou = True
+
+        # A saída também tem que coincidir nas entradas patológicas
+        for n in args.tamanhos[:1]:
+            diferencas = conferir(construir(n))
+            if diferencas:
+                print(f"❌ {familia}: {', '.join(diferencas)}")
+                estourou = True
+
+    if estourou:
+        print(f"❌ Alguma rodada passou de {args.limite}s ou divergiu das expressões anteriores")
+        return 1
+
+    if args.fuzz:
+        divergencias = fuzz(args.fuzz, args.semente)
+        if divergencias:
+            print(f"❌ {divergencias} divergências em {args.fuzz} textos aleatórios")
+            return 1
+        print(f"✅ {args.fuzz} textos aleatórios com o mesmo resultado das expressões anteriores")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
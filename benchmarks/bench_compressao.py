@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark dos perfis de compressão de GeradorDocumentoABNT.salvar
+Mede a latência de salvar (mediana de várias repetições) e o tamanho do .docx para
+cada perfil, gravando em arquivo e em memória (salvar() devolvendo os bytes), em
+trabalhos sintéticos de 10, 100, 500 e 2000 páginas
+
+O documento é montado uma única vez por tamanho; só salvar é cronometrado.
+
+Uso:
+    python benchmarks/bench_compressao.py [--paginas 10 100 500 2000] [--repeticoes 5]
+                                          [--json resultados.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, 'benchmarks'))
+
+DESTINOS = ['arquivo', 'memoria']
+
+
+def medir(gerador, compressao, destino, repeticoes, pasta):
+    """Mediana do tempo de salvar e tamanho do documento gravado"""
+    caminho = os.path.join(pasta, 'trabalho.docx')
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        if destino == 'arquivo':
+            gerador.salvar(caminho, compressao)
+        else:
+            documento = gerador.salvar(compressao=compressao)
+        tempos.append(time.perf_counter() - inicio)
+
+    tamanho = os.path.getsize(caminho) if destino == 'arquivo' else len(documento)
+    return statistics.median(tempos), tamanho
+
+
+def main():
+    from motor_abnt import PERFIS_COMPRESSAO, gerar_trabalho
+    from sintetico import trabalho
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--paginas', type=int, nargs='+', default=[10, 100, 500, 2000])
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--json', help="grava os resultados em JSON")
+    args = parser.parse_args()
+
+    resultados = []
+    print(f"{'páginas':>8} {'perfil':<11} {'destino':<8} {'salvar (ms)':>12} {'.docx (KB)':>11}")
+    with tempfile.TemporaryDirectory() as pasta:
+        for paginas in args.paginas:
+            entrada = trabalho(paginas)
+            gerador = gerar_trabalho(
+                entrada['dados'], entrada['resumo'], entrada['palavras_chave'],
+                entrada['conteudo'], entrada['referencias']
+            )
+
+            for compressao in PERFIS_COMPRESSAO:
+                for destino in DESTINOS:
+                    tempo, tamanho = medir(gerador, compressao, destino, args.repeticoes, pasta)
+                    resultados.append({
+                        'paginas': paginas,
+                        'compressao': compressao,
+                        'destino': destino,
+                        'salvar_ms': round(tempo * 1000, 1),
+                        'tamanho_kb': round(tamanho / 1024, 1)
+                    })
+                    print(f"{paginas:>8} {compressao:<11} {destino:<8} {tempo * 1000:>12.1f} "
+                          f"{tamanho / 1024:>11.1f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
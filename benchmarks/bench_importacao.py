@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do tempo de importação a frio (custo de inicialização de um processo de trabalho)
+Cada cenário roda em um interpretador novo; é reportada a mediana das execuções
+
+Uso:
+    python benchmarks/bench_importacao.py [--repeticoes 15]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CENARIOS = [
+    ('motor (FormatadorABNT)', 'import motor_abnt'),
+    ('motor + python-docx', 'import motor_abnt; import docx'),
+    ('motor + primeiro documento', 'import motor_abnt; motor_abnt.GeradorDocumentoABNT()'),
+    ('interface gráfica', 'import formatador_abnt_moderno'),
+    ('interface + python-docx (import antigo)', 'import formatador_abnt_moderno; import docx'),
+]
+
+MODULOS_PESADOS = ['tkinter', 'customtkinter', 'docx', 'lxml']
+
+SCRIPT = '''
+import sys, time, json
+inicio = time.perf_counter()
+{codigo}
+tempo = time.perf_counter() - inicio
+print(json.dumps({{'tempo': tempo, 'modulos': [m for m in {modulos!r} if m in sys.modules]}}))
+'''
+
+
+def medir(codigo):
+    """Executa o código em um interpretador novo e retorna (tempo, módulos pesados carregados)"""
+    saida = subprocess.run(
+        [sys.executable, '-c', SCRIPT.format(codigo=codigo, modulos=MODULOS_PESADOS)],
+        cwd=RAIZ, check=True, capture_output=True, text=True
+    ).stdout
+    resultado = json.loads(saida)
+    return resultado['tempo'], resultado['modulos']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeticoes', type=int, default=15)
+    args = parser.parse_args()
+
+    print(f"{'cenário':<42} {'mediana (ms)':>12}  módulos carregados")
+    for nome, codigo in CENARIOS:
+        tempos = []
+        for _ in range(args.repeticoes):
+            tempo, modulos = medir(codigo)
+            tempos.append(tempo)
+        print(f"{nome:<42} {statistics.median(tempos) * 1000:>12.1f}  {', '.join(modulos) or '-'}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
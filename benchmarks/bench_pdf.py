@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do backend PDF (pdf_abnt.GeradorPDF) em trabalhos sintéticos
+Mede a geração completa (sumário, montagem e salvar) com os caches vazios e repetida
+(larguras, quebra de linhas e operadores em cache), o número de páginas e o tamanho do
+PDF, e o .docx do python-docx como referência. Confere também que o sumário aponta as
+páginas em que cada seção realmente começa no PDF.
+
+Uso:
+    python benchmarks/bench_pdf.py [--paginas 100 500 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, 'benchmarks'))
+
+
+def limpar_caches():
+    """Esvazia os caches de métricas, quebra de linhas e estrutura (geração a frio)"""
+    import layout_abnt
+    import pdf_abnt
+    from estrutura_abnt import limpar_cache_arvores
+
+    for funcao in (layout_abnt.largura_palavra, layout_abnt.contar_linhas,
+                   layout_abnt.quebrar_linhas, pdf_abnt._linhas_pdf):
+        funcao.cache_clear()
+    limpar_cache_arvores()
+
+
+def gerar(entrada, gerador=None):
+    """Gera e salva o trabalho em memória; retorna (tempo, gerador, bytes)"""
+    from motor_abnt import gerar_trabalho
+
+    inicio = time.perf_counter()
+    gerador = gerar_trabalho(
+        entrada['dados'], entrada['resumo'], entrada['palavras_chave'],
+        entrada['conteudo'], entrada['referencias'], gerador=gerador
+    )
+    documento = gerador.salvar()
+    return time.perf_counter() - inicio, gerador, documento
+
+
+def conferir_sumario(entrada, gerador):
+    """O sumário usa as páginas de calcular_sumario; o PDF registra onde cada título caiu"""
+    from layout_abnt import calcular_sumario
+
+    sumario = calcular_sumario(entrada['dados'], entrada['resumo'], entrada['palavras_chave'],
+                               entrada['conteudo'], entrada['referencias'])
+    # Páginas físicas do PDF; a numeração não conta a capa
+    return [s['pagina'] for s in sumario] == [t['pagina'] - 1 for t in gerador.titulos]
+
+
+def main():
+    from pdf_abnt import GeradorPDF
+    from sintetico import trabalho
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--paginas', type=int, nargs='+', default=[100, 500, 2000])
+    args = parser.parse_args()
+
+    falhou = False
+    print(f"{'páginas':>8} {'PDF':>6} {'frio (s)':>9} {'cache (s)':>10} {'.docx (s)':>10} "
+          f"{'PDF (KB)':>9} {'sumário':>8}")
+    for paginas in args.paginas:
+        entrada = trabalho(paginas)
+
+        limpar_caches()
+        tempo_frio, gerador, documento = gerar(entrada, GeradorPDF())
+        tempo_cache, _, repetido = gerar(entrada, GeradorPDF())
+        tempo_docx, _, _ = gerar(entrada)
+
+        confere = conferir_sumario(entrada, gerador) and repetido == documento
+        falhou = falhou or not confere
+        print(f"{paginas:>8} {gerador.pagina:>6} {tempo_frio:>9.3f} {tempo_cache:>10.3f} "
+              f"{tempo_docx:>10.3f} {len(documento) / 1024:>9.1f} {'✅' if confere else '❌':>7}")
+
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do backend em fluxo (GeradorDocumentoStreaming) contra o python-docx
+Mede tempo total (montagem + salvar), pico de memória (RSS) e tamanho do .docx
+em trabalhos sintéticos de 100, 500 e 2000 páginas
+
+Cada medição roda em um processo separado para que o pico de RSS seja independente.
+
+Uso:
+    python benchmarks/bench_streaming.py [--paginas 100 500 2000]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, 'benchmarks'))
+
+BACKENDS = ['python-docx', 'streaming']
+
+
+def medir(backend, paginas):
+    """Executa uma geração e retorna as medidas (roda no processo filho)"""
+    from motor_abnt import gerar_trabalho
+    from escritor_streaming import GeradorDocumentoStreaming
+    from sintetico import trabalho
+
+    entrada = trabalho(paginas)
+    rss_base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'trabalho.docx')
+        inicio = time.perf_counter()
+
+        gerador = GeradorDocumentoStreaming(caminho) if backend == 'streaming' else None
+        gerador = gerar_trabalho(
+            entrada['dados'], entrada['resumo'], entrada['palavras_chave'],
+            entrada['conteudo'], entrada['referencias'], gerador=gerador
+        )
+        gerador.salvar(caminho)
+
+        tempo = time.perf_counter() - inicio
+        tamanho = os.path.getsize(caminho)
+
+    rss_pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'backend': backend,
+        'paginas': paginas,
+        'tempo_s': round(tempo, 3),
+        # ru_maxrss em KiB no Linux; descontado o RSS antes da geração
+        'memoria_mb': round((rss_pico - rss_base) / 1024, 1),
+        'tamanho_kb': round(tamanho / 1024, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--paginas', type=int, nargs='+', default=[100, 500, 2000])
+    parser.add_argument('--interno', nargs=2, metavar=('BACKEND', 'PAGINAS'),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.interno:
+        print(json.dumps(medir(args.interno[0], int(args.interno[1]))))
+        return 0
+
+    print(f"{'páginas':>8} {'backend':<12} {'tempo (s)':>10} {'memória (MB)':>13} {'.docx (KB)':>11}")
+    for paginas in args.paginas:
+        for backend in BACKENDS:
+            saida = subprocess.run(
+                [sys.executable, __file__, '--interno', backend, str(paginas)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            r = json.loads(saida)
+            print(f"{r['paginas']:>8} {r['backend']:<12} {r['tempo_s']:>10.3f} "
+                  f"{r['memoria_mb']:>13.1f} {r['tamanho_kb']:>11.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
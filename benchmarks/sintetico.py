@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Gerador de textos sintéticos para os benchmarks do Formatador ABNT
+Os textos são determinísticos (semente fixa) para permitir comparar execuções
+"""
+
+import random
+
+SOBRENOMES = [
+    'Silva', 'Souza', 'Oliveira', 'Santos', 'Pereira', 'Lima', 'Costa',
+    'Ferreira', 'Almeida', 'Ribeiro', 'Gonçalves', 'Araújo', 'Freire', 'Vygotsky'
+]
+
+PALAVRAS = (
+    'a pesquisa analisa o impacto das tecnologias digitais no processo de ensino '
+    'e aprendizagem considerando aspectos sociais culturais e econômicos da '
+    'educação brasileira contemporânea com base em estudos empíricos e revisão '
+    'sistemática da literatura especializada sobre o tema proposto neste trabalho'
+).split()
+
+
+def citacao(rng):
+    """Gera uma citação entre parênteses em caixa mista"""
+    autores = rng.sample(SOBRENOMES, rng.choice([1, 1, 1, 2, 3, 4, 5]))
+    ano = rng.randint(1980, 2025)
+
+    if len(autores) == 2 and rng.random() < 0.5:
+        # Autores com anos diferentes: (Silva, 2020; Souza, 2021)
+        texto = f"{autores[0]}, {ano}; {autores[1]}, {ano - 1}"
+    else:
+        texto = f"{'; '.join(autores)}, {ano}"
+
+    if rng.random() < 0.4:
+        texto += f", p. {rng.randint(1, 300)}"
+    return f"({texto})"
+
+
+def paragrafo(rng, densidade_citacoes=0.1, palavras=(60, 120)):
+    """Gera um parágrafo com citações inseridas a cada ~1/densidade palavras"""
+    partes = []
+    for _ in range(rng.randint(*palavras)):
+        partes.append(rng.choice(PALAVRAS))
+        if rng.random() < densidade_citacoes:
+            partes.append(citacao(rng))
+    texto = ' '.join(partes)
+    return texto[0].upper() + texto[1:] + '.'
+
+
+def texto_corrido(tamanho_bytes, densidade_citacoes=0.1, semente=42):
+    """Texto com aproximadamente tamanho_bytes (UTF-8), parágrafos separados por linha"""
+    rng = random.Random(semente)
+    paragrafos = []
+    total = 0
+    while total < tamanho_bytes:
+        p = paragrafo(rng, densidade_citacoes)
+        paragrafos.append(p)
+        total += len(p.encode('utf-8')) + 1
+    return '\n'.join(paragrafos)
+
+
+# Aproximação de uma página A4 ABNT (Arial 12, entrelinhas 1,5, margens NBR 14724)
+CARACTERES_POR_PAGINA = 2800
+PAGINAS_POR_SECAO = 10
+TITULOS_SECAO = [
+    'INTRODUÇÃO', 'REFERENCIAL TEÓRICO', 'METODOLOGIA',
+    'RESULTADOS', 'DISCUSSÃO', 'CONSIDERAÇÕES FINAIS'
+]
+
+DADOS_TRABALHO = {
+    'instituicao': 'Universidade Federal de Exemplo',
+    'curso': 'Curso de Ciência da Computação',
+    'autor': 'Maria da Silva',
+    'titulo': 'Tecnologias digitais na educação brasileira',
+    'natureza': 'Trabalho de Conclusão de Curso',
+    'objetivo': 'Obtenção do título de Bacharel em Ciência da Computação',
+    'orientador': 'Prof. Dr. João Souza',
+    'local': 'São Paulo',
+    'ano': '2025'
+}
+
+
+def referencia(rng, indice):
+    """Gera uma referência NBR 6023 de livro"""
+    autor = rng.choice(SOBRENOMES).upper()
+    titulo = ' '.join(rng.choice(PALAVRAS) for _ in range(rng.randint(3, 8))).capitalize()
+    return (f"{autor}, Nome{indice}. {titulo}. {rng.randint(1, 9)}. ed. "
+            f"São Paulo: Editora, {rng.randint(1980, 2025)}.")
+
+
+def trabalho(paginas, densidade_citacoes=0.1, n_referencias=100, semente=42):
+    """
+    Trabalho sintético com aproximadamente o número de páginas indicado
+    Retorna dict com dados, resumo, palavras_chave, conteudo e referencias (texto simples)
+    """
+    rng = random.Random(semente)
+    linhas = []
+
+    for pagina in range(paginas):
+        if pagina % PAGINAS_POR_SECAO == 0:
+            numero = pagina // PAGINAS_POR_SECAO + 1
+            linhas.append(f"{numero} {TITULOS_SECAO[(numero - 1) % len(TITULOS_SECAO)]}")
+
+        total = 0
+        while total < CARACTERES_POR_PAGINA:
+            p = paragrafo(rng, densidade_citacoes)
+            linhas.append(p)
+            total += len(p)
+
+    return {
+        'dados': dict(DADOS_TRABALHO),
+        'resumo': paragrafo(rng, 0, palavras=(150, 250)),
+        'palavras_chave': 'Educação. Tecnologia. Ensino.',
+        'conteudo': '\n'.join(linhas),
+        'referencias': '\n'.join(referencia(rng, i) for i in range(n_referencias))
+    }
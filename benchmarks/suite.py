@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Suíte de benchmarks do pipeline completo com trabalhos sintéticos
+Mede cada método público de FormatadorABNT e GeradorDocumentoABNT, as etapas auxiliares
+(sumário, conferência de citações) e a geração completa, em trabalhos de 10, 100, 500 e
+2000 páginas com poucas/muitas citações e listas de referências curtas/longas.
+
+Cada cenário roda em processos separados (métodos e geração completa), para que o pico
+de memória de um não contamine o outro. Os tempos são a mediana das repetições.
+O resultado é gravado em JSON e pode ser comparado com uma execução anterior.
+
+Uso:
+    python benchmarks/suite.py [-o resultado.json] [--paginas 10 100] [--repeticoes 3]
+    python benchmarks/suite.py --comparar base.json [-o novo.json] [--tolerancia 0.10]
+"""
+
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, 'benchmarks'))
+
+VERSAO_FORMATO = 1
+
+PAGINAS = [10, 100, 500, 2000]
+CITACOES = {'poucas': 0.01, 'densas': 0.3}
+REFERENCIAS = {'curta': 20, 'longa': 2000}
+
+# Citações longas adicionadas por cenário (adicionar_citacao_longa)
+N_CITACOES_LONGAS = 50
+
+# Tempos abaixo disso são dominados por ruído e não contam como regressão
+TEMPO_MINIMO_S = 0.005
+
+
+def cenarios(paginas=PAGINAS):
+    """Combinações de tamanho x densidade de citações x tamanho das referências"""
+    return [
+        {
+            'nome': f"{p}p-{citacoes}-{referencias}",
+            'paginas': p,
+            'densidade_citacoes': CITACOES[citacoes],
+            'n_referencias': REFERENCIAS[referencias]
+        }
+        for p, citacoes, referencias in itertools.product(paginas, CITACOES, REFERENCIAS)
+    ]
+
+
+def _entrada(cenario):
+    from sintetico import trabalho
+    return trabalho(
+        cenario['paginas'],
+        densidade_citacoes=cenario['densidade_citacoes'],
+        n_referencias=cenario['n_referencias']
+    )
+
+
+def _cronometrar(funcao, *args, **kwargs):
+    inicio = time.perf_counter()
+    resultado = funcao(*args, **kwargs)
+    return time.perf_counter() - inicio, resultado
+
+
+def medir_metodos(cenario):
+    """Tempo de cada método público, uma execução (roda no processo filho)"""
+    from motor_abnt import FormatadorABNT, GeradorDocumentoABNT
+    from layout_abnt import calcular_sumario
+    from conferencia_citacoes import conferir_citacoes
+
+    entrada = _entrada(cenario)
+    dados = entrada['dados']
+    conteudo = entrada['conteudo']
+    referencias = entrada['referencias']
+    lista_referencias = [r.strip() for r in referencias.split('\n') if r.strip()]
+    tempos = {}
+
+    # FormatadorABNT
+    tempos['FormatadorABNT.formatar_citacoes'], _ = _cronometrar(
+        FormatadorABNT.formatar_citacoes, conteudo)
+    tempos['FormatadorABNT.formatar_referencias'], _ = _cronometrar(
+        FormatadorABNT.formatar_referencias, referencias)
+    tempos['FormatadorABNT.analisar_referencia'], _ = _cronometrar(
+        lambda: [FormatadorABNT.analisar_referencia(r) for r in lista_referencias])
+
+    # Etapas auxiliares da geração
+    tempos['layout_abnt.calcular_sumario'], secoes = _cronometrar(
+        calcular_sumario, dados, entrada['resumo'], entrada['palavras_chave'], conteudo, referencias)
+    tempos['conferencia_citacoes.conferir_citacoes'], _ = _cronometrar(
+        conferir_citacoes, conteudo, lista_referencias)
+
+    # GeradorDocumentoABNT
+    tempos['GeradorDocumentoABNT.__init__'], gerador = _cronometrar(GeradorDocumentoABNT)
+    tempos['GeradorDocumentoABNT.adicionar_capa'], _ = _cronometrar(
+        gerador.adicionar_capa, dados)
+    tempos['GeradorDocumentoABNT.adicionar_folha_rosto'], _ = _cronometrar(
+        gerador.adicionar_folha_rosto, dados)
+    tempos['GeradorDocumentoABNT.adicionar_resumo'], _ = _cronometrar(
+        gerador.adicionar_resumo, entrada['resumo'], entrada['palavras_chave'])
+    tempos['GeradorDocumentoABNT.adicionar_sumario'], _ = _cronometrar(
+        gerador.adicionar_sumario, secoes)
+
+    # adicionar_secao é medida dentro de adicionar_conteudo, que a chama por seção
+    tempo_secoes = [0.0]
+    adicionar_secao = gerador.adicionar_secao
+
+    def adicionar_secao_medida(*args, **kwargs):
+        duracao, _ = _cronometrar(adicionar_secao, *args, **kwargs)
+        tempo_secoes[0] += duracao
+
+    gerador.adicionar_secao = adicionar_secao_medida
+    tempos['GeradorDocumentoABNT.adicionar_conteudo'], _ = _cronometrar(
+        gerador.adicionar_conteudo, conteudo)
+    tempos['GeradorDocumentoABNT.adicionar_secao'] = tempo_secoes[0]
+    del gerador.adicionar_secao
+
+    tempos['GeradorDocumentoABNT.adicionar_citacao_longa'], _ = _cronometrar(
+        lambda: [
+            gerador.adicionar_citacao_longa(conteudo[:600], 'SILVA', 2021, pagina=i + 1)
+            for i in range(N_CITACOES_LONGAS)
+        ])
+    tempos['GeradorDocumentoABNT.adicionar_referencias'], _ = _cronometrar(
+        gerador.adicionar_referencias, lista_referencias)
+    tempos['GeradorDocumentoABNT.salvar'], _ = _cronometrar(gerador.salvar, io.BytesIO())
+
+    return tempos
+
+
+def medir_completo(cenario):
+    """Geração completa (gerar_trabalho + salvar): tempo, pico de memória e tamanho"""
+    from motor_abnt import gerar_trabalho
+
+    entrada = _entrada(cenario)
+    rss_base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    inicio = time.perf_counter()
+    gerador = gerar_trabalho(
+        entrada['dados'], entrada['resumo'], entrada['palavras_chave'],
+        entrada['conteudo'], entrada['referencias']
+    )
+    buffer = io.BytesIO()
+    gerador.salvar(buffer)
+    tempo = time.perf_counter() - inicio
+
+    rss_pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'tempo_s': tempo,
+        # ru_maxrss em KiB no Linux; descontado o RSS antes da geração
+        'memoria_mb': (rss_pico - rss_base) / 1024,
+        'tamanho_kb': len(buffer.getvalue()) / 1024,
+        'entrada_kb': len(entrada['conteudo'].encode('utf-8')) / 1024
+    }
+
+
+def _executar_filho(modo, cenario):
+    saida = subprocess.run(
+        [sys.executable, __file__, '--interno', modo, json.dumps(cenario)],
+        cwd=RAIZ, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(saida)
+
+
+def executar_cenario(cenario, repeticoes):
+    """Mediana de cada medida em repeticoes execuções independentes"""
+    metodos = [_executar_filho('metodos', cenario) for _ in range(repeticoes)]
+    completos = [_executar_filho('completo', cenario) for _ in range(repeticoes)]
+
+    return dict(
+        cenario,
+        metodos_s={
+            nome: round(statistics.median(m[nome] for m in metodos), 5)
+            for nome in metodos[0]
+        },
+        completo={
+            chave: round(statistics.median(c[chave] for c in completos), 3)
+            for chave in completos[0]
+        }
+    )
+
+
+def _commit_atual():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=RAIZ, check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(base, atual, tolerancia):
+    """
+    Imprime a variação de cada medida em relação à execução base
+    Retorna o número de regressões (tempo/memória acima de 1 + tolerancia)
+    """
+    anteriores = {c['nome']: c for c in base['cenarios']}
+    regressoes = 0
+
+    print(f"{'cenário':<22} {'medida':<46} {'base':>10} {'atual':>10} {'variação':>9}")
+    for cenario in atual['cenarios']:
+        anterior = anteriores.get(cenario['nome'])
+        if anterior is None:
+            continue
+
+        medidas = [(f"{nome} (s)", valor, anterior['metodos_s'].get(nome))
+                   for nome, valor in cenario['metodos_s'].items()]
+        medidas += [(f"completo.{chave}", valor, anterior['completo'].get(chave))
+                    for chave, valor in cenario['completo'].items()]
+
+        for nome, valor, valor_base in medidas:
+            if not valor_base:
+                continue
+            variacao = valor / valor_base - 1
+            marca = ''
+            comparavel = 'tamanho' not in nome and 'entrada' not in nome and (
+                'memoria' in nome or valor_base >= TEMPO_MINIMO_S)
+            if variacao > tolerancia and comparavel:
+                regressoes += 1
+                marca = ' ⚠️'
+            print(f"{cenario['nome']:<22} {nome:<46} {valor_base:>10.4f} {valor:>10.4f} "
+                  f"{variacao:>+8.1%}{marca}")
+
+    print()
+    print(f"{'⚠️' if regressoes else '✅'} {regressoes} medidas acima da tolerância de {tolerancia:.0%}")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-o', '--saida', help="grava o resultado em JSON")
+    parser.add_argument('--paginas', type=int, nargs='+', default=PAGINAS)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--comparar', metavar='BASE', help="JSON de uma execução anterior")
+    parser.add_argument('--tolerancia', type=float, default=0.10,
+                        help="variação tolerada antes de apontar regressão (padrão: 0.10)")
+    parser.add_argument('--interno', nargs=2, metavar=('MODO', 'CENARIO'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.interno:
+        modo, cenario = args.interno[0], json.loads(args.interno[1])
+        medir = medir_metodos if modo == 'metodos' else medir_completo
+        print(json.dumps(medir(cenario)))
+        return 0
+
+    resultado = {
+        'versao': VERSAO_FORMATO,
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit_atual(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'repeticoes': args.repeticoes,
+        'cenarios': []
+    }
+
+    print(f"{'cenário':<22} {'tempo (s)':>10} {'memória (MB)':>13} {'.docx (KB)':>11}")
+    for cenario in cenarios(args.paginas):
+        medidas = executar_cenario(cenario, args.repeticoes)
+        resultado['cenarios'].append(medidas)
+        completo = medidas['completo']
+        print(f"{cenario['nome']:<22} {completo['tempo_s']:>10.3f} "
+              f"{completo['memoria_mb']:>13.1f} {completo['tamanho_kb']:>11.1f}")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+
+    if args.comparar:
+        print()
+        with open(args.comparar, encoding='utf-8') as f:
+            base = json.load(f)
+        return 1 if comparar(base, resultado, args.tolerancia) else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
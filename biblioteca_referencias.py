@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Biblioteca local de referências (SQLite), compartilhada entre trabalhos
+
+Cada referência é guardada uma única vez com seus campos NBR 6023 já analisados
+(autor, título, restante, sobrenome, ano) e chaves de busca indexadas por autor/ano
+e por título. A busca por prefixo usa apenas os índices, e a geração do documento
+obtém os campos prontos em vez de analisar cada referência novamente.
+
+Uso:
+    python biblioteca_referencias.py importar referencias.txt [...] [--banco CAMINHO]
+    python biblioteca_referencias.py buscar PREFIXO [--banco CAMINHO]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import unicodedata
+
+from motor_abnt import FormatadorABNT
+
+
+CAMINHO_PADRAO = os.path.join(os.path.expanduser('~'), '.formatador_abnt', 'referencias.sqlite3')
+LIMITE_BUSCA = 50
+
+# Máximo de parâmetros por consulta "IN (...)"
+_LOTE_CONSULTA = 500
+# Versão da análise guardada em "campos" (PRAGMA user_version); bancos anteriores são
+# reanalisados ao abrir. 1: ano de documentos online sem a data de acesso
+_VERSAO_CAMPOS = 1
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS referencias (
+    id INTEGER PRIMARY KEY,
+    texto TEXT NOT NULL UNIQUE,
+    chave_autor TEXT NOT NULL,
+    ano TEXT NOT NULL,
+    chave_titulo TEXT NOT NULL,
+    campos TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_referencias_autor_ano ON referencias (chave_autor, ano);
+CREATE INDEX IF NOT EXISTS idx_referencias_titulo ON referencias (chave_titulo);
+CREATE INDEX IF NOT EXISTS idx_referencias_ano ON referencias (ano);
+"""
+
+
+def normalizar(texto):
+    """Chave de busca: sem acentos, em minúsculas e com espaços simples"""
+    decomposto = unicodedata.normalize('NFKD', texto)
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return ' '.join(sem_acentos.lower().split())
+
+
+def _intervalo_prefixo(prefixo):
+    """Limites (inclusivo, exclusivo) das chaves que começam com prefixo"""
+    return prefixo, prefixo + '\U0010ffff'
+
+
+class BibliotecaReferencias:
+    """
+    Acervo de referências em disco
+    Pode ser usada pela interface e pela thread de geração ao mesmo tempo
+    """
+
+    def __init__(self, caminho=CAMINHO_PADRAO):
+        if caminho != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+
+        self.caminho = caminho
+        self._trava = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        # WAL: processos de lote leem enquanto a interface grava
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.executescript(_ESQUEMA)
+        self._atualizar_campos()
+
+    def _atualizar_campos(self):
+        """Reanalisa as referências gravadas por uma versão anterior da análise"""
+        with self._trava, self._conexao:
+            if self._conexao.execute('PRAGMA user_version').fetchone()[0] >= _VERSAO_CAMPOS:
+                return
+            textos = [texto for (texto,) in self._conexao.execute('SELECT texto FROM referencias')]
+            self._conexao.executemany(
+                'UPDATE referencias SET chave_autor = ?, ano = ?, chave_titulo = ?, campos = ? '
+                'WHERE texto = ?',
+                [linha[1:] + linha[:1] for linha in map(self._linha, textos)]
+            )
+            self._conexao.execute(f'PRAGMA user_version = {_VERSAO_CAMPOS}')
+
+    def fechar(self):
+        """Fecha a conexão com o banco"""
+        with self._trava:
+            self._conexao.close()
+
+    def __len__(self):
+        with self._trava:
+            return self._conexao.execute('SELECT COUNT(*) FROM referencias').fetchone()[0]
+
+    @staticmethod
+    def _linha(referencia):
+        """Analisa uma referência e monta a linha da tabela"""
+        campos = FormatadorABNT.analisar_referencia(referencia)
+        chave_autor = normalizar(campos['autor'].rstrip('.') or campos['texto'])
+        return (
+            campos['texto'],
+            chave_autor,
+            campos['ano'],
+            normalizar(campos['titulo'].rstrip('.')),
+            json.dumps(campos, ensure_ascii=False)
+        )
+
+    def adicionar(self, referencias):
+        """
+        Cadastra várias referências numa única transação (as já existentes são ignoradas)
+        Retorna o número de referências novas
+        """
+        linhas = [self._linha(r) for r in referencias if r.strip()]
+
+        with self._trava, self._conexao:
+            antes = self._conexao.total_changes
+            self._conexao.executemany(
+                'INSERT OR IGNORE INTO referencias '
+                '(texto, chave_autor, ano, chave_titulo, campos) VALUES (?, ?, ?, ?, ?)',
+                linhas
+            )
+            return self._conexao.total_changes - antes
+
+    def remover(self, referencias):
+        """Remove referências pelo texto; retorna quantas foram removidas"""
+        with self._trava, self._conexao:
+            antes = self._conexao.total_changes
+            self._conexao.executemany(
+                'DELETE FROM referencias WHERE texto = ?',
+                [(r.strip(),) for r in referencias]
+            )
+            return self._conexao.total_changes - antes
+
+    def buscar(self, prefixo, limite=LIMITE_BUSCA):
+        """
+        Busca por prefixo do autor ou do título (sem diferenciar acentos e maiúsculas),
+        ou pelo ano quando o prefixo é um ano (ex: "2021")
+        Retorna lista de campos analisados, autores primeiro
+        """
+        chave = normalizar(prefixo)
+        if not chave:
+            return []
+
+        if len(chave) == 4 and chave.isdigit():
+            consultas = [('SELECT campos FROM referencias WHERE ano = ? '
+                          'ORDER BY chave_autor LIMIT ?', (chave, limite))]
+        else:
+            inicio, fim = _intervalo_prefixo(chave)
+            consultas = [
+                ('SELECT campos FROM referencias WHERE chave_autor >= ? AND chave_autor < ? '
+                 'ORDER BY chave_autor LIMIT ?', (inicio, fim, limite)),
+                ('SELECT campos FROM referencias WHERE chave_titulo >= ? AND chave_titulo < ? '
+                 'ORDER BY chave_titulo LIMIT ?', (inicio, fim, limite)),
+            ]
+
+        resultados = {}
+        with self._trava:
+            for sql, parametros in consultas:
+                for (campos,) in self._conexao.execute(sql, parametros):
+                    resultados.setdefault(campos, None)
+
+        return [json.loads(campos) for campos in list(resultados)[:limite]]
+
+    def resolver(self, referencias):
+        """
+        Campos analisados de cada referência, na mesma ordem
+        As cadastradas vêm do banco; as demais são analisadas na hora
+        """
+        textos = [r.strip() for r in referencias]
+        cadastradas = {}
+
+        unicos = list(dict.fromkeys(textos))
+        with self._trava:
+            for i in range(0, len(unicos), _LOTE_CONSULTA):
+                lote = unicos[i:i + _LOTE_CONSULTA]
+                sql = 'SELECT texto, campos FROM referencias WHERE texto IN (%s)' % ','.join('?' * len(lote))
+                cadastradas.update(self._conexao.execute(sql, lote))
+
+        return [
+            json.loads(cadastradas[texto]) if texto in cadastradas
+            else FormatadorABNT.analisar_referencia(texto)
+            for texto in textos
+        ]
+
+
+def main(argv=None):
+    """Linha de comando: importação em massa e busca"""
+    parser = argparse.ArgumentParser(description="Biblioteca local de referências ABNT")
+    parser.add_argument('--banco', default=CAMINHO_PADRAO, help="arquivo SQLite da biblioteca")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    importar = comandos.add_parser('importar', help="cadastra referências (uma por linha)")
+    importar.add_argument('arquivos', nargs='+')
+
+    buscar = comandos.add_parser('buscar', help="busca por prefixo do autor, título ou ano")
+    buscar.add_argument('prefixo')
+    buscar.add_argument('-n', '--limite', type=int, default=LIMITE_BUSCA)
+
+    args = parser.parse_args(argv)
+    biblioteca = BibliotecaReferencias(args.banco)
+
+    try:
+        if args.comando == 'importar':
+            referencias = []
+            for arquivo in args.arquivos:
+                with open(arquivo, encoding='utf-8') as f:
+                    referencias.extend(linha for linha in f if linha.strip())
+            novas = biblioteca.adicionar(referencias)
+            print(f"✅ {novas} novas referências ({len(referencias) - novas} já cadastradas)")
+        else:
+            for campos in biblioteca.buscar(args.prefixo, args.limite):
+                print(campos['texto'])
+    finally:
+        biblioteca.fechar()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Cache de documentos renderizados, endereçado pelo conteúdo
+
+A chave é o SHA-256 da entrada canônica (dados do trabalho, resumo, palavras-chave,
+conteúdo, referências e opções da geração) e da assinatura do motor (código-fonte dos
+módulos que produzem o .docx e versão do python-docx). Como a gravação é reproduzível,
+um acerto devolve exatamente os bytes que uma nova renderização produziria; qualquer
+alteração no motor muda a assinatura e invalida as entradas antigas.
+
+Os documentos ficam em disco, um arquivo por chave, com tamanho total limitado: ao
+passar do limite, os menos usados recentemente são removidos (LRU pela data de uso).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+
+PASTA_PADRAO = os.path.join(os.path.expanduser('~'), '.formatador_abnt', 'cache')
+LIMITE_PADRAO_MB = 256
+
+# Módulos cujo código determina os bytes do documento
+MODULOS_MOTOR = (
+    'motor_abnt.py', 'layout_abnt.py', 'escritor_streaming.py', 'varredura_citacoes.py',
+    'estrutura_abnt.py', 'pdf_abnt.py'
+)
+
+# O formato (docx ou pdf) faz parte da chave; o nome do arquivo não o repete
+EXTENSAO = '.bin'
+# Extensão das versões anteriores, que guardavam também os PDFs como .docx
+EXTENSAO_ANTIGA = '.docx'
+
+
+@lru_cache(maxsize=None)
+def assinatura_motor():
+    """Hash do código do motor e da versão do python-docx (calculado uma vez por processo)"""
+    import docx
+
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    resumo = hashlib.sha256(docx.__version__.encode('ascii'))
+    for nome in MODULOS_MOTOR:
+        with open(os.path.join(pasta, nome), 'rb') as f:
+            resumo.update(f.read())
+    return resumo.hexdigest()
+
+
+def chave_renderizacao(dados, resumo='', palavras_chave='', conteudo='', referencias='', **opcoes):
+    """
+    Chave do documento: SHA-256 da entrada em forma canônica (JSON com chaves ordenadas)
+    opcoes: o que mais altera a saída (ex: streaming=True)
+    """
+    entrada = json.dumps(
+        {
+            'motor': assinatura_motor(),
+            'dados': dados,
+            'resumo': resumo,
+            'palavras_chave': palavras_chave,
+            'referencias': referencias,
+            'opcoes': opcoes
+        },
+        sort_keys=True, ensure_ascii=False, separators=(',', ':')
+    )
+    resumo_hash = hashlib.sha256(entrada.encode('utf-8'))
+    # O conteúdo (a maior parte da entrada) é somado sem passar pelo JSON
+    resumo_hash.update(b'\0')
+    resumo_hash.update(conteudo.encode('utf-8'))
+    return resumo_hash.hexdigest()
+
+
+class CacheRenderizacao:
+    """
+    Documentos renderizados (.docx ou PDF) em disco por chave, com remoção LRU acima de limite_mb
+    Pode ser usado por várias threads; entre processos, as gravações são atômicas
+    e cada processo aplica o limite sobre o que conhece da pasta
+    """
+
+    def __init__(self, pasta=PASTA_PADRAO, limite_mb=LIMITE_PADRAO_MB):
+        os.makedirs(pasta, exist_ok=True)
+        self.pasta = pasta
+        self.limite_bytes = int(limite_mb * 1024 * 1024)
+
+        self._trava = threading.Lock()
+        self._acertos = 0
+        self._falhas = 0
+        self._removidas = 0
+
+        # chave -> tamanho, do uso mais antigo para o mais recente
+        self._entradas = OrderedDict()
+        self._total = 0
+        existentes = []
+        for nome in os.listdir(pasta):
+            if nome.endswith(EXTENSAO):
+                estado = os.stat(os.path.join(pasta, nome))
+                existentes.append((estado.st_mtime, nome[:-len(EXTENSAO)], estado.st_size))
+            elif nome.endswith(EXTENSAO_ANTIGA):
+                try:
+                    os.remove(os.path.join(pasta, nome))
+                except FileNotFoundError:
+                    pass
+        for _, chave, tamanho in sorted(existentes):
+            self._entradas[chave] = tamanho
+            self._total += tamanho
+
+    def _caminho(self, chave):
+        return os.path.join(self.pasta, chave + EXTENSAO)
+
+    def obter(self, chave):
+        """Bytes do documento em cache, ou None"""
+        with self._trava:
+            try:
+                with open(self._caminho(chave), 'rb') as f:
+                    documento = f.read()
+                # A data de modificação registra o último uso (ordem LRU entre execuções)
+                os.utime(self._caminho(chave))
+            except FileNotFoundError:
+                # Removido por outro processo
+                if chave in self._entradas:
+                    self._total -= self._entradas.pop(chave)
+                self._falhas += 1
+                return None
+
+            if chave not in self._entradas:
+                self._entradas[chave] = len(documento)
+                self._total += len(documento)
+            self._entradas.move_to_end(chave)
+            self._acertos += 1
+            return documento
+
+    def guardar(self, chave, documento):
+        """Grava o documento (atomicamente) e remove os menos usados acima do limite"""
+        if len(documento) > self.limite_bytes:
+            return
+
+        descritor, temporario = tempfile.mkstemp(suffix='.tmp', dir=self.pasta)
+        try:
+            with os.fdopen(descritor, 'wb') as f:
+                f.write(documento)
+            os.replace(temporario, self._caminho(chave))
+        except BaseException:
+            os.unlink(temporario)
+            raise
+
+        with self._trava:
+            self._total += len(documento) - self._entradas.pop(chave, 0)
+            self._entradas[chave] = len(documento)
+            self._remover_excedente()
+
+    def _remover_excedente(self):
+        while self._total > self.limite_bytes and self._entradas:
+            chave, tamanho = self._entradas.popitem(last=False)
+            self._total -= tamanho
+            self._removidas += 1
+            try:
+                os.remove(self._caminho(chave))
+            except FileNotFoundError:
+                pass
+
+    def limpar(self):
+        """Remove todos os documentos do cache"""
+        with self._trava:
+            for chave in self._entradas:
+                try:
+                    os.remove(self._caminho(chave))
+                except FileNotFoundError:
+                    pass
+            self._entradas.clear()
+            self._total = 0
+
+    def estatisticas(self):
+        """Acertos, falhas, taxa de acerto, entradas e ocupação"""
+        with self._trava:
+            consultas = self._acertos + self._falhas
+            return {
+                'acertos': self._acertos,
+                'falhas': self._falhas,
+                'taxa_acerto': round(self._acertos / consultas, 3) if consultas else None,
+                'removidas': self._removidas,
+                'entradas': len(self._entradas),
+                'bytes': self._total,
+                'limite_bytes': self.limite_bytes
+            }
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compilação de anais e coletâneas: vários artigos ABNT num único .docx
+
+Cada artigo é renderizado num processo de trabalho (GeradorDocumentoABNT + estimativa
+de páginas do layout_abnt). O processo principal só une os corpos dos documentos, na
+ordem das pastas, acrescentando capa, folha de rosto e um sumário único do volume.
+Os estilos são definidos uma única vez: cada artigo informa os estilos que usa e só os
+que ainda não existem no volume são copiados.
+
+Estrutura da pasta do volume:
+    volume.json       - capa e folha de rosto do volume: instituicao, curso, autor
+                        (organizadores), titulo, natureza, objetivo, local, ano
+    <artigo>/         - uma pasta por artigo, no formato de lote_abnt.py (dados.json
+                        com titulo e autor, resumo.txt, conteudo.txt, referencias.txt)
+
+Uso:
+    python compilador_anais.py PASTA_VOLUME -o anais.docx [-j PROCESSOS] [--secoes]
+                               [--trace anais.trace.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from lote_abnt import ler_pacote, listar_pacotes
+from motor_abnt import GeradorDocumentoABNT
+from rastreamento import RASTREADOR_NULO, Rastreador
+
+
+ARQUIVO_VOLUME = 'volume.json'
+
+
+def montar_artigo(gerador, dados, textos):
+    """Operações adicionar_* de um artigo (as mesmas para o documento e para o layout)"""
+    gerador.adicionar_cabecalho_artigo(dados)
+    if textos['resumo'].strip():
+        gerador.adicionar_resumo(textos['resumo'], dados.get('palavras_chave', ''), quebra_pagina=False)
+    if textos['conteudo'].strip():
+        gerador.adicionar_conteudo(textos['conteudo'])
+
+    referencias = [r.strip() for r in textos['referencias'].split('\n') if r.strip()]
+    if referencias:
+        gerador.adicionar_referencias(referencias)
+
+
+def _estilos_usados(gerador):
+    """XML dos estilos referenciados no corpo (e dos estilos em que se baseiam)"""
+    from lxml import etree
+
+    estilos = gerador.doc.styles.element
+    pendentes = set(gerador.doc.element.body.xpath('.//w:pStyle/@w:val | .//w:rStyle/@w:val'))
+    usados = {}
+
+    while pendentes:
+        estilo_id = pendentes.pop()
+        if estilo_id in usados:
+            continue
+        encontrados = estilos.xpath(f'w:style[@w:styleId="{estilo_id}"]')
+        if not encontrados:
+            continue
+        usados[estilo_id] = etree.tostring(encontrados[0], encoding='unicode')
+        pendentes.update(encontrados[0].xpath('w:basedOn/@w:val'))
+
+    return usados
+
+
+def renderizar_artigo(caminho_pacote):
+    """
+    Renderiza um artigo (executado no processo de trabalho)
+    Retorna o XML do corpo, os estilos usados, o número de páginas e as seções com a
+    página relativa ao início do artigo. Nunca levanta exceção: erros vão no resultado
+    """
+    # Importados aqui para que cada processo carregue o motor uma única vez
+    from lxml import etree
+    from docx.oxml.ns import qn
+    from layout_abnt import ALTURA_LINHA_NORMAL, EstimadorLayout
+
+    nome = os.path.basename(os.path.normpath(caminho_pacote))
+    inicio = time.perf_counter()
+
+    try:
+        dados, textos = ler_pacote(caminho_pacote)
+
+        gerador = GeradorDocumentoABNT()
+        montar_artigo(gerador, dados, textos)
+        corpo = gerador.doc.element.body
+        xml = ''.join(
+            etree.tostring(elemento, encoding='unicode')
+            for elemento in corpo if elemento.tag != qn('w:sectPr')
+        )
+
+        # Cada artigo começa após uma quebra de página, cuja marca ocupa a primeira linha
+        estimador = EstimadorLayout()
+        estimador.y = ALTURA_LINHA_NORMAL
+        montar_artigo(estimador, dados, textos)
+    except Exception as e:
+        return {
+            'nome': nome,
+            'sucesso': False,
+            'tempo': time.perf_counter() - inicio,
+            'erro': f"{type(e).__name__}: {e}"
+        }
+
+    return {
+        'nome': nome,
+        'sucesso': True,
+        'tempo': time.perf_counter() - inicio,
+        'erro': None,
+        'titulo': dados.get('titulo', '').upper(),
+        'autor': dados.get('autor', ''),
+        'xml': xml,
+        'estilos': _estilos_usados(gerador),
+        'paginas': estimador.pagina,
+        'secoes': estimador.titulos
+    }
+
+
+class GeradorVolume(GeradorDocumentoABNT):
+    """Volume de anais: capa e folha de rosto próprias, sumário único e os corpos dos artigos"""
+
+    def __init__(self):
+        super().__init__()
+        self.estilos_copiados = 0
+        self._primeiro_artigo = None
+
+    def anexar_artigo(self, xml, estilos):
+        """Anexa o corpo de um artigo renderizado, precedido de quebra de página"""
+        from docx.oxml import parse_xml
+        from docx.oxml.ns import nsdecls
+
+        self._mesclar_estilos(estilos)
+
+        if self._primeiro_artigo is not None:
+            self._quebra_pagina()
+
+        fragmento = parse_xml(f'<w:body {nsdecls("w")}>{xml}</w:body>')
+        for elemento in list(fragmento):
+            self._anexar_ao_corpo(elemento)
+            if self._primeiro_artigo is None:
+                self._primeiro_artigo = elemento
+
+    def _mesclar_estilos(self, estilos):
+        """Copia para o volume apenas os estilos que ele ainda não define"""
+        from docx.oxml import parse_xml
+
+        elemento_estilos = self.doc.styles.element
+        existentes = set(elemento_estilos.xpath('w:style/@w:styleId'))
+        for estilo_id, xml in estilos.items():
+            if estilo_id not in existentes:
+                elemento_estilos.append(parse_xml(xml))
+                self.estilos_copiados += 1
+
+    def adicionar_sumario(self, secoes):
+        """Sumário antes do primeiro artigo (os artigos são anexados conforme ficam prontos)"""
+        if self._primeiro_artigo is None:
+            super().adicionar_sumario(secoes)
+            return
+
+        fim_corpo = self._fim_corpo
+        self._fim_corpo = self._primeiro_artigo
+        try:
+            super().adicionar_sumario(secoes)
+        finally:
+            self._fim_corpo = fim_corpo
+
+
+def sumario_volume(artigos, incluir_secoes=False):
+    """
+    Entradas do sumário do volume (formato de adicionar_sumario)
+    artigos: resultados de renderizar_artigo bem-sucedidos, na ordem do volume
+    A numeração conta as páginas a partir da folha de rosto, como em calcular_sumario
+    """
+    from layout_abnt import EstimadorLayout
+
+    entradas = []
+    for artigo in artigos:
+        titulo = f"{artigo['titulo']} — {artigo['autor']}" if artigo['autor'] else artigo['titulo']
+        entradas.append({'numero': '', 'titulo': titulo, 'nivel': 1, 'pagina': 0})
+        if incluir_secoes:
+            entradas.extend(
+                {'numero': s['numero'], 'titulo': s['titulo'], 'nivel': 2, 'pagina': 0}
+                for s in artigo['secoes']
+            )
+
+    # Páginas ocupadas pelo próprio sumário
+    estimador = EstimadorLayout()
+    estimador.adicionar_sumario(entradas)
+
+    # Páginas físicas: capa, folha de rosto, sumário e então os artigos
+    pagina = 3 + estimador.pagina - 1
+    posicao = 0
+    for artigo in artigos:
+        entradas[posicao]['pagina'] = pagina - 1
+        posicao += 1
+        if incluir_secoes:
+            for secao in artigo['secoes']:
+                entradas[posicao]['pagina'] = pagina + secao['pagina'] - 2
+                posicao += 1
+        pagina += artigo['paginas']
+
+    return entradas
+
+
+def compilar_volume(pasta_volume, caminho_saida, processos=None, incluir_secoes=False,
+                    ao_concluir=None, rastreador=None):
+    """
+    Renderiza os artigos de pasta_volume em paralelo e grava o volume em caminho_saida
+    ao_concluir(resultado) é chamado para cada artigo, na ordem do volume
+    rastreador: rastreamento.Rastreador opcional; mede as etapas do processo principal
+    (cada artigo: espera pelo processo de trabalho e anexação do corpo)
+    Retorna a lista de resultados dos artigos (sem o XML)
+    """
+    with open(os.path.join(pasta_volume, ARQUIVO_VOLUME), encoding='utf-8') as f:
+        dados_volume = json.load(f)
+    if not isinstance(dados_volume, dict):
+        raise ValueError(f"{ARQUIVO_VOLUME} deve conter um objeto JSON")
+
+    pacotes = listar_pacotes(pasta_volume)
+    medidor = rastreador or RASTREADOR_NULO
+    with medidor.etapa('Inicialização'):
+        volume = GeradorVolume()
+    volume.rastreador = medidor
+    with medidor.etapa('Capa e folha de rosto'):
+        volume.adicionar_capa(dados_volume)
+        volume.adicionar_folha_rosto(dados_volume)
+
+    artigos = []
+    with ProcessPoolExecutor(max_workers=processos or os.cpu_count()) as executor:
+        # map devolve na ordem do volume; cada corpo é anexado e descartado assim que chega
+        resultados = executor.map(renderizar_artigo, pacotes)
+        for pacote in pacotes:
+            with medidor.etapa('Artigo', artigo=os.path.basename(os.path.normpath(pacote))):
+                resultado = next(resultados)
+                if resultado['sucesso']:
+                    volume.anexar_artigo(resultado.pop('xml'), resultado.pop('estilos'))
+                    artigos.append(resultado)
+            medidor.contar('artigos' if resultado['sucesso'] else 'artigos_com_erro')
+            if ao_concluir:
+                ao_concluir(resultado)
+
+    with medidor.etapa('Sumário'):
+        volume.adicionar_sumario(sumario_volume(artigos, incluir_secoes))
+    volume.salvar(caminho_saida)
+    return artigos
+
+
+def main(argv=None):
+    """Função principal"""
+    parser = argparse.ArgumentParser(
+        description="Compila os artigos de uma pasta num único volume de anais ABNT"
+    )
+    parser.add_argument('volume', help=f"pasta com {ARQUIVO_VOLUME} e uma subpasta por artigo")
+    parser.add_argument('-o', '--saida', required=True, help="arquivo .docx do volume")
+    parser.add_argument('-j', '--processos', type=int, default=None,
+                        help="número de processos (padrão: todos os núcleos)")
+    parser.add_argument('--secoes', action='store_true',
+                        help="inclui as seções de cada artigo no sumário")
+    parser.add_argument('--trace', metavar='ARQUIVO',
+                        help="mede as etapas da compilação e grava o trace (Chrome Trace)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(os.path.join(args.volume, ARQUIVO_VOLUME)):
+        print(f"❌ {ARQUIVO_VOLUME} não encontrado em {args.volume}")
+        return 1
+
+    falhas = []
+
+    def imprimir_resultado(resultado):
+        if resultado['sucesso']:
+            print(f"✅ {resultado['nome']} ({resultado['tempo']:.2f}s, ~{resultado['paginas']} páginas)")
+        else:
+            falhas.append(resultado)
+            print(f"❌ {resultado['nome']}: {resultado['erro']}")
+
+    inicio = time.perf_counter()
+    rastreador = Rastreador() if args.trace else None
+    artigos = compilar_volume(
+        args.volume, args.saida,
+        processos=args.processos,
+        incluir_secoes=args.secoes,
+        ao_concluir=imprimir_resultado,
+        rastreador=rastreador
+    )
+    if rastreador is not None:
+        rastreador.exportar_chrome(args.trace)
+
+    print()
+    print(f"📚 {len(artigos)} artigos compilados em {time.perf_counter() - inicio:.2f}s: {args.saida}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Conferência entre citações do texto e lista de referências (NBR 10520 x NBR 6023)
+
+As referências são indexadas por (sobrenome, ano) num dicionário; o conteúdo é
+percorrido uma única vez e cada citação é verificada no índice em tempo constante.
+O relatório aponta citações sem referência e referências nunca citadas.
+
+Reconhece citações entre parênteses - (SILVA, 2021, p. 10), (SILVA; SOUZA, 2020),
+(SILVA et al., 2019; COSTA, 2018) - e citações no texto - Silva (2021).
+"""
+
+import re
+from functools import lru_cache
+
+from biblioteca_referencias import normalizar
+from motor_abnt import FormatadorABNT
+from varredura_citacoes import obras_citadas, remover_et_al
+
+
+# Uma única passagem pelos parênteses do texto
+_RE_PARENTESES = re.compile(r'\(([^()]+)\)')
+# Citação no texto: "Silva (2021)", "Silva et al. (2021, p. 10)"
+_RE_SO_ANO = re.compile(r'(\d{4})[a-z]?(?:,\s*p\.\s*\d+(?:-\d+)?)?$')
+_RE_AUTOR_ANTES = re.compile(r'([A-ZÀ-Ü][A-Za-zÀ-ü]+)(?:\s+et\s+al\.)?\s+$')
+
+
+@lru_cache(maxsize=8192)
+def _chave_autor(nome):
+    """Sobrenome normalizado (sem et al., acentos e maiúsculas)"""
+    return normalizar(remover_et_al(nome).strip(' .'))
+
+
+@lru_cache(maxsize=65536)
+def _obras_citacao(conteudo):
+    """
+    ((chave, autor, ano), ...) das obras citadas dentro de parênteses: primeiro autor
+    e ano de cada "AUTOR[; COAUTOR...], ano" (varredura linear)
+    Em cache: a mesma citação se repete ao longo do texto e entre gerações
+    """
+    return tuple(
+        (_chave_autor(autor), remover_et_al(autor).strip().upper(), ano)
+        for autor, ano in obras_citadas(conteudo)
+    )
+
+
+def extrair_citacoes(texto):
+    """
+    Percorre o texto uma única vez
+    Gera (chave, autor, ano, trecho) para cada obra citada; em citações de vários
+    autores de uma mesma obra vale o primeiro autor
+    """
+    for match in _RE_PARENTESES.finditer(texto):
+        obras = _obras_citacao(match.group(1))
+        for chave, autor, ano in obras:
+            yield chave, autor, ano, match.group(0)
+
+        if not obras and match.group(1)[0].isdigit():
+            so_ano = _RE_SO_ANO.match(match.group(1))
+            if so_ano:
+                # Citação no texto: o autor vem logo antes dos parênteses
+                autor = _RE_AUTOR_ANTES.search(texto, max(match.start() - 60, 0), match.start())
+                if autor:
+                    nome = autor.group(1)
+                    yield _chave_autor(nome), nome.upper(), so_ano.group(1), texto[autor.start():match.end()]
+
+
+def conferir_citacoes(conteudo, referencias):
+    """
+    Confere as citações do conteúdo com a lista de referências
+    referencias: texto com uma referência por linha, ou lista de referências
+    (texto ou campos analisados, como em adicionar_referencias)
+    Retorna {'citacoes', 'sem_referencia', 'nao_citadas', 'nao_reconhecidas'}
+    """
+    if isinstance(referencias, str):
+        referencias = [r.strip() for r in referencias.split('\n') if r.strip()]
+
+    # Índice (sobrenome, ano) -> referências
+    indice = {}
+    anos_por_autor = {}
+    nao_reconhecidas = []
+    for referencia in referencias:
+        campos = referencia if isinstance(referencia, dict) else FormatadorABNT.analisar_referencia(referencia)
+        if not campos['sobrenome'] or not campos['ano']:
+            nao_reconhecidas.append(campos['texto'])
+            continue
+
+        sobrenome = normalizar(campos['sobrenome'])
+        indice.setdefault((sobrenome, campos['ano']), []).append(campos['texto'])
+        anos_por_autor.setdefault(sobrenome, set()).add(campos['ano'])
+
+    citadas = set()
+    sem_referencia = {}
+    total = 0
+    for chave_autor, autor, ano, trecho in extrair_citacoes(conteudo):
+        total += 1
+        chave = (chave_autor, ano)
+
+        if chave in indice:
+            citadas.add(chave)
+        elif chave in sem_referencia:
+            sem_referencia[chave]['ocorrencias'] += 1
+        else:
+            sem_referencia[chave] = {
+                'autor': autor,
+                'ano': ano,
+                'trecho': trecho,
+                'ocorrencias': 1,
+                # Mesmo autor com outro ano (provável erro de digitação)
+                'anos_disponiveis': sorted(anos_por_autor.get(chave_autor, ()))
+            }
+
+    nao_citadas = [
+        texto
+        for chave, textos in indice.items() if chave not in citadas
+        for texto in textos
+    ]
+
+    return {
+        'citacoes': total,
+        'sem_referencia': list(sem_referencia.values()),
+        'nao_citadas': sorted(nao_citadas),
+        'nao_reconhecidas': nao_reconhecidas
+    }
+
+
+def descrever_conferencia(resultado, limite=10):
+    """Resumo legível da conferência (até limite itens por lista)"""
+    linhas = [f"📑 {resultado['citacoes']} citações conferidas"]
+
+    def listar(titulo, itens):
+        if not itens:
+            return
+        linhas.append(f"{titulo} ({len(itens)}):")
+        linhas.extend(f"   • {item}" for item in itens[:limite])
+        if len(itens) > limite:
+            linhas.append(f"   ... e mais {len(itens) - limite}")
+
+    sem_referencia = []
+    for citacao in resultado['sem_referencia']:
+        item = f"{citacao['autor']}, {citacao['ano']}"
+        if citacao['anos_disponiveis']:
+            item += f" (há referência de {', '.join(citacao['anos_disponiveis'])})"
+        sem_referencia.append(item)
+
+    listar("⚠️ Citações sem referência", sem_referencia)
+    listar("⚠️ Referências não citadas", resultado['nao_citadas'])
+    listar("⚠️ Referências sem autor/ano reconhecível", resultado['nao_reconhecidas'])
+
+    if len(linhas) == 1:
+        linhas.append("✅ Todas as citações têm referência e todas as referências foram citadas")
+    return '\n'.join(linhas)
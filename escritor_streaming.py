@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+Backend de escrita em fluxo (streaming) para documentos ABNT muito grandes
+
+GeradorDocumentoStreaming oferece a mesma API adicionar_* de GeradorDocumentoABNT,
+mas grava cada parágrafo diretamente em word/document.xml dentro do arquivo .docx
+à medida que é adicionado. A memória usada não cresce com o tamanho do trabalho.
+
+As demais partes do pacote (estilos ABNT, configurações, tema, fontes) e as margens
+são copiadas de um documento ABNT vazio gerado uma única vez pelo python-docx, de
+modo que os dois backends produzem a mesma formatação.
+"""
+
+import io
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from lxml import etree
+
+from motor_abnt import (
+    COMPRESSAO_PADRAO, ESTILOS_ABNT, ESTILO_NEGRITO, GeradorDocumentoABNT, entrada_zip,
+    tamanho_gravado
+)
+
+
+PARTE_DOCUMENTO = 'word/document.xml'
+NAMESPACE_W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+# Tamanho do buffer acumulado antes de cada escrita no zip
+TAMANHO_BUFFER = 64 * 1024
+
+# Caracteres de controle não permitidos em XML 1.0
+_RE_CARACTERE_INVALIDO = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_QUEBRA_PAGINA = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+
+
+@lru_cache(maxsize=None)
+def _pacote_modelo():
+    """
+    Partes de um documento ABNT vazio (exceto document.xml) e seu w:sectPr
+    Retorna (lista de (nome, conteúdo), sectPr serializado)
+    """
+    gerador = GeradorDocumentoABNT()
+    buffer = io.BytesIO()
+    gerador.salvar(buffer)
+
+    with zipfile.ZipFile(buffer) as pacote:
+        partes = [
+            (info.filename, pacote.read(info))
+            for info in pacote.infolist()
+            if info.filename != PARTE_DOCUMENTO
+        ]
+
+    sect_pr = etree.tostring(gerador.doc.element.body.sectPr, encoding='unicode')
+    # O namespace já é declarado na raiz do document.xml gerado aqui
+    sect_pr = sect_pr.replace(f' xmlns:w="{NAMESPACE_W}"', '')
+    return partes, sect_pr
+
+
+def _xml_trecho(texto, negrito):
+    """Serializa um trecho (w:r), convertendo quebras de linha e tabulações"""
+    if _RE_CARACTERE_INVALIDO.search(texto):
+        # Mesmo comportamento do python-docx/lxml
+        raise ValueError("All strings must be XML compatible: Unicode or ASCII, "
+                         "no NULL bytes or control characters")
+
+    rpr = ''
+    if negrito:
+        rpr = '<w:rPr><w:rStyle w:val="%s"/></w:rPr>' % ESTILOS_ABNT[ESTILO_NEGRITO]['id']
+
+    conteudo = []
+    for i, linha in enumerate(texto.split('\n')):
+        if i:
+            conteudo.append('<w:br/>')
+        for j, parte in enumerate(linha.split('\t')):
+            if j:
+                conteudo.append('<w:tab/>')
+            if parte:
+                conteudo.append(f'<w:t xml:space="preserve">{escape(parte)}</w:t>')
+
+    return f'<w:r>{rpr}{"".join(conteudo)}</w:r>'
+
+
+class GeradorDocumentoStreaming(GeradorDocumentoABNT):
+    """
+    Gera o documento gravando word/document.xml em fluxo, parágrafo a parágrafo
+    destino: caminho final previsto (opcional); o arquivo temporário é criado na
+    mesma pasta para que salvar() apenas o renomeie
+    compressao: perfil de motor_abnt.PERFIS_COMPRESSAO (definido na criação, pois as
+    partes são comprimidas à medida que são escritas)
+    """
+
+    def __init__(self, destino=None, compressao=COMPRESSAO_PADRAO):
+        pasta = os.path.dirname(os.path.abspath(destino)) if destino else None
+        descritor, self._caminho_temporario = tempfile.mkstemp(suffix='.docx', dir=pasta)
+        os.close(descritor)
+
+        self._caminho_salvo = None
+        self._compressao = compressao
+        self._buffer = []
+        self._tamanho_buffer = 0
+
+        partes, self._sect_pr = _pacote_modelo()
+        documento, nivel = entrada_zip(PARTE_DOCUMENTO, compressao)
+        self._zip = zipfile.ZipFile(self._caminho_temporario, 'w',
+                                    compression=documento.compress_type, compresslevel=nivel)
+
+        for nome, conteudo in partes:
+            info, nivel_parte = entrada_zip(nome, compressao)
+            self._zip.writestr(info, conteudo, compress_type=info.compress_type, compresslevel=nivel_parte)
+
+        # ZipFile.open não recebe o nível: aberta pelo nome, a entrada usa o método e o nível
+        # do próprio ZipFile e a data padrão do ZipInfo (DATA_ZIP)
+        self._fluxo = self._zip.open(documento.filename, 'w', force_zip64=True)
+        self._escrever(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<w:document xmlns:w="{NAMESPACE_W}"><w:body>'
+        )
+
+    def _escrever(self, xml):
+        """Acumula XML e descarrega no zip a cada TAMANHO_BUFFER caracteres"""
+        self._buffer.append(xml)
+        self._tamanho_buffer += len(xml)
+        if self._tamanho_buffer >= TAMANHO_BUFFER:
+            self._descarregar()
+
+    def _descarregar(self):
+        if self._buffer:
+            self._fluxo.write(''.join(self._buffer).encode('utf-8'))
+            self._buffer = []
+            self._tamanho_buffer = 0
+
+    def _configurar_documento(self):
+        """Estilos e margens vêm do pacote modelo (ver _pacote_modelo)"""
+
+    def _paragrafo(self, estilo, *trechos):
+        """Serializa e grava um parágrafo com estilo ABNT nomeado"""
+        xml = ['<w:p><w:pPr><w:pStyle w:val="%s"/></w:pPr>' % ESTILOS_ABNT[estilo]['id']]
+
+        for trecho in trechos:
+            if isinstance(trecho, tuple):
+                texto, negrito = trecho
+            else:
+                texto, negrito = trecho, False
+
+            if texto:
+                xml.append(_xml_trecho(texto, negrito))
+
+        xml.append('</w:p>')
+        self._escrever(''.join(xml))
+        self.rastreador.contar('paragrafos')
+        self.rastreador.contar('trechos', len(xml) - 2)
+
+    def _quebra_pagina(self):
+        """Grava quebra de página"""
+        self._escrever(_QUEBRA_PAGINA)
+        self.rastreador.contar('quebras_pagina')
+
+    def _inserir_fragmento(self, nome, valores):
+        """Grava uma página pré-textual preenchida a partir do fragmento em cache"""
+        for elemento in self._preencher_fragmento(nome, valores):
+            xml = etree.tostring(elemento, encoding='unicode')
+            self._escrever(xml.replace(f' xmlns:w="{NAMESPACE_W}"', ''))
+            self.rastreador.contar('paragrafos')
+
+    def _finalizar(self):
+        """Fecha o corpo, o document.xml e o arquivo zip"""
+        self._escrever(self._sect_pr + '</w:body></w:document>')
+        self._descarregar()
+        self._fluxo.close()
+        self._zip.close()
+
+    def descartar(self):
+        """Abandona o documento em construção e remove o arquivo temporário"""
+        if self._caminho_salvo is None and os.path.exists(self._caminho_temporario):
+            self._fluxo.close()
+            self._zip.close()
+            os.remove(self._caminho_temporario)
+
+    def salvar(self, caminho=None, compressao=None):
+        """
+        Finaliza o documento e o grava em caminho
+        caminho: arquivo (o temporário é apenas renomeado), fluxo binário (cópia em blocos,
+        sem carregar o documento na memória) ou None para receber os bytes; nos dois
+        últimos casos o temporário é removido após a cópia
+        compressao: só pode confirmar o perfil escolhido na criação
+        """
+        if compressao is not None and compressao != self._compressao:
+            raise ValueError(f"o documento foi comprimido com o perfil {self._compressao!r} na criação")
+
+        with self.rastreador.etapa('Salvar', compressao=self._compressao):
+            if self._caminho_salvo is None:
+                self._finalizar()
+                self._caminho_salvo = self._caminho_temporario
+            elif self._caminho_salvo == self._caminho_temporario:
+                raise RuntimeError("o documento já foi entregue em memória; grave-o em arquivo para salvar mais de uma vez")
+
+            if caminho is None or not isinstance(caminho, (str, os.PathLike)):
+                with open(self._caminho_salvo, 'rb') as f:
+                    if caminho is None:
+                        documento = f.read()
+                    else:
+                        shutil.copyfileobj(f, caminho)
+                if self._caminho_salvo == self._caminho_temporario:
+                    os.remove(self._caminho_temporario)
+            elif self._caminho_salvo == self._caminho_temporario:
+                shutil.move(self._caminho_temporario, caminho)
+                self._caminho_salvo = caminho
+            elif os.path.abspath(caminho) != os.path.abspath(self._caminho_salvo):
+                shutil.copyfile(self._caminho_salvo, caminho)
+
+        if self.rastreador.ativo:
+            self.rastreador.contar('bytes_gravados', len(documento) if caminho is None else tamanho_gravado(caminho))
+        if caminho is None:
+            return documento
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Estrutura do conteúdo em texto simples, analisada em uma única passagem
+
+analisar_conteudo percorre as linhas uma vez e monta a árvore do trabalho:
+    - "1 INTRODUÇÃO", "1.1 Contexto", "1.1.1 Histórico" (até 5 níveis, NBR 6024) abrem
+      seções aninhadas pela numeração; o título primário é em MAIÚSCULAS, os demais
+      começam por maiúscula e têm até 150 caracteres
+    - linhas iniciadas por ">" formam uma citação longa (NBR 10520); a fonte
+      "(SILVA, 2020, p. 15)" no fim de uma linha encerra a citação e vira a linha de fonte
+    - linhas iniciadas por "- ", "* ", "• " ou por alínea ("a) ") formam uma lista
+    - as demais linhas não vazias são parágrafos; linhas vazias não têm efeito
+
+A árvore é feita de tuplas (imutável, usável como chave de cache) e é aproveitada pela
+renderização, pelo sumário, pela verificação e pelo cache de seções do modo de
+observação, sem dividir o texto de novo:
+    seção:  (numero, titulo, nivel, blocos, subsecoes)
+    blocos: (PARAGRAFO, texto), (CITACAO_LONGA, texto, autor, ano, pagina), (LISTA, itens)
+A raiz tem numero '' e nivel 0; seus blocos são o texto anterior ao primeiro título,
+que não entra no documento. Seções sem texto nem subseções são omitidas.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+
+PARAGRAFO = 'paragrafo'
+CITACAO_LONGA = 'citacao_longa'
+LISTA = 'lista'
+
+NIVEL_MAXIMO = 5
+
+_MAIUSCULAS = 'A-ZÀÁÂÃÄÅÇÈÉÊËÌÍÎÏÑÒÓÔÕÖÙÚÛÜÝ'
+_MINUSCULAS = 'a-zß-öø-ÿ'
+# Título primário, todo em maiúsculas ("1 INTRODUÇÃO", "2 CONTEXTO: A COVID-19"), ou de
+# subseção ("1.1 Contexto histórico")
+_RE_TITULO = re.compile(
+    rf'(\d+)\s+([{_MAIUSCULAS}][^{_MINUSCULAS}]*)'
+    rf'|(\d+(?:\.\d+){{1,{NIVEL_MAXIMO - 1}}})\s+([{_MAIUSCULAS}].{{0,149}})'
+)
+# Fonte no fim de uma citação longa: "(SILVA, 2020)", "(SILVA; SOUZA, 2020, p. 15-16)"
+_RE_FONTE = re.compile(r'\(([^(),]+),\s*(\d{4}[a-z]?)(?:,\s*p\.\s*(\d+(?:-\d+)?))?\)')
+_MARCADORES_LISTA = ('- ', '* ', '• ')
+
+# Últimas árvores analisadas (LRU), pela impressão digital do texto: a geração, o sumário
+# e a conferência de um mesmo trabalho as reaproveitam, e processos de longa duração
+# (serviço, lote, observação) não retêm textos inteiros de trabalhos anteriores
+LIMITE_CACHE_ARVORES = 2
+_arvores = OrderedDict()
+_trava_arvores = threading.Lock()
+
+
+def analisar_titulo(linha):
+    """(numero, titulo, nivel) se a linha (sem espaços nas pontas) for um título de seção"""
+    if not linha[:1].isdigit():
+        return None
+    match = _RE_TITULO.fullmatch(linha)
+    if match is None:
+        return None
+    if match.group(1):
+        return match.group(1), match.group(2), 1
+    return match.group(3), match.group(4).rstrip(), match.group(3).count('.') + 1
+
+
+def _item_lista(linha):
+    """Texto do item se a linha começar com marcador de lista ou de alínea, senão None"""
+    if linha.startswith(_MARCADORES_LISTA):
+        return linha[2:].strip()
+    if 'a' <= linha[0] <= 'z' and linha[1:3] == ') ':
+        return linha[3:].strip()
+    return None
+
+
+def _fonte(texto):
+    """Match da fonte "(AUTOR, ano[, p. x])" no fim do texto, ou None"""
+    if not texto.endswith(')'):
+        return None
+    inicio = texto.rfind('(')
+    return _RE_FONTE.fullmatch(texto, inicio) if inicio > 0 else None
+
+
+def _citacao_longa(linhas):
+    """Bloco de citação longa; a fonte, se houver, sai do texto"""
+    texto = ' '.join(linhas)
+    fonte = _fonte(texto)
+    if fonte is None:
+        return (CITACAO_LONGA, texto, None, None, None)
+    autor, ano, pagina = fonte.groups()
+    return (CITACAO_LONGA, texto[:fonte.start()].rstrip(), autor.strip(), ano, pagina)
+
+
+def _congelar(secao):
+    """Seção em construção (listas) -> tuplas, sem as subseções vazias"""
+    numero, titulo, nivel, blocos, subsecoes = secao
+    congeladas = (_congelar(subsecao) for subsecao in subsecoes)
+    return (numero, titulo, nivel, tuple(blocos), tuple(s for s in congeladas if s[3] or s[4]))
+
+
+def analisar_conteudo(conteudo):
+    """
+    Árvore do conteúdo (ver o início do módulo), em uma passagem pelas linhas
+    Em cache: a geração, o sumário e a conferência analisam o mesmo texto
+    """
+    chave = hashlib.blake2b(conteudo.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    with _trava_arvores:
+        raiz = _arvores.get(chave)
+        if raiz is not None:
+            _arvores.move_to_end(chave)
+            return raiz
+
+    raiz = _analisar(conteudo)
+    with _trava_arvores:
+        _arvores[chave] = raiz
+        while len(_arvores) > LIMITE_CACHE_ARVORES:
+            _arvores.popitem(last=False)
+    return raiz
+
+
+def limpar_cache_arvores():
+    """Esvazia o cache de analisar_conteudo"""
+    with _trava_arvores:
+        _arvores.clear()
+
+
+def _analisar(conteudo):
+    """Monta a árvore de analisar_conteudo"""
+    raiz = ['', '', 0, [], []]
+    pilha = [raiz]
+    citacao = []
+    lista = []
+
+    def encerrar():
+        """Fecha a citação longa ou a lista em andamento"""
+        if citacao:
+            pilha[-1][3].append(_citacao_longa(citacao))
+            citacao.clear()
+        if lista:
+            pilha[-1][3].append((LISTA, tuple(lista)))
+            lista.clear()
+
+    for linha in conteudo.split('\n'):
+        linha = linha.strip()
+        if not linha:
+            continue
+
+        if linha[0] == '>':
+            if lista:
+                encerrar()
+            texto = linha[1:].strip()
+            if texto:
+                citacao.append(texto)
+                if _fonte(texto):
+                    encerrar()
+            continue
+
+        item = _item_lista(linha)
+        if item is not None:
+            if citacao:
+                encerrar()
+            if item:
+                lista.append(item)
+            continue
+
+        encerrar()
+        titulo = analisar_titulo(linha)
+        if titulo is None:
+            pilha[-1][3].append((PARAGRAFO, linha))
+            continue
+
+        numero, texto, nivel = titulo
+        while pilha[-1][2] >= nivel:
+            pilha.pop()
+        secao = [numero, texto, nivel, [], []]
+        pilha[-1][4].append(secao)
+        pilha.append(secao)
+
+    encerrar()
+    return _congelar(raiz)
+
+
+def percorrer_secoes(secao):
+    """Seções abaixo de secao (em qualquer nível) na ordem do documento"""
+    for subsecao in secao[4]:
+        yield subsecao
+        yield from percorrer_secoes(subsecao)
+
+
+def verificar_estrutura(raiz):
+    """
+    Problemas de estrutura do conteúdo (NBR 6024 e NBR 10520), na ordem do documento
+    Retorna lista de textos: numeração fora de sequência, nível pulado, texto antes do
+    primeiro título e citação longa sem fonte
+    """
+    avisos = []
+    if raiz[3]:
+        avisos.append(f"Texto antes do primeiro título não entra no documento ({len(raiz[3])} bloco(s))")
+
+    def verificar(secao):
+        numero_pai, _, nivel_pai, _, subsecoes = secao
+        anterior = 0
+        for subsecao in subsecoes:
+            numero, titulo, nivel, blocos, _ = subsecao
+            rotulo = f"{numero} {titulo}"
+            if nivel != nivel_pai + 1:
+                avisos.append(f"{rotulo}: seção de nível {nivel} sem a seção de nível {nivel - 1} acima")
+            elif nivel_pai and not numero.startswith(numero_pai + '.'):
+                avisos.append(f"{rotulo}: numeração fora da seção {numero_pai}")
+            else:
+                atual = int(numero.rsplit('.', 1)[-1])
+                if anterior and atual != anterior + 1:
+                    avisos.append(f"{rotulo}: numeração fora de sequência (após {anterior})")
+                anterior = atual
+
+            if any(b[0] == CITACAO_LONGA and b[2] is None for b in blocos):
+                avisos.append(f"{rotulo}: citação longa sem fonte (AUTOR, ano, p. x)")
+            verificar(subsecao)
+
+    verificar(raiz)
+    return avisos
+
+
+def descrever_estrutura(avisos, limite=10):
+    """Resumo legível de verificar_estrutura (até limite avisos), ou '' sem problemas"""
+    if not avisos:
+        return ''
+    linhas = [f"⚠️ Estrutura do conteúdo ({len(avisos)}):"]
+    linhas.extend(f"   • {aviso}" for aviso in avisos[:limite])
+    if len(avisos) > limite:
+        linhas.append(f"   ... e mais {len(avisos) - limite}")
+    return '\n'.join(linhas)
@@ -8,466 +8,46 @@ Versão: 3.0 - Interface moderna e funcionalidades completas
 
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
-import re
-from docx import Document
-from docx.shared import Pt, Inches, RGBColor, Cm
-from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_LINE_SPACING
-from docx.enum.style import WD_STYLE_TYPE
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
 import os
+import queue
+import sqlite3
+import threading
 from datetime import datetime
 
+# Motor de formatação (reexportado para compatibilidade com quem importa daqui)
+from motor_abnt import (  # noqa: F401
+    FormatadorABNT, FormatadorIncremental, GeradorDocumentoABNT, GeracaoCancelada,
+    dividir_em_secoes, gerar_trabalho
+)
+from importador_docx import texto_para_conteudo
+from biblioteca_referencias import BibliotecaReferencias
+from conferencia_citacoes import conferir_citacoes, descrever_conferencia
+from estrutura_abnt import analisar_conteudo, descrever_estrutura, verificar_estrutura
+from rastreamento import RASTREADOR_NULO, Rastreador, descrever_rastreamento
+from cache_renderizacao import CacheRenderizacao, chave_renderizacao
+from projeto_abnt import EXTENSAO as EXTENSAO_PROJETO, ProjetoABNT
+from pdf_abnt import GeradorPDF
+
+# Pausa na digitação (ms) antes da formatação automática
+ATRASO_FORMATACAO_AUTOMATICA = 800
+# Pausa na digitação (ms) antes da busca na biblioteca de referências
+ATRASO_BUSCA_BIBLIOTECA = 250
+LIMITE_RESULTADOS_BIBLIOTECA = 20
+# Textos longos entram nos editores em partes (caracteres por chamada de after), sem
+# bloquear a interface; acima do limite, o conteúdo é editado uma seção por vez
+TAMANHO_PARTE_EDITOR = 50000
+LIMITE_EDITOR_COMPLETO = 500000
+# Intervalo (ms) entre salvamentos automáticos do projeto
+INTERVALO_AUTOSALVAMENTO = 5000
+# Diário do trabalho ainda não salvo como projeto (recuperado após uma queda)
+ARQUIVO_RECUPERACAO = os.path.join(os.path.expanduser('~'), '.formatador_abnt', 'recuperacao' + EXTENSAO_PROJETO)
+
 
 # Configuração do tema
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
 
-class FormatadorABNT:
-    """Classe responsável pela formatação completa ABNT"""
-
-    @staticmethod
-    def formatar_citacoes(texto):
-        """
-        Formata citações conforme NBR 10520
-        - Curtas: até 3 linhas, entre aspas
-        - Longas: >3 linhas, recuo 4cm, sem aspas
-        - Autor em MAIÚSCULAS
-        """
-
-        def converter_maiusculas(match):
-            """Converte citações para MAIÚSCULAS"""
-            conteudo = match.group(1)
-            autores = conteudo.split(';')
-            autores_formatados = []
-
-            for autor in autores:
-                autor = autor.strip()
-                partes = re.split(r'(,\s*\d{4})', autor, maxsplit=1)
-
-                if len(partes) >= 2:
-                    nome = partes[0].strip()
-                    resto = ''.join(partes[1:])
-
-                    palavras = nome.split()
-                    palavras_maiusculas = [
-                        p.lower() if p.lower() in ['et', 'al', 'al.'] else p.upper()
-                        for p in palavras
-                    ]
-
-                    autores_formatados.append(' '.join(palavras_maiusculas) + resto)
-                else:
-                    palavras = autor.split()
-                    palavras_maiusculas = [
-                        p.lower() if p.lower() in ['et', 'al', 'al.'] else p.upper()
-                        for p in palavras
-                    ]
-                    autores_formatados.append(' '.join(palavras_maiusculas))
-
-            return f"({'; '.join(autores_formatados)})"
-
-        # Padrão de citações entre parênteses
-        padrao = r'\(([A-Za-zÀ-ÿ][A-Za-zÀ-ÿ\s,;]+\d{4}[a-z]?(?:,\s*p\.\s*\d+(?:-\d+)?)?)\)'
-        texto = re.sub(padrao, converter_maiusculas, texto)
-
-        # Converte múltiplos autores para et al. (4+)
-        def converter_et_al(match):
-            conteudo = match.group(1)
-            autores = conteudo.split(';')
-
-            if len(autores) >= 4:
-                primeiro = autores[0].strip()
-                primeiro = re.sub(r',\s*\d{4}.*$', '', primeiro).strip()
-
-                ano_match = re.search(r',\s*(\d{4}[a-z]?(?:,\s*p\.\s*\d+(?:-\d+)?)?)', conteudo)
-                if ano_match:
-                    ano = ano_match.group(1)
-                    return f"({primeiro} et al., {ano})"
-
-            return match.group(0)
-
-        texto = re.sub(
-            r'\(([A-ZÀ-Ü][A-Za-zÀ-ü]+(?:\s+[a-zà-ü]+)*(?:;\s*[A-ZÀ-Ü][A-Za-zÀ-ü]+(?:\s+[a-zà-ü]+)*){3,}[,\s]+\d{4}[a-z]?(?:,\s*p\.\s*\d+(?:-\d+)?)?)\)',
-            converter_et_al, texto
-        )
-
-        return texto
-
-    @staticmethod
-    def formatar_referencias(texto):
-        """
-        Formata referências conforme NBR 6023
-        SOBRENOME, Nome. Título: subtítulo. Edição. Local: Editora, ano.
-        """
-        linhas = texto.split('\n')
-        referencias_formatadas = []
-
-        for linha in linhas:
-            if linha.strip():
-                # Aplica formatação básica de referência
-                referencias_formatadas.append(linha.strip())
-
-        return '\n'.join(referencias_formatadas)
-
-
-class GeradorDocumentoABNT:
-    """Classe para gerar documentos Word completos conforme ABNT"""
-
-    def __init__(self):
-        self.doc = Document()
-        self._configurar_documento()
-
-    def _configurar_documento(self):
-        """Configura margens e estilos padrão ABNT"""
-        # Configurar margens (NBR 14724)
-        sections = self.doc.sections
-        for section in sections:
-            section.top_margin = Cm(3)
-            section.bottom_margin = Cm(2)
-            section.left_margin = Cm(3)
-            section.right_margin = Cm(2)
-            section.page_height = Cm(29.7)  # A4
-            section.page_width = Cm(21)
-
-    def adicionar_capa(self, dados):
-        """
-        Gera capa conforme ABNT
-        dados = {
-            'instituicao': str,
-            'curso': str,
-            'autor': str,
-            'titulo': str,
-            'local': str,
-            'ano': str
-        }
-        """
-        # Instituição (topo, centralizado)
-        p = self.doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = p.add_run(dados.get('instituicao', '').upper())
-        run.font.name = 'Arial'
-        run.font.size = Pt(12)
-        run.bold = True
-
-        # Curso
-        p = self.doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = p.add_run(dados.get('curso', '').upper())
-        run.font.name = 'Arial'
-        run.font.size = Pt(12)
-
-        # Espaçamento vertical
-        for _ in range(8):
-            self.doc.add_paragraph()
-
-        # Autor (centro)
-        p = self.doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = p.add_run(dados.get('autor', '').upper())
-        run.font.name = 'Arial'
-        run.font.size = Pt(12)
-        run.bold = True
-
-        # Espaçamento
-        for _ in range(4):
-            self.doc.add_paragraph()
-
-        # Título
-        p = self.doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = p.add_run(dados.get('titulo', '').upper())
-        run.font.name = 'Arial'
-        run.font.size = Pt(14)
-        run.bold = True
-
-        # Espaçamento até o rodapé
-        for _ in range(8):
-            self.doc.add_paragraph()
-
-        # Local e ano (rodapé)
-        p = self.doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = p.add_run(dados.get('local', '').upper())
-        run.font.name = 'Arial'
-        run.font.size = Pt(12)
-
-        p = self.doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = p.add_run(dados.get('ano', ''))
-        run.font.name = 'Arial'
-        run.font.size = Pt(12)
-
-        # Quebra de página
-        self.doc.add_page_break()
-
-    def adicionar_folha_rosto(self, dados):
-        """
-        Gera folha de rosto conforme ABNT
-        dados = {
-            'autor': str,
-            'titulo': str,
-            'natureza': str (ex: "Trabalho de Conclusão de Curso"),
-            'objetivo': str (ex: "Obtenção do título de Bacharel"),
-            'orientador': str,
-            'local': str,
-            'ano': str
-        }
-        """
-        # Autor (topo)
-        p = self.doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = p.add_run(dados.get('autor', '').upper())
-        run.font.name = 'Arial'
-        run.font.size = Pt(12)
-        run.bold = True
-
-        # Espaçamento
-        for _ in range(8):
-            self.doc.add_paragraph()
-
-        # Título
-        p = self.doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = p.add_run(dados.get('titulo', '').upper())
-        run.font.name = 'Arial'
-        run.font.size = Pt(14)
-        run.bold = True
-
-        # Espaçamento
-        for _ in range(4):
-            self.doc.add_paragraph()
-
-        # Natureza do trabalho (recuado à direita)
-        p = self.doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-        p.paragraph_format.left_indent = Cm(8)
-
-        texto_natureza = f"{dados.get('natureza', '')}\n\n{dados.get('objetivo', '')}"
-        if dados.get('orientador'):
-            texto_natureza += f"\n\nOrientador: {dados.get('orientador', '')}"
-
-        run = p.add_run(texto_natureza)
-        run.font.name = 'Arial'
-        run.font.size = Pt(10)
-        p.paragraph_format.line_spacing_rule = WD_LINE_SPACING.SINGLE
-
-        # Espaçamento
-        for _ in range(6):
-            self.doc.add_paragraph()
-
-        # Local e ano
-        p = self.doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = p.add_run(dados.get('local', '').upper())
-        run.font.name = 'Arial'
-        run.font.size = Pt(12)
-
-        p = self.doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = p.add_run(dados.get('ano', ''))
-        run.font.name = 'Arial'
-        run.font.size = Pt(12)
-
-        # Quebra de página
-        self.doc.add_page_break()
-
-    def adicionar_resumo(self, texto_resumo, palavras_chave):
-        """Adiciona resumo formatado conforme ABNT"""
-        # Título RESUMO
-        p = self.doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = p.add_run('RESUMO')
-        run.font.name = 'Arial'
-        run.font.size = Pt(12)
-        run.bold = True
-
-        self.doc.add_paragraph()
-
-        # Texto do resumo
-        p = self.doc.add_paragraph(texto_resumo)
-        p.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-        p.paragraph_format.line_spacing = 1.5
-        run = p.runs[0]
-        run.font.name = 'Arial'
-        run.font.size = Pt(12)
-
-        self.doc.add_paragraph()
-
-        # Palavras-chave
-        p = self.doc.add_paragraph()
-        run = p.add_run('Palavras-chave: ')
-        run.font.name = 'Arial'
-        run.font.size = Pt(12)
-        run.bold = True
-
-        run = p.add_run(palavras_chave)
-        run.font.name = 'Arial'
-        run.font.size = Pt(12)
-
-        # Quebra de página
-        self.doc.add_page_break()
-
-    def adicionar_sumario(self, secoes):
-        """
-        Gera sumário automático
-        secoes = [{'numero': '1', 'titulo': 'INTRODUÇÃO', 'pagina': 10}, ...]
-        """
-        # Título SUMÁRIO
-        p = self.doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = p.add_run('SUMÁRIO')
-        run.font.name = 'Arial'
-        run.font.size = Pt(12)
-        run.bold = True
-
-        self.doc.add_paragraph()
-
-        # Itens do sumário
-        for secao in secoes:
-            p = self.doc.add_paragraph()
-
-            # Número e título
-            texto = f"{secao['numero']}  {secao['titulo']}"
-            run = p.add_run(texto)
-            run.font.name = 'Arial'
-            run.font.size = Pt(12)
-
-            # Linha pontilhada e número da página
-            espacos = 80 - len(texto)
-            run = p.add_run('.' * espacos)
-            run.font.name = 'Arial'
-            run.font.size = Pt(12)
-
-            run = p.add_run(f"  {secao['pagina']}")
-            run.font.name = 'Arial'
-            run.font.size = Pt(12)
-
-        # Quebra de página
-        self.doc.add_page_break()
-
-    def adicionar_secao(self, numero, titulo, texto, nivel=1):
-        """
-        Adiciona seção formatada conforme NBR 6024
-        nivel: 1 (principal), 2 (subseção), 3 (sub-subseção)
-        """
-        # Espaçamento antes
-        if nivel == 1:
-            p = self.doc.add_paragraph()
-            p.paragraph_format.space_before = Pt(24)
-
-        # Título da seção
-        p = self.doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.LEFT
-
-        texto_titulo = f"{numero}  {titulo.upper()}"
-        run = p.add_run(texto_titulo)
-        run.font.name = 'Arial'
-        run.font.size = Pt(12)
-        run.bold = True
-
-        if nivel == 1:
-            p.paragraph_format.space_after = Pt(12)
-        else:
-            p.paragraph_format.space_after = Pt(6)
-
-        # Texto da seção
-        paragrafos = texto.split('\n\n')
-        for paragrafo in paragrafos:
-            if paragrafo.strip():
-                p = self.doc.add_paragraph(paragrafo.strip())
-                p.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-                p.paragraph_format.line_spacing = 1.5
-                p.paragraph_format.first_line_indent = Cm(1.25)  # Recuo de parágrafo
-
-                for run in p.runs:
-                    run.font.name = 'Arial'
-                    run.font.size = Pt(12)
-
-    def adicionar_citacao_longa(self, texto_citacao, autor, ano, pagina=None):
-        """Adiciona citação longa (>3 linhas) formatada conforme NBR 10520"""
-        p = self.doc.add_paragraph(texto_citacao)
-        p.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-        p.paragraph_format.left_indent = Cm(4)
-        p.paragraph_format.line_spacing_rule = WD_LINE_SPACING.SINGLE
-
-        for run in p.runs:
-            run.font.name = 'Arial'
-            run.font.size = Pt(10)
-
-        # Referência da citação
-        ref = f"({autor.upper()}, {ano}"
-        if pagina:
-            ref += f", p. {pagina}"
-        ref += ")"
-
-        p_ref = self.doc.add_paragraph(ref)
-        p_ref.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-        p_ref.paragraph_format.left_indent = Cm(4)
-        for run in p_ref.runs:
-            run.font.name = 'Arial'
-            run.font.size = Pt(10)
-
-    def adicionar_referencias(self, lista_referencias):
-        """
-        Adiciona seção de referências formatada conforme NBR 6023
-        lista_referencias = ['REF1', 'REF2', ...]
-        """
-        # Quebra de página antes
-        self.doc.add_page_break()
-
-        # Título REFERÊNCIAS
-        p = self.doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = p.add_run('REFERÊNCIAS')
-        run.font.name = 'Arial'
-        run.font.size = Pt(12)
-        run.bold = True
-
-        p.paragraph_format.space_after = Pt(12)
-
-        # Ordenar alfabeticamente
-        referencias_ordenadas = sorted(lista_referencias)
-
-        # Adicionar cada referência
-        for referencia in referencias_ordenadas:
-            if referencia.strip():
-                p = self.doc.add_paragraph()
-                p.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                p.paragraph_format.line_spacing_rule = WD_LINE_SPACING.SINGLE
-                p.paragraph_format.space_after = Pt(6)
-
-                # Identificar e aplicar negrito no título
-                match = re.match(r'^([A-ZÀÁÂÃÄÅÇÈÉÊËÌÍÎÏÑÒÓÔÕÖÙÚÛÜÝ][^.]+\.)\s*([^.]+\.)\s*(.*)$', referencia)
-
-                if match:
-                    autor = match.group(1)
-                    titulo = match.group(2)
-                    resto = match.group(3)
-
-                    run = p.add_run(autor + ' ')
-                    run.font.name = 'Arial'
-                    run.font.size = Pt(12)
-
-                    run = p.add_run(titulo)
-                    run.font.name = 'Arial'
-                    run.font.size = Pt(12)
-                    run.bold = True
-
-                    if resto:
-                        run = p.add_run(' ' + resto)
-                        run.font.name = 'Arial'
-                        run.font.size = Pt(12)
-                else:
-                    run = p.add_run(referencia)
-                    run.font.name = 'Arial'
-                    run.font.size = Pt(12)
-
-    def salvar(self, caminho):
-        """Salva o documento"""
-        self.doc.save(caminho)
-
-
 class AplicativoABNTModerno(ctk.CTk):
     """Aplicativo principal com interface moderna"""
 
@@ -481,7 +61,41 @@ class AplicativoABNTModerno(ctk.CTk):
         self.dados_trabalho = {}
         self.secoes = []
 
+        # Geração em segundo plano
+        self._fila_geracao = None
+        self._cancelar_geracao = None
+
+        # Formatação incremental do editor de conteúdo
+        self._formatador_incremental = FormatadorIncremental()
+        self._formatacao_agendada = None
+
+        # Editores sendo preenchidos em partes: editor -> texto completo e posição
+        self._carregamentos = {}
+        # Edição por seção: (título, texto) de cada seção; o editor mostra apenas a atual
+        self._secoes_conteudo = None
+        self._rotulos_secoes = []
+        self._secao_atual = 0
+
+        # Biblioteca de referências compartilhada entre trabalhos (opcional)
+        try:
+            self.biblioteca = BibliotecaReferencias()
+        except (OSError, sqlite3.Error):
+            self.biblioteca = None
+        self._busca_agendada = None
+
+        # Documentos já gerados: gerar de novo sem alterações não renderiza outra vez
+        try:
+            self.cache = CacheRenderizacao()
+        except OSError:
+            self.cache = None
+
+        # Projeto aberto (diário em disco); sem projeto, o diário de recuperação
+        self.projeto = None
+        self._autosalvamento = None
+
         self._criar_interface()
+        self._abrir_recuperacao()
+        self.protocol("WM_DELETE_WINDOW", self._ao_fechar)
 
     def _criar_interface(self):
         """Cria a interface moderna com abas"""
@@ -548,6 +162,22 @@ class AplicativoABNTModerno(ctk.CTk):
         )
         self.btn_gerar.grid(row=6, column=0, padx=20, pady=10)
 
+        # Progresso da geração (visível apenas durante a geração)
+        self.progresso_label = ctk.CTkLabel(
+            self.sidebar,
+            text="",
+            font=ctk.CTkFont(size=11)
+        )
+        self.progresso_barra = ctk.CTkProgressBar(self.sidebar, width=160)
+        self.progresso_barra.set(0)
+        self.btn_cancelar = ctk.CTkButton(
+            self.sidebar,
+            text="⛔ Cancelar",
+            command=self.cancelar_geracao,
+            fg_color="darkred",
+            hover_color="#5a0000"
+        )
+
         # Informações na parte inferior
         self.info_label = ctk.CTkLabel(
             self.sidebar,
@@ -568,9 +198,35 @@ class AplicativoABNTModerno(ctk.CTk):
             onvalue="dark",
             offvalue="light"
         )
-        self.tema_switch.grid(row=13, column=0, padx=20, pady=(0, 20))
+        self.tema_switch.grid(row=13, column=0, padx=20, pady=(0, 10))
         self.tema_switch.select()
 
+        # Medição de desempenho (grava um trace ao lado do documento)
+        self.rastrear_switch = ctk.CTkSwitch(self.sidebar, text="📊 Medir desempenho")
+        self.rastrear_switch.grid(row=14, column=0, padx=20, pady=(0, 20))
+
+        # Projeto (.abnt): salvo automaticamente a cada INTERVALO_AUTOSALVAMENTO
+        self.btn_abrir_projeto = ctk.CTkButton(
+            self.sidebar,
+            text="📂 Abrir Projeto",
+            command=self.abrir_projeto
+        )
+        self.btn_abrir_projeto.grid(row=15, column=0, padx=20, pady=(0, 5))
+
+        self.btn_salvar_projeto = ctk.CTkButton(
+            self.sidebar,
+            text="💾 Salvar Projeto",
+            command=self.salvar_projeto
+        )
+        self.btn_salvar_projeto.grid(row=16, column=0, padx=20, pady=5)
+
+        self.autosalvo_label = ctk.CTkLabel(
+            self.sidebar,
+            text="",
+            font=ctk.CTkFont(size=10)
+        )
+        self.autosalvo_label.grid(row=17, column=0, padx=20, pady=(0, 20))
+
         # Frame de conteúdo (área principal)
         self.frame_conteudo = ctk.CTkFrame(self, corner_radius=0)
         self.frame_conteudo.grid(row=0, column=1, sticky="nsew", padx=0, pady=0)
@@ -713,6 +369,13 @@ class AplicativoABNTModerno(ctk.CTk):
         )
         btn_carregar.pack(side="left", padx=5)
 
+        btn_reformatar = ctk.CTkButton(
+            frame_btns,
+            text="🪄 ABNT em Word existente",
+            command=self.reformatar_word
+        )
+        btn_reformatar.pack(side="left", padx=5)
+
         btn_formatar = ctk.CTkButton(
             frame_btns,
             text="✨ Formatar ABNT",
@@ -723,10 +386,32 @@ class AplicativoABNTModerno(ctk.CTk):
         btn_limpar = ctk.CTkButton(
             frame_btns,
             text="🗑️ Limpar",
-            command=lambda: self.text_conteudo.delete("1.0", "end")
+            command=lambda: self._definir_conteudo("")
         )
         btn_limpar.pack(side="left", padx=5)
 
+        self.switch_formatar_auto = ctk.CTkSwitch(
+            frame_btns,
+            text="Formatar ao digitar"
+        )
+        self.switch_formatar_auto.pack(side="left", padx=15)
+
+        # Edição por seção: o editor guarda só a seção escolhida (textos muito longos)
+        self.switch_secoes = ctk.CTkSwitch(
+            frame_btns,
+            text="📑 Uma seção por vez",
+            command=self.alternar_edicao_secoes
+        )
+        self.switch_secoes.pack(side="left", padx=15)
+
+        self.menu_secoes = ctk.CTkOptionMenu(
+            frame_btns,
+            values=[""],
+            width=280,
+            dynamic_resizing=False,
+            command=self._mostrar_secao
+        )
+
         # Editor de texto
         self.text_conteudo = ctk.CTkTextbox(
             self.aba_conteudo,
@@ -734,6 +419,7 @@ class AplicativoABNTModerno(ctk.CTk):
             font=ctk.CTkFont(family="Arial", size=12)
         )
         self.text_conteudo.pack(fill="both", expand=True, padx=40, pady=10)
+        self.text_conteudo.bind("<KeyRelease>", self._agendar_formatacao)
 
     def _criar_aba_referencias(self):
         """Cria aba de referências bibliográficas"""
@@ -773,6 +459,28 @@ class AplicativoABNTModerno(ctk.CTk):
         )
         btn_formatar_ref.pack(side="left", padx=5)
 
+        if self.biblioteca is not None:
+            btn_salvar_biblioteca = ctk.CTkButton(
+                frame_btns,
+                text="💾 Salvar na biblioteca",
+                command=self.salvar_na_biblioteca
+            )
+            btn_salvar_biblioteca.pack(side="left", padx=5)
+
+            # Busca por prefixo na biblioteca (autor, título ou ano)
+            self.entry_busca_biblioteca = ctk.CTkEntry(
+                self.aba_referencias,
+                placeholder_text="🔎 Buscar na biblioteca (autor, título ou ano)"
+            )
+            self.entry_busca_biblioteca.pack(fill="x", padx=40, pady=(10, 0))
+            self.entry_busca_biblioteca.bind("<KeyRelease>", self._agendar_busca_biblioteca)
+
+            self.frame_resultados_biblioteca = ctk.CTkScrollableFrame(
+                self.aba_referencias,
+                height=120
+            )
+            self.frame_resultados_biblioteca.pack(fill="x", padx=40, pady=(5, 0))
+
         # Editor de referências
         self.text_referencias = ctk.CTkTextbox(
             self.aba_referencias,
@@ -813,6 +521,249 @@ class AplicativoABNTModerno(ctk.CTk):
 
         messagebox.showinfo("Sucesso", "✅ Dados salvos com sucesso!")
 
+    def _estado_projeto(self):
+        """Estado atual dos campos e editores (formato de ProjetoABNT.registrar)"""
+        return {
+            'dados': {key: entry.get() for key, entry in self.entries_dados.items()},
+            'palavras_chave': self.entry_palavras.get(),
+            'resumo': self.text_resumo.get("1.0", "end-1c"),
+            'conteudo': self._texto_conteudo(),
+            'referencias': self._texto_editor(self.text_referencias)
+        }
+
+    def _aplicar_estado(self, estado):
+        """Preenche os campos e editores com o estado de um projeto"""
+        for key, entry in self.entries_dados.items():
+            entry.delete(0, "end")
+            entry.insert(0, estado['dados'].get(key, ''))
+        self.dados_trabalho = dict(estado['dados'])
+
+        self.entry_palavras.delete(0, "end")
+        self.entry_palavras.insert(0, estado['palavras_chave'])
+
+        self.text_resumo.delete("1.0", "end")
+        self.text_resumo.insert("1.0", estado['resumo'])
+        self._definir_conteudo(estado['conteudo'])
+        self._definir_texto(self.text_referencias, estado['referencias'])
+
+    def _abrir_recuperacao(self):
+        """Abre o diário de recuperação e oferece o trabalho da sessão anterior"""
+        try:
+            os.makedirs(os.path.dirname(ARQUIVO_RECUPERACAO), exist_ok=True)
+            self.projeto = ProjetoABNT(ARQUIVO_RECUPERACAO)
+        except (OSError, ValueError):
+            # Diário ilegível: recomeça (o arquivo antigo fica como .corrompido)
+            try:
+                os.replace(ARQUIVO_RECUPERACAO, ARQUIVO_RECUPERACAO + '.corrompido')
+                self.projeto = ProjetoABNT(ARQUIVO_RECUPERACAO)
+            except (OSError, ValueError):
+                self.projeto = None
+                return
+
+        # Só pergunta se a sessão anterior deixou algo além dos valores padrão
+        estado = self.projeto.estado()
+        textos = (estado['resumo'], estado['conteudo'], estado['referencias'], estado['palavras_chave'])
+        if any(textos) and estado != self._estado_projeto():
+            if messagebox.askyesno(
+                "Recuperar trabalho",
+                "Recuperar o trabalho da última sessão, que não foi salvo como projeto?"
+            ):
+                self._aplicar_estado(estado)
+
+        self._autosalvar()
+
+    def _autosalvar(self):
+        """Acrescenta ao diário do projeto o que mudou (chamado periodicamente via after)"""
+        if self.projeto is not None:
+            try:
+                if self.projeto.registrar(self._estado_projeto()):
+                    self.autosalvo_label.configure(text=f"💾 Salvo às {datetime.now().strftime('%H:%M:%S')}")
+            except OSError as e:
+                self.autosalvo_label.configure(text=f"⚠️ Falha ao salvar: {e.strerror}")
+
+        self._autosalvamento = self.after(INTERVALO_AUTOSALVAMENTO, self._autosalvar)
+
+    def abrir_projeto(self):
+        """Abre um projeto .abnt"""
+        caminho = filedialog.askopenfilename(
+            title="Abrir projeto",
+            filetypes=[("Projeto ABNT", f"*{EXTENSAO_PROJETO}"), ("Todos os arquivos", "*.*")]
+        )
+        if not caminho:
+            return
+
+        try:
+            projeto = ProjetoABNT(caminho)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Erro", f"Erro ao abrir projeto:\n{str(e)}")
+            return
+
+        if self.projeto is not None:
+            self.projeto.registrar(self._estado_projeto())
+            self.projeto.fechar()
+        self.projeto = projeto
+        self._aplicar_estado(projeto.estado())
+
+        aviso = ""
+        if projeto.registros_descartados:
+            aviso = "\n\n⚠️ O último salvamento estava incompleto e foi descartado."
+        self.title(f"📄 Formatador ABNT Acadêmico v3.0 — {os.path.basename(caminho)}")
+        messagebox.showinfo("Sucesso", f"✅ Projeto aberto: {os.path.basename(caminho)}{aviso}")
+
+    def salvar_projeto(self):
+        """Salva o trabalho como projeto .abnt (a partir daí, salvo automaticamente)"""
+        caminho = filedialog.asksaveasfilename(
+            title="Salvar projeto",
+            defaultextension=EXTENSAO_PROJETO,
+            filetypes=[("Projeto ABNT", f"*{EXTENSAO_PROJETO}")],
+            initialfile=f"trabalho_abnt{EXTENSAO_PROJETO}"
+        )
+        if not caminho:
+            return
+
+        try:
+            if self.projeto is None:
+                self.projeto = ProjetoABNT(caminho)
+            self.projeto.registrar(self._estado_projeto())
+            anterior = self.projeto.caminho
+            self.projeto.salvar_como(caminho)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Erro", f"Erro ao salvar projeto:\n{str(e)}")
+            return
+
+        # O trabalho agora está no projeto: o diário de recuperação não é mais necessário
+        if anterior == ARQUIVO_RECUPERACAO:
+            os.remove(ARQUIVO_RECUPERACAO)
+
+        self.title(f"📄 Formatador ABNT Acadêmico v3.0 — {os.path.basename(caminho)}")
+        messagebox.showinfo(
+            "Sucesso",
+            f"✅ Projeto salvo: {os.path.basename(caminho)}\n\nAs alterações serão salvas automaticamente."
+        )
+
+    def _ao_fechar(self):
+        """Registra as últimas alterações antes de fechar a janela"""
+        if self._autosalvamento is not None:
+            self.after_cancel(self._autosalvamento)
+        if self.projeto is not None:
+            try:
+                self.projeto.registrar(self._estado_projeto())
+            except OSError:
+                pass
+            self.projeto.fechar()
+        self.destroy()
+
+    def _texto_editor(self, editor):
+        """Texto do editor (o texto completo, se ainda estiver sendo carregado em partes)"""
+        carregamento = self._carregamentos.get(editor)
+        if carregamento is not None:
+            return carregamento['texto']
+        return editor.get("1.0", "end-1c")
+
+    def _definir_texto(self, editor, texto):
+        """Substitui o texto do editor; textos longos entram em partes via after"""
+        carregamento = self._carregamentos.pop(editor, None)
+        if carregamento is not None:
+            self.after_cancel(carregamento['tarefa'])
+
+        editor.configure(state="normal")
+        editor.delete("1.0", "end")
+        if len(texto) <= TAMANHO_PARTE_EDITOR:
+            editor.insert("1.0", texto)
+            return
+
+        # Bloqueado para digitação até a última parte
+        editor.configure(state="disabled")
+        self._carregamentos[editor] = {'texto': texto, 'posicao': 0, 'tarefa': None}
+        self._inserir_proxima_parte(editor)
+
+    def _inserir_proxima_parte(self, editor):
+        """Insere uma parte do texto pendente e agenda a seguinte"""
+        carregamento = self._carregamentos[editor]
+        texto = carregamento['texto']
+        inicio = carregamento['posicao']
+
+        # Corta no fim de uma linha, para não dividir parágrafos entre duas inserções
+        fim = texto.find('\n', inicio + TAMANHO_PARTE_EDITOR)
+        fim = len(texto) if fim < 0 else fim + 1
+
+        editor.configure(state="normal")
+        editor.insert("end", texto[inicio:fim])
+        carregamento['posicao'] = fim
+
+        if fim >= len(texto):
+            del self._carregamentos[editor]
+            return
+
+        editor.configure(state="disabled")
+        carregamento['tarefa'] = self.after(1, self._inserir_proxima_parte, editor)
+
+    def _texto_conteudo(self):
+        """Conteúdo completo (na edição por seção, a seção do editor e as da memória)"""
+        if self._secoes_conteudo is None:
+            return self._texto_editor(self.text_conteudo)
+
+        secoes = [secao for _, secao in self._secoes_conteudo]
+        secoes[self._secao_atual] = self._texto_editor(self.text_conteudo)
+        return '\n'.join(secoes)
+
+    def _definir_conteudo(self, texto):
+        """Substitui o conteúdo; textos muito longos passam à edição por seção"""
+        if self._secoes_conteudo is None and len(texto) > LIMITE_EDITOR_COMPLETO:
+            self.switch_secoes.select()
+
+        if self.switch_secoes.get():
+            self._abrir_secoes(texto)
+        else:
+            self._definir_texto(self.text_conteudo, texto)
+
+    def _abrir_secoes(self, texto):
+        """Divide o conteúdo em seções e mostra a primeira no editor"""
+        self._secoes_conteudo = dividir_em_secoes(texto)
+        self._atualizar_menu_secoes()
+        self._secao_atual = 0
+        self.menu_secoes.set(self._rotulos_secoes[self._secao_atual])
+        self.menu_secoes.pack(side="left", padx=5)
+        self._definir_texto(self.text_conteudo, self._secoes_conteudo[self._secao_atual][1])
+
+    def _atualizar_menu_secoes(self):
+        """Um rótulo (único) por seção: a linha do título"""
+        rotulos = []
+        for indice, (titulo, _) in enumerate(self._secoes_conteudo):
+            rotulo = titulo or ("(início)" if indice == 0 else "(sem título)")
+            if rotulo in rotulos:
+                rotulo = f"{rotulo} [{indice + 1}]"
+            rotulos.append(rotulo)
+        self._rotulos_secoes = rotulos
+        self.menu_secoes.configure(values=rotulos)
+
+    def _mostrar_secao(self, rotulo):
+        """Guarda a seção do editor e mostra a escolhida no menu"""
+        indice = self._rotulos_secoes.index(rotulo)
+        if indice == self._secao_atual:
+            return
+
+        # A seção editada pode ter ganhado ou perdido títulos: divide de novo só ela
+        editada = dividir_em_secoes(self._texto_editor(self.text_conteudo))
+        self._secoes_conteudo[self._secao_atual:self._secao_atual + 1] = editada
+        if indice > self._secao_atual:
+            indice += len(editada) - 1
+        self._atualizar_menu_secoes()
+
+        self._secao_atual = indice
+        self.menu_secoes.set(self._rotulos_secoes[indice])
+        self._definir_texto(self.text_conteudo, self._secoes_conteudo[indice][1])
+
+    def alternar_edicao_secoes(self):
+        """Liga/desliga a edição de uma seção por vez"""
+        texto = self._texto_conteudo()
+        if self.switch_secoes.get():
+            self._abrir_secoes(texto)
+        else:
+            self._secoes_conteudo = None
+            self.menu_secoes.pack_forget()
+            self._definir_texto(self.text_conteudo, texto)
+
     def carregar_word(self):
         """Carrega um arquivo Word"""
         caminho = filedialog.askopenfilename(
@@ -822,40 +773,155 @@ class AplicativoABNTModerno(ctk.CTk):
 
         if caminho:
             try:
-                doc = Document(caminho)
-                texto = '\n'.join([p.text for p in doc.paragraphs])
-                self.text_conteudo.delete("1.0", "end")
-                self.text_conteudo.insert("1.0", texto)
+                # Leitura em fluxo do document.xml, mantendo os títulos de seção
+                texto = texto_para_conteudo(caminho)
+                self._definir_conteudo(texto)
                 messagebox.showinfo("Sucesso", f"✅ Arquivo carregado: {os.path.basename(caminho)}")
             except Exception as e:
                 messagebox.showerror("Erro", f"Erro ao carregar arquivo:\n{str(e)}")
 
+    def reformatar_word(self):
+        """Aplica a formatação ABNT a um Word existente, preservando o conteúdo"""
+        from reformatador_docx import caminho_saida, reformatar_docx
+
+        origem = filedialog.askopenfilename(
+            title="Selecionar arquivo Word",
+            filetypes=[("Documentos Word", "*.docx"), ("Todos os arquivos", "*.*")]
+        )
+        if not origem:
+            return
+
+        destino = filedialog.asksaveasfilename(
+            title="Salvar Word formatado",
+            initialfile=os.path.basename(caminho_saida(origem)),
+            defaultextension=".docx",
+            filetypes=[("Documentos Word", "*.docx")]
+        )
+        if not destino:
+            return
+
+        try:
+            resultado = reformatar_docx(origem, destino)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao reformatar arquivo:\n{str(e)}")
+            return
+
+        messagebox.showinfo(
+            "Sucesso",
+            f"✅ Formatação ABNT aplicada: {os.path.basename(destino)}\n\n"
+            f"Parágrafos de texto: {resultado['paragrafos']}\n"
+            f"Citações longas: {resultado['citacoes_longas']}\n"
+            f"Figuras: {resultado['figuras']}\n"
+            f"Parágrafos em tabelas: {resultado['paragrafos_tabelas']}"
+        )
+
     def formatar_conteudo(self):
         """Formata o conteúdo conforme ABNT"""
-        texto = self.text_conteudo.get("1.0", "end-1c")
+        if self.text_conteudo in self._carregamentos:
+            messagebox.showwarning("Aviso", "Aguarde o carregamento do conteúdo terminar.")
+            return
 
-        if not texto.strip():
+        if not self._texto_conteudo().strip():
             messagebox.showwarning("Aviso", "Nenhum conteúdo para formatar!")
             return
 
-        # Aplicar formatação de citações
-        texto_formatado = FormatadorABNT.formatar_citacoes(texto)
-
-        self.text_conteudo.delete("1.0", "end")
-        self.text_conteudo.insert("1.0", texto_formatado)
+        # Aplicar formatação de citações (somente nos parágrafos alterados)
+        self._formatar_incremental(self.text_conteudo.get("1.0", "end-1c"))
+        if self._secoes_conteudo is not None:
+            # As demais seções são formatadas na memória
+            for indice, (titulo, secao) in enumerate(self._secoes_conteudo):
+                if indice != self._secao_atual:
+                    self._secoes_conteudo[indice] = (titulo, self._formatador_incremental.formatar(secao))
 
         messagebox.showinfo("Sucesso", "✅ Conteúdo formatado conforme ABNT!")
 
+    def _formatar_incremental(self, texto):
+        """Substitui no editor apenas os blocos cuja formatação mudou"""
+        alteracoes = self._formatador_incremental.alteracoes(texto)
+
+        # De baixo para cima, para que os índices das linhas anteriores não mudem;
+        # o cursor e as regiões não alteradas permanecem intactos
+        for inicio, n_linhas, texto_formatado in reversed(alteracoes):
+            primeira = inicio + 1
+            ultima = inicio + n_linhas
+            self.text_conteudo.delete(f"{primeira}.0", f"{ultima}.end")
+            self.text_conteudo.insert(f"{primeira}.0", texto_formatado)
+
+    def _agendar_formatacao(self, event=None):
+        """Reagenda a formatação automática para depois de uma pausa na digitação"""
+        if not self.switch_formatar_auto.get():
+            return
+
+        if self._formatacao_agendada is not None:
+            self.after_cancel(self._formatacao_agendada)
+        self._formatacao_agendada = self.after(
+            ATRASO_FORMATACAO_AUTOMATICA, self._formatar_automaticamente
+        )
+
+    def _formatar_automaticamente(self):
+        """Formatação automática (sem mensagens)"""
+        self._formatacao_agendada = None
+        if self.text_conteudo not in self._carregamentos:
+            self._formatar_incremental(self.text_conteudo.get("1.0", "end-1c"))
+
     def formatar_referencias(self):
         """Formata as referências"""
-        texto = self.text_referencias.get("1.0", "end-1c")
+        texto = self._texto_editor(self.text_referencias)
         texto_formatado = FormatadorABNT.formatar_referencias(texto)
 
-        self.text_referencias.delete("1.0", "end")
-        self.text_referencias.insert("1.0", texto_formatado)
+        self._definir_texto(self.text_referencias, texto_formatado)
 
         messagebox.showinfo("Sucesso", "✅ Referências formatadas!")
 
+    def salvar_na_biblioteca(self):
+        """Cadastra as referências do editor na biblioteca"""
+        texto = self._texto_editor(self.text_referencias)
+        referencias = [linha for linha in texto.split('\n') if linha.strip()]
+
+        if not referencias:
+            messagebox.showwarning("Aviso", "Nenhuma referência para salvar!")
+            return
+
+        novas = self.biblioteca.adicionar(referencias)
+        messagebox.showinfo(
+            "Sucesso",
+            f"✅ {novas} novas referências salvas na biblioteca ({len(self.biblioteca)} no total)"
+        )
+
+    def _agendar_busca_biblioteca(self, event=None):
+        """Reagenda a busca para depois de uma pausa na digitação"""
+        if self._busca_agendada is not None:
+            self.after_cancel(self._busca_agendada)
+        self._busca_agendada = self.after(ATRASO_BUSCA_BIBLIOTECA, self._buscar_biblioteca)
+
+    def _buscar_biblioteca(self):
+        """Lista as referências da biblioteca que começam com o texto buscado"""
+        self._busca_agendada = None
+        for widget in self.frame_resultados_biblioteca.winfo_children():
+            widget.destroy()
+
+        resultados = self.biblioteca.buscar(
+            self.entry_busca_biblioteca.get(), LIMITE_RESULTADOS_BIBLIOTECA
+        )
+        for campos in resultados:
+            ctk.CTkButton(
+                self.frame_resultados_biblioteca,
+                text=campos['texto'],
+                anchor="w",
+                fg_color="transparent",
+                command=lambda texto=campos['texto']: self._inserir_referencia(texto)
+            ).pack(fill="x")
+
+    def _inserir_referencia(self, texto):
+        """Acrescenta uma referência da biblioteca ao editor"""
+        atual = self._texto_editor(self.text_referencias)
+        if atual and not atual.endswith('\n'):
+            texto = '\n' + texto
+        if self.text_referencias in self._carregamentos:
+            self._carregamentos[self.text_referencias]['texto'] += texto
+        else:
+            self.text_referencias.insert("end", texto)
+
     def inserir_exemplo_referencia(self):
         """Insere exemplos de referências"""
         exemplos = """SILVA, João. Introdução à computação. 3. ed. São Paulo: Atlas, 2021.
@@ -866,11 +932,10 @@ VYGOTSKY, Lev Semyonovich. A formação social da mente. São Paulo: Martins Fon
 
 BRASIL. Lei nº 9.394, de 20 de dezembro de 1996. Estabelece as diretrizes e bases da educação nacional. Diário Oficial da União, Brasília, DF, 23 dez. 1996."""
 
-        self.text_referencias.delete("1.0", "end")
-        self.text_referencias.insert("1.0", exemplos)
+        self._definir_texto(self.text_referencias, exemplos)
 
     def gerar_documento(self):
-        """Gera o documento Word completo formatado"""
+        """Gera o documento completo formatado (Word ou PDF, pela extensão escolhida)"""
         # Validar dados
         if not self.dados_trabalho:
             messagebox.showwarning(
@@ -880,96 +945,179 @@ BRASIL. Lei nº 9.394, de 20 de dezembro de 1996. Estabelece as diretrizes e bas
             self.mostrar_aba("dados")
             return
 
+        if self._fila_geracao is not None:
+            return
+
+        # Destino escolhido antes: a geração roda sem diálogos
+        caminho = filedialog.asksaveasfilename(
+            title="Salvar documento",
+            defaultextension=".docx",
+            filetypes=[("Documento Word", "*.docx"), ("PDF", "*.pdf")],
+            initialfile=f"trabalho_abnt_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
+        )
+
+        if not caminho:
+            return
+
+        # Widgets Tk só podem ser lidos na thread principal
+        entrada = {
+            'dados': dict(self.dados_trabalho),
+            'resumo': self.text_resumo.get("1.0", "end-1c"),
+            'palavras_chave': self.entry_palavras.get(),
+            'conteudo': self._texto_conteudo(),
+            'referencias': self._texto_editor(self.text_referencias),
+            'biblioteca': self.biblioteca,
+            'rastrear': bool(self.rastrear_switch.get()),
+            # PDF gerado direto pelo pdf_abnt, sem Word
+            'pdf': caminho.lower().endswith('.pdf')
+        }
+        # A medição de desempenho precisa de uma renderização de verdade
+        entrada['cache'] = None if entrada['rastrear'] else self.cache
+
+        self._fila_geracao = queue.Queue()
+        self._cancelar_geracao = threading.Event()
+        self._mostrar_progresso(True)
+
+        threading.Thread(
+            target=self._executar_geracao,
+            args=(entrada, caminho, self._fila_geracao, self._cancelar_geracao),
+            daemon=True
+        ).start()
+
+        self.after(100, self._acompanhar_geracao)
+
+    @staticmethod
+    def _executar_geracao(entrada, caminho, fila, cancelar):
+        """Gera e salva o documento (executado na thread de trabalho)"""
+        def progresso(etapa, fracao):
+            # 90% para montar o documento, 10% para salvar
+            fila.put(('progresso', etapa, fracao * 0.9))
+
+        rastreador = Rastreador() if entrada['rastrear'] else None
+        cache = entrada['cache']
+
         try:
-            # Criar gerador
-            gerador = GeradorDocumentoABNT()
-
-            # 1. Capa
-            gerador.adicionar_capa(self.dados_trabalho)
-
-            # 2. Folha de rosto
-            gerador.adicionar_folha_rosto(self.dados_trabalho)
-
-            # 3. Resumo
-            resumo = self.text_resumo.get("1.0", "end-1c")
-            palavras = self.entry_palavras.get()
-            if resumo.strip():
-                gerador.adicionar_resumo(resumo, palavras)
-
-            # 4. Sumário (exemplo básico)
-            secoes_sumario = [
-                {'numero': '1', 'titulo': 'INTRODUÇÃO', 'pagina': 10},
-                {'numero': '2', 'titulo': 'DESENVOLVIMENTO', 'pagina': 12},
-                {'numero': '3', 'titulo': 'CONCLUSÃO', 'pagina': 20},
-                {'numero': '', 'titulo': 'REFERÊNCIAS', 'pagina': 22}
-            ]
-            gerador.adicionar_sumario(secoes_sumario)
-
-            # 5. Conteúdo
-            conteudo = self.text_conteudo.get("1.0", "end-1c")
-            if conteudo.strip():
-                # Processar o conteúdo em seções
-                self._processar_conteudo(gerador, conteudo)
-
-            # 6. Referências
-            referencias_texto = self.text_referencias.get("1.0", "end-1c")
-            if referencias_texto.strip():
-                lista_referencias = [ref.strip() for ref in referencias_texto.split('\n') if ref.strip()]
-                gerador.adicionar_referencias(lista_referencias)
-
-            # Salvar
-            caminho = filedialog.asksaveasfilename(
-                title="Salvar documento",
-                defaultextension=".docx",
-                filetypes=[("Documento Word", "*.docx")],
-                initialfile=f"trabalho_abnt_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
-            )
+            documento = None
+            if cache is not None:
+                chave = chave_renderizacao(
+                    entrada['dados'], entrada['resumo'], entrada['palavras_chave'],
+                    entrada['conteudo'], entrada['referencias'],
+                    biblioteca=entrada['biblioteca'] is not None, pdf=entrada['pdf']
+                )
+                documento = cache.obter(chave)
 
-            if caminho:
-                gerador.salvar(caminho)
-                messagebox.showinfo(
-                    "Sucesso",
-                    f"✅ Documento gerado com sucesso!\n\n{caminho}\n\n" +
-                    "Formatação aplicada:\n" +
-                    "✓ Capa e folha de rosto ABNT\n" +
-                    "✓ Resumo formatado\n" +
-                    "✓ Sumário automático\n" +
-                    "✓ Citações em MAIÚSCULAS\n" +
-                    "✓ Margens e espaçamento ABNT\n" +
-                    "✓ Referências ordenadas"
+            if documento is not None:
+                # Mesma entrada de uma geração anterior: os bytes são os mesmos
+                fila.put(('progresso', 'Reaproveitando documento', 0.9))
+                with open(caminho, 'wb') as f:
+                    f.write(documento)
+            else:
+                gerador = gerar_trabalho(
+                    entrada['dados'],
+                    resumo=entrada['resumo'],
+                    palavras_chave=entrada['palavras_chave'],
+                    conteudo=entrada['conteudo'],
+                    referencias=entrada['referencias'],
+                    gerador=GeradorPDF() if entrada['pdf'] else None,
+                    biblioteca=entrada['biblioteca'],
+                    progresso=progresso,
+                    cancelar=cancelar,
+                    rastreador=rastreador
                 )
 
+                fila.put(('progresso', 'Salvando', 0.9))
+                gerador.salvar(caminho)
+                if cache is not None:
+                    with open(caminho, 'rb') as f:
+                        cache.guardar(chave, f.read())
+
+            # Citações x referências (índice por autor/ano, uma passagem pelo texto)
+            medidor = rastreador or RASTREADOR_NULO
+            with medidor.etapa('Conferência de citações'):
+                conferencia = conferir_citacoes(entrada['conteudo'], entrada['referencias'])
+            medidor.contar('citacoes', conferencia['citacoes'])
+            relatorio = descrever_conferencia(conferencia, limite=5)
+
+            # Numeração das seções e fontes das citações longas (árvore já analisada na geração)
+            avisos = verificar_estrutura(analisar_conteudo(entrada['conteudo']))
+            if avisos:
+                relatorio += "\n\n" + descrever_estrutura(avisos, limite=5)
+
+            if documento is not None:
+                relatorio += "\n\n♻️ Entrada sem alterações: documento reaproveitado do cache"
+            if rastreador is not None:
+                caminho_trace = os.path.splitext(caminho)[0] + '.trace.json'
+                rastreador.exportar_chrome(caminho_trace)
+                relatorio += "\n\n" + descrever_rastreamento(rastreador, caminho_trace)
+
+            fila.put(('concluido', caminho, relatorio))
+        except GeracaoCancelada:
+            fila.put(('cancelado',))
         except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao gerar documento:\n{str(e)}")
+            fila.put(('erro', str(e)))
+
+    def _acompanhar_geracao(self):
+        """Consome as mensagens da thread de geração (chamado periodicamente via after)"""
+        try:
+            while True:
+                mensagem = self._fila_geracao.get_nowait()
+
+                if mensagem[0] == 'progresso':
+                    _, etapa, fracao = mensagem
+                    self.progresso_label.configure(text=f"{etapa}... {fracao:.0%}")
+                    self.progresso_barra.set(fracao)
+                    continue
+
+                self._fila_geracao = None
+                self._mostrar_progresso(False)
+
+                if mensagem[0] == 'concluido':
+                    messagebox.showinfo(
+                        "Sucesso",
+                        f"✅ Documento gerado com sucesso!\n\n{mensagem[1]}\n\n" +
+                        "Formatação aplicada:\n" +
+                        "✓ Capa e folha de rosto ABNT\n" +
+                        "✓ Resumo formatado\n" +
+                        "✓ Sumário automático\n" +
+                        "✓ Citações em MAIÚSCULAS\n" +
+                        "✓ Margens e espaçamento ABNT\n" +
+                        "✓ Referências ordenadas\n\n" +
+                        mensagem[2]
+                    )
+                elif mensagem[0] == 'cancelado':
+                    messagebox.showinfo("Cancelado", "Geração do documento cancelada.")
+                else:
+                    messagebox.showerror("Erro", f"Erro ao gerar documento:\n{mensagem[1]}")
+                return
+        except queue.Empty:
+            pass
+
+        self.after(100, self._acompanhar_geracao)
+
+    def cancelar_geracao(self):
+        """Solicita o cancelamento da geração em andamento"""
+        if self._cancelar_geracao is not None:
+            self._cancelar_geracao.set()
+            self.progresso_label.configure(text="Cancelando...")
+
+    def _mostrar_progresso(self, visivel):
+        """Exibe/oculta a barra de progresso e o botão cancelar"""
+        if visivel:
+            self.btn_gerar.configure(state="disabled")
+            self.progresso_barra.set(0)
+            self.progresso_label.configure(text="Iniciando...")
+            self.progresso_label.grid(row=7, column=0, padx=20, pady=(10, 0))
+            self.progresso_barra.grid(row=8, column=0, padx=20, pady=5)
+            self.btn_cancelar.grid(row=9, column=0, padx=20, pady=(5, 10))
+        else:
+            self.btn_gerar.configure(state="normal")
+            self.progresso_label.grid_remove()
+            self.progresso_barra.grid_remove()
+            self.btn_cancelar.grid_remove()
 
     def _processar_conteudo(self, gerador, conteudo):
         """Processa o conteúdo e adiciona ao documento"""
-        # Detectar seções baseadas em padrões
-        linhas = conteudo.split('\n')
-        texto_atual = []
-        secao_atual = None
-        numero_atual = None
-
-        for linha in linhas:
-            # Detectar títulos de seção (ex: "1 INTRODUÇÃO", "2 DESENVOLVIMENTO")
-            match_secao = re.match(r'^(\d+)\s+([A-ZÀÁÂÃÄÅÇÈÉÊËÌÍÎÏÑÒÓÔÕÖÙÚÛÜÝ\s]+)$', linha.strip())
-
-            if match_secao:
-                # Salvar seção anterior
-                if secao_atual and texto_atual:
-                    gerador.adicionar_secao(numero_atual, secao_atual, '\n\n'.join(texto_atual))
-
-                # Nova seção
-                numero_atual = match_secao.group(1)
-                secao_atual = match_secao.group(2)
-                texto_atual = []
-            else:
-                if linha.strip():
-                    texto_atual.append(linha.strip())
-
-        # Adicionar última seção
-        if secao_atual and texto_atual:
-            gerador.adicionar_secao(numero_atual, secao_atual, '\n\n'.join(texto_atual))
+        gerador.adicionar_conteudo(conteudo)
 
 
 def main():
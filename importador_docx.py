@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Importação rápida de arquivos .docx ("Carregar Word")
+
+Lê word/document.xml diretamente do zip com um parser XML incremental, sem montar o
+modelo de objetos do python-docx. Imagens e outras partes do pacote nunca são lidas,
+e cada parágrafo é descartado da memória assim que seu texto é extraído.
+
+O texto segue Paragraph.text do python-docx (tabulação = "\\t", quebra de linha = "\\n"),
+com duas diferenças: trechos inseridos com controle de alterações são incluídos e
+trechos excluídos são ignorados (o texto corresponde à versão final do documento).
+Como no python-docx, parágrafos dentro de tabelas e caixas de texto são ignorados.
+"""
+
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# Elementos cujo conteúdo não faz parte do texto do parágrafo
+_IGNORAR = {W + 'del', W + 'moveFrom', W + 'txbxContent', W + 'pPr', W + 'rPr'}
+
+# Estilos de título reconhecidos pelo nome (inglês e português)
+_RE_NOME_TITULO = re.compile(r'^(?:heading|t[íi]tulo)\s*(\d)$', re.IGNORECASE)
+# Numeração já presente no título: "1", "1.2", "1.2.3."
+_RE_NUMERACAO = re.compile(r'^(\d+(?:\.\d+)*)\.?\s+(.*)$')
+
+
+def _nivel_contorno(contorno):
+    """Nível (1-10) de um w:outlineLvl; None se não houver ou o valor não for inteiro"""
+    if contorno is None:
+        return None
+    try:
+        return int(contorno.get(W + 'val')) + 1
+    except (TypeError, ValueError):
+        return None
+
+
+def niveis_estilos(pacote):
+    """Mapeia id de estilo de parágrafo -> nível de título (1-9), seguindo basedOn"""
+    try:
+        raiz = ET.fromstring(pacote.read('word/styles.xml'))
+    except KeyError:
+        return {}
+
+    proprios = {}
+    base = {}
+    for estilo in raiz.iter(W + 'style'):
+        if estilo.get(W + 'type') != 'paragraph':
+            continue
+        id_estilo = estilo.get(W + 'styleId')
+
+        nivel = _nivel_contorno(estilo.find(f'{W}pPr/{W}outlineLvl'))
+        if nivel is None:
+            nome = estilo.find(W + 'name')
+            correspondencia = _RE_NOME_TITULO.match(nome.get(W + 'val', '')) if nome is not None else None
+            if correspondencia:
+                nivel = int(correspondencia.group(1))
+        proprios[id_estilo] = nivel
+
+        baseado = estilo.find(W + 'basedOn')
+        if baseado is not None:
+            base[id_estilo] = baseado.get(W + 'val')
+
+    niveis = {}
+    for id_estilo in proprios:
+        atual, visitados = id_estilo, set()
+        while atual is not None and atual not in visitados:
+            visitados.add(atual)
+            if proprios.get(atual) is not None:
+                break
+            atual = base.get(atual)
+        nivel = proprios.get(atual) if atual is not None else None
+        # outlineLvl 9 (nível 10) indica corpo de texto
+        if nivel is not None and 1 <= nivel <= 9:
+            niveis[id_estilo] = nivel
+    return niveis
+
+
+def _texto_elemento(elemento, partes):
+    """Acumula o texto de um parágrafo, ignorando exclusões e caixas de texto"""
+    for filho in elemento:
+        tag = filho.tag
+        if tag in _IGNORAR:
+            continue
+        if tag == W + 't':
+            partes.append(filho.text or '')
+        elif tag == W + 'tab' or tag == W + 'ptab':
+            partes.append('\t')
+        elif tag == W + 'br':
+            if filho.get(W + 'type', 'textWrapping') == 'textWrapping':
+                partes.append('\n')
+        elif tag == W + 'cr':
+            partes.append('\n')
+        elif tag == W + 'noBreakHyphen':
+            partes.append('-')
+        elif len(filho):
+            _texto_elemento(filho, partes)
+
+
+def ler_paragrafos(caminho):
+    """
+    Percorre os parágrafos do corpo do documento em fluxo
+    Gera (texto, nivel), onde nivel é o nível do título (1, 2, 3...) ou None
+    """
+    with zipfile.ZipFile(caminho) as pacote:
+        niveis = niveis_estilos(pacote)
+
+        with pacote.open('word/document.xml') as fluxo:
+            profundidade = 0
+            corpo = None
+
+            for evento, elemento in ET.iterparse(fluxo, events=('start', 'end')):
+                if evento == 'start':
+                    profundidade += 1
+                    if profundidade == 2 and elemento.tag == W + 'body':
+                        corpo = elemento
+                    continue
+
+                profundidade -= 1
+                # Somente filhos diretos de w:body (profundidade 2 após o decremento)
+                if profundidade != 2 or corpo is None:
+                    continue
+
+                if elemento.tag == W + 'p':
+                    nivel = None
+                    ppr = elemento.find(W + 'pPr')
+                    if ppr is not None:
+                        contorno = _nivel_contorno(ppr.find(W + 'outlineLvl'))
+                        estilo = ppr.find(W + 'pStyle')
+                        if contorno is not None and contorno <= 9:
+                            nivel = contorno
+                        elif estilo is not None:
+                            nivel = niveis.get(estilo.get(W + 'val'))
+
+                    partes = []
+                    _texto_elemento(elemento, partes)
+                    yield ''.join(partes), nivel
+
+                # Libera o elemento já processado (memória constante)
+                corpo.clear()
+
+
+def texto_para_conteudo(caminho):
+    """
+    Texto do documento pronto para a aba de conteúdo / adicionar_conteudo
+    Títulos viram linhas numeradas ("1 INTRODUÇÃO", "1.1 Objetivos"); a numeração
+    existente é mantida e, se ausente, gerada a partir dos níveis dos títulos.
+    """
+    linhas = []
+    contadores = []
+
+    for texto, nivel in ler_paragrafos(caminho):
+        if nivel is None or not texto.strip():
+            linhas.append(texto)
+            continue
+
+        titulo = ' '.join(texto.split())
+        numerado = _RE_NUMERACAO.match(titulo)
+        if numerado:
+            numero, titulo = numerado.groups()
+            contadores = [int(n) for n in numero.split('.')]
+        else:
+            del contadores[nivel:]
+            contadores.extend([0] * (nivel - len(contadores)))
+            contadores[nivel - 1] += 1
+            numero = '.'.join(str(n) for n in contadores)
+
+        if '.' not in numero:
+            # Títulos primários em MAIÚSCULAS (NBR 6024)
+            titulo = titulo.upper()
+        linhas.append(f"{numero} {titulo}")
+
+    return '\n'.join(linhas)
@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+"""
+Estimativa de layout (paginação) de trabalhos ABNT sem renderizar o documento
+
+EstimadorLayout recebe as mesmas operações adicionar_* de GeradorDocumentoABNT, mas em
+vez de montar o .docx apenas avança um cursor de página usando as métricas da Arial,
+a folha A4, as margens da NBR 14724 e os estilos de ESTILOS_ABNT. A contagem de
+linhas de cada parágrafo fica em cache, de modo que gerações repetidas do mesmo
+trabalho só recalculam os parágrafos alterados.
+
+A quebra de linhas (quebrar_linhas) e a paginação são as mesmas que o backend PDF
+(pdf_abnt) desenha: lá o sumário tem exatamente as páginas do arquivo.
+
+calcular_sumario usa o estimador para obter as páginas reais das seções do sumário.
+"""
+
+from functools import lru_cache
+
+from motor_abnt import (
+    COMPRESSAO_PADRAO, ESTILOS_ABNT, ESTILO_TEXTO, ESTILO_TITULO_CENTRALIZADO,
+    ESTILO_TITULO_SECAO, ESTILO_TITULO_SUBSECAO, FRAGMENTOS_PRE_TEXTUAIS, LINHA_ABNT_PT,
+    GeradorDocumentoABNT, gerar_trabalho, titulo_secao
+)
+
+
+# Larguras da Arial em milésimos de em (métricas compatíveis com a Helvetica)
+_LARGURAS_ASCII = (
+    # espaço ! " # $ % & ' ( ) * + , - . /
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    # 0-9
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556,
+    # : ; < = > ? @
+    278, 278, 584, 584, 584, 556, 1015,
+    # A-Z
+    667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833,
+    722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611,
+    # [ \ ] ^ _ `
+    278, 278, 278, 469, 556, 333,
+    # a-z
+    556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833,
+    556, 556, 556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500,
+    # { | } ~
+    334, 260, 334, 584,
+)
+
+_LARGURAS_ASCII_NEGRITO = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556,
+    333, 333, 584, 584, 584, 611, 975,
+    722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833,
+    722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611,
+    333, 278, 333, 584, 556, 333,
+    556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889,
+    611, 611, 611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500,
+    389, 280, 389, 584,
+)
+
+
+def _tabela_larguras(ascii_, negrito):
+    """Tabela caractere -> largura, incluindo acentuados do Latin-1 e pontuação tipográfica"""
+    tabela = {chr(32 + i): largura for i, largura in enumerate(ascii_)}
+
+    # Letras acentuadas têm a largura da letra base
+    for acentuadas, base in [
+        ('ÀÁÂÃÄÅ', 'A'), ('ÈÉÊË', 'E'), ('ÌÍÎÏ', 'I'), ('ÒÓÔÕÖØ', 'O'), ('ÙÚÛÜ', 'U'),
+        ('Ç', 'C'), ('Ñ', 'N'), ('Ý', 'Y'), ('àáâãäå', 'a'), ('èéêë', 'e'), ('ìíîï', 'i'),
+        ('òóôõö', 'o'), ('ùúûü', 'u'), ('ç', 'c'), ('ñ', 'n'), ('ýÿ', 'y'),
+    ]:
+        for caractere in acentuadas:
+            tabela[caractere] = tabela[base]
+
+    tabela.update({
+        ' ': 278, 'ª': 370, 'º': 365, '°': 400, '§': 556, '«': 556, '»': 556,
+        'ß': 611, 'Æ': 1000, 'æ': 889, 'ø': 611 if not negrito else 611,
+        '–': 556, '—': 1000, '‘': 222 if not negrito else 278, '’': 222 if not negrito else 278,
+        '“': 333 if not negrito else 500, '”': 333 if not negrito else 500,
+        '•': 350, '…': 1000,
+    })
+    return tabela
+
+
+LARGURAS_ARIAL = _tabela_larguras(_LARGURAS_ASCII, False)
+LARGURAS_ARIAL_NEGRITO = _tabela_larguras(_LARGURAS_ASCII_NEGRITO, True)
+LARGURA_PADRAO = 556
+
+# Altura de linha simples da Arial (ascendente + descendente + entrelinha) em em
+ALTURA_LINHA_ARIAL = 1.149
+# Parágrafos sem estilo (ex: o que contém a quebra de página) usam o Normal: Arial 12 simples
+ALTURA_LINHA_NORMAL = 12 * ALTURA_LINHA_ARIAL
+
+# Folha A4 e margens da NBR 14724 (as mesmas de _configurar_documento), em pt
+CM = 72 / 2.54
+LARGURA_TEXTO = (21 - 3 - 2) * CM
+ALTURA_TEXTO = (29.7 - 3 - 2) * CM
+
+# Linhas mínimas de texto que devem caber após um título (título junto do parágrafo)
+LINHAS_APOS_TITULO = 2
+
+
+@lru_cache(maxsize=65536)
+def largura_palavra(palavra, tamanho, negrito=False):
+    """Largura de uma palavra em pt"""
+    tabela = LARGURAS_ARIAL_NEGRITO if negrito else LARGURAS_ARIAL
+    return sum(tabela.get(c, LARGURA_PADRAO) for c in palavra) * tamanho / 1000
+
+
+def _segmentos(trechos):
+    """
+    Palavras de cada segmento (texto entre quebras de linha) de um parágrafo
+    Cada palavra é uma tupla de (texto, negrito): um trecho em negrito pode começar no
+    meio dela. Tabulações valem quatro espaços e espaços repetidos geram palavras vazias.
+    """
+    if len(trechos) == 1:
+        texto, negrito = trechos[0]
+        return [
+            [((parte, negrito),) if parte else () for parte in linha.split(' ')]
+            for linha in texto.replace('\t', '    ').split('\n')
+        ]
+
+    segmentos = []
+    palavras = []
+    palavra = []
+    for texto, negrito in trechos:
+        for i, linha in enumerate(texto.replace('\t', '    ').split('\n')):
+            if i:
+                palavras.append(tuple(palavra))
+                segmentos.append(palavras)
+                palavras, palavra = [], []
+            for j, parte in enumerate(linha.split(' ')):
+                if j:
+                    palavras.append(tuple(palavra))
+                    palavra = []
+                if parte:
+                    palavra.append((parte, negrito))
+    palavras.append(tuple(palavra))
+    segmentos.append(palavras)
+    return segmentos
+
+
+def _medida(palavra, tamanho):
+    """Largura de uma palavra (tupla de (texto, negrito)) em pt"""
+    return sum(largura_palavra(texto, tamanho, negrito) for texto, negrito in palavra)
+
+
+def _cortar_palavra(palavra, tamanho, disponivel, largura):
+    """Pedaços (palavra, medida) de uma palavra maior que a linha, cortada entre caracteres"""
+    pedacos = []
+    atual, medida = [], 0.0
+    for texto, negrito in palavra:
+        for caractere in texto:
+            largura_caractere = largura_palavra(caractere, tamanho, negrito)
+            if medida and medida + largura_caractere > disponivel:
+                pedacos.append((tuple(atual), medida))
+                atual, medida, disponivel = [], 0.0, largura
+            if atual and atual[-1][1] == negrito:
+                atual[-1] = (atual[-1][0] + caractere, negrito)
+            else:
+                atual.append((caractere, negrito))
+            medida += largura_caractere
+    pedacos.append((tuple(atual), medida))
+    return pedacos
+
+
+def _linhas(trechos, largura, recuo_primeira_linha, tamanho):
+    """
+    Quebra de linha gulosa por palavras (o alinhamento justificado não altera a quebra)
+    Gera (palavras, largura ocupada, última linha do segmento) para cada linha
+    """
+    espaco = largura_palavra(' ', tamanho)
+
+    for palavras in _segmentos(trechos):
+        linha = []
+        disponivel = largura - recuo_primeira_linha
+        ocupado = 0.0
+
+        for palavra in palavras:
+            if len(palavra) == 1:
+                medida = largura_palavra(palavra[0][0], tamanho, palavra[0][1])
+            else:
+                medida = _medida(palavra, tamanho)
+            if ocupado == 0:
+                # Palavras vazias no início da linha não ocupam espaço
+                linha.clear()
+                necessario = medida
+            else:
+                necessario = ocupado + espaco + medida
+
+            if necessario <= disponivel:
+                linha.append(palavra)
+                ocupado = necessario
+                continue
+
+            # Nova linha; palavras maiores que a linha são cortadas entre caracteres
+            if ocupado:
+                yield tuple(linha), ocupado, False
+                disponivel = largura
+            if medida > disponivel:
+                *pedacos, (palavra, medida) = _cortar_palavra(palavra, tamanho, disponivel, largura)
+                for pedaco, medida_pedaco in pedacos:
+                    yield (pedaco,), medida_pedaco, False
+                disponivel = largura
+            linha = [palavra]
+            ocupado = medida
+
+        yield tuple(linha), ocupado, True
+
+
+def _trechos(texto, negrito):
+    """Texto simples ou trechos já normalizados -> tupla de (texto, negrito)"""
+    if isinstance(texto, str):
+        return ((texto, negrito),)
+    if negrito:
+        return tuple((parte, True) for parte, _ in texto)
+    return texto
+
+
+@lru_cache(maxsize=65536)
+def contar_linhas(texto, largura, recuo_primeira_linha, tamanho, negrito=False):
+    """
+    Número de linhas que um parágrafo ocupa (a mesma quebra de quebrar_linhas)
+    texto: str ou tupla de (texto, negrito), para medir os trechos em negrito com a
+    largura do negrito. Resultado em cache por parágrafo.
+    """
+    return sum(1 for _ in _linhas(_trechos(texto, negrito), largura, recuo_primeira_linha, tamanho))
+
+
+@lru_cache(maxsize=16384)
+def quebrar_linhas(texto, largura, recuo_primeira_linha, tamanho, negrito=False):
+    """
+    Linhas de um parágrafo, para quem as desenha (backend PDF)
+    Retorna tupla de (palavras, largura ocupada em pt, última linha do segmento), com cada
+    palavra uma tupla de (texto, negrito). Resultado em cache por parágrafo.
+    """
+    return tuple(_linhas(_trechos(texto, negrito), largura, recuo_primeira_linha, tamanho))
+
+
+@lru_cache(maxsize=None)
+def medidas_estilo(estilo):
+    """(largura da linha, recuo da primeira linha, tamanho, negrito) de um estilo ABNT, em pt"""
+    definicao = ESTILOS_ABNT[estilo]
+    return (
+        LARGURA_TEXTO - definicao.get('recuo_esquerdo', 0) * CM,
+        definicao.get('recuo_primeira_linha', 0) * CM,
+        definicao['tamanho'],
+        definicao.get('negrito', False)
+    )
+
+
+class EstimadorLayout(GeradorDocumentoABNT):
+    """
+    Paginação estimada de um trabalho, alimentada pelas mesmas operações adicionar_*
+    titulos: lista de {'numero', 'titulo', 'nivel', 'pagina'} na ordem do documento
+    (pagina = página física, contando a capa como 1)
+    Só estima: não gera arquivo (salvar levanta RuntimeError; o GeradorPDF sim gera)
+    """
+
+    ESTILOS_TITULO = (ESTILO_TITULO_SECAO, ESTILO_TITULO_SUBSECAO, ESTILO_TITULO_CENTRALIZADO)
+
+    def __init__(self):
+        self.pagina = 1
+        self.y = 0.0
+        self.titulos = []
+        self._titulo_pendente = None
+
+    def _configurar_documento(self):
+        """Nada a configurar: o estimador só usa as definições de ESTILOS_ABNT"""
+
+    def _altura_linha(self, estilo):
+        definicao = ESTILOS_ABNT[estilo]
+        return definicao['tamanho'] * ALTURA_LINHA_ARIAL * definicao['entrelinhas']
+
+    def _nova_pagina(self, y=0.0):
+        self.pagina += 1
+        self.y = y
+
+    def _contar_linhas(self, estilo, trechos):
+        """Linhas que o parágrafo ocupa (trechos: tupla de (texto, negrito))"""
+        return contar_linhas(trechos, *medidas_estilo(estilo))
+
+    def _posicionar_linhas(self, estilo, primeira, quantidade):
+        """
+        Chamado para cada parte do parágrafo que cabe na página: as linhas
+        [primeira, primeira + quantidade) começam em self.y. O estimador só conta
+        """
+
+    def _paragrafo(self, estilo, *trechos):
+        """Avança o cursor pela altura do parágrafo, quebrando páginas como o Word"""
+        definicao = ESTILOS_ABNT[estilo]
+        trechos = tuple(t if isinstance(t, tuple) else (t, False) for t in trechos)
+
+        n_linhas = self._contar_linhas(estilo, trechos)
+        altura_linha = self._altura_linha(estilo)
+        antes = definicao.get('espaco_antes', 0)
+        depois = definicao.get('espaco_depois', 0)
+
+        # Títulos ficam na mesma página que as primeiras linhas do texto seguinte; os
+        # demais parágrafos são divididos entre as páginas (controle de órfãs/viúvas abaixo)
+        if estilo in self.ESTILOS_TITULO:
+            minimo = antes + n_linhas * altura_linha + LINHAS_APOS_TITULO * self._altura_linha(ESTILO_TEXTO)
+            if self.y > 0 and self.y + minimo > ALTURA_TEXTO:
+                self._nova_pagina()
+
+        if self._titulo_pendente is not None and estilo in self.ESTILOS_TITULO:
+            self._titulo_pendente['pagina'] = self.pagina
+            self.titulos.append(self._titulo_pendente)
+            self._titulo_pendente = None
+
+        self.y += antes
+        primeira = 0
+        restantes = n_linhas
+        while restantes:
+            cabem = int((ALTURA_TEXTO - self.y) // altura_linha)
+            if cabem >= restantes:
+                self._posicionar_linhas(estilo, primeira, restantes)
+                self.y += restantes * altura_linha
+                break
+
+            # Controle de linhas órfãs/viúvas: nenhuma linha isolada no pé ou no topo da página
+            if cabem < 2:
+                cabem = 0
+            elif restantes - cabem == 1:
+                cabem = cabem - 1 if cabem > 2 else 0
+            if cabem:
+                self._posicionar_linhas(estilo, primeira, cabem)
+            primeira += cabem
+            restantes -= cabem
+            self._nova_pagina()
+
+        self.y += depois
+
+    def _quebra_pagina(self):
+        """A marca de parágrafo da quebra ocupa a primeira linha da nova página"""
+        self._nova_pagina(ALTURA_LINHA_NORMAL)
+
+    def _inserir_fragmento(self, nome, valores):
+        """Capa e folha de rosto: as linhas do fragmento, terminadas em quebra de página"""
+        for estilo, campo, negrito, linhas_antes in FRAGMENTOS_PRE_TEXTUAIS[nome]:
+            # Campos vazios mantêm o parágrafo (sem texto), como no .docx
+            self.y += linhas_antes * LINHA_ABNT_PT
+            self._paragrafo(estilo, (valores.get(campo, ''), negrito))
+        self._quebra_pagina()
+
+    def adicionar_secao(self, numero, titulo, texto, nivel=1):
+        self._titulo_pendente = {'numero': numero, 'titulo': titulo_secao(titulo, nivel), 'nivel': nivel}
+        super().adicionar_secao(numero, titulo, texto, nivel)
+
+    def adicionar_referencias(self, lista_referencias):
+        self._titulo_pendente = {'numero': '', 'titulo': 'REFERÊNCIAS', 'nivel': 1}
+        super().adicionar_referencias(lista_referencias)
+
+    def salvar(self, caminho=None, compressao=COMPRESSAO_PADRAO):
+        raise RuntimeError("EstimadorLayout só estima a paginação e não gera arquivos; "
+                           "use GeradorDocumentoABNT ou GeradorPDF")
+
+
+def calcular_sumario(dados, resumo='', palavras_chave='', conteudo='', referencias=''):
+    """
+    Entradas do sumário com as páginas estimadas de cada seção
+    A numeração conta as páginas a partir da folha de rosto (NBR 14724: a capa não é contada)
+    conteudo: texto ou árvore já analisada (estrutura_abnt.analisar_conteudo)
+    Retorna lista no formato de adicionar_sumario
+    """
+    # Paginação sem o sumário: as seções vêm depois dele, então basta deslocá-las
+    estimador = EstimadorLayout()
+    gerar_trabalho(dados, resumo, palavras_chave, conteudo, referencias,
+                   gerador=estimador, incluir_sumario=False)
+
+    entradas = [
+        {'numero': t['numero'], 'titulo': t['titulo'], 'nivel': t['nivel'], 'pagina': 0}
+        for t in estimador.titulos
+    ]
+
+    # Páginas ocupadas pelo próprio sumário
+    estimador_sumario = EstimadorLayout()
+    estimador_sumario.adicionar_sumario(entradas)
+    paginas_sumario = estimador_sumario.pagina - 1
+
+    for entrada, titulo in zip(entradas, estimador.titulos):
+        entrada['pagina'] = titulo['pagina'] + paginas_sumario - 1
+    return entradas
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Geração em lote do Formatador ABNT (sem interface gráfica)
+Renderiza vários trabalhos em paralelo usando todos os núcleos disponíveis
+
+Cada trabalho é uma pasta com os arquivos:
+    dados.json        - instituicao, curso, autor, titulo, natureza, objetivo,
+                        orientador, local, ano e (opcional) palavras_chave
+    resumo.txt        - texto do resumo (opcional)
+    conteudo.txt      - conteúdo com títulos como "1 INTRODUÇÃO" (opcional)
+    referencias.txt   - uma referência por linha (opcional)
+
+Uso:
+    python lote_abnt.py PASTA_ENTRADA -o PASTA_SAIDA [-j PROCESSOS] [--relatorio relatorio.json]
+                        [--streaming] [--biblioteca referencias.sqlite3] [--trace PASTA_TRACE]
+                        [--cache PASTA_CACHE] [--compressao {armazenado,rapida,padrao,maxima}]
+                        [--pdf]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+ARQUIVO_DADOS = 'dados.json'
+ARQUIVOS_TEXTO = {
+    'resumo': 'resumo.txt',
+    'conteudo': 'conteudo.txt',
+    'referencias': 'referencias.txt'
+}
+
+
+def listar_pacotes(pasta_entrada):
+    """Lista as pastas de trabalho (as que contêm dados.json), em ordem alfabética"""
+    pacotes = []
+    for nome in sorted(os.listdir(pasta_entrada)):
+        caminho = os.path.join(pasta_entrada, nome)
+        if os.path.isfile(os.path.join(caminho, ARQUIVO_DADOS)):
+            pacotes.append(caminho)
+    return pacotes
+
+
+def ler_pacote(caminho_pacote):
+    """Lê os arquivos de uma pasta de trabalho"""
+    with open(os.path.join(caminho_pacote, ARQUIVO_DADOS), encoding='utf-8') as f:
+        dados = json.load(f)
+
+    if not isinstance(dados, dict):
+        raise ValueError(f"{ARQUIVO_DADOS} deve conter um objeto JSON")
+
+    textos = {}
+    for chave, nome_arquivo in ARQUIVOS_TEXTO.items():
+        caminho = os.path.join(caminho_pacote, nome_arquivo)
+        if os.path.isfile(caminho):
+            with open(caminho, encoding='utf-8') as f:
+                textos[chave] = f.read()
+        else:
+            textos[chave] = ''
+
+    return dados, textos
+
+
+def renderizar_pacote(caminho_pacote, pasta_saida, streaming=False, biblioteca=None,
+                      pasta_trace=None, cache=None, compressao=None, pdf=False):
+    """
+    Renderiza um trabalho (executado no processo de trabalho)
+    streaming: usa GeradorDocumentoStreaming (memória constante em trabalhos longos)
+    biblioteca: caminho de uma BibliotecaReferencias com os campos das referências
+    pasta_trace: mede as etapas e grava <nome>.trace.json (Chrome Trace) nessa pasta
+    cache: pasta de um CacheRenderizacao; trabalhos sem alterações não são renderizados
+    (com pasta_trace, o cache só é atualizado, para que a medição seja de uma renderização)
+    compressao: perfil de motor_abnt.PERFIS_COMPRESSAO (padrão: COMPRESSAO_PADRAO)
+    pdf: grava <nome>.pdf com pdf_abnt.GeradorPDF em vez do .docx
+    Nunca levanta exceção: erros são devolvidos no resultado
+    """
+    # Importado aqui para que cada processo carregue o motor uma única vez
+    from motor_abnt import COMPRESSAO_PADRAO, gerar_trabalho
+    from escritor_streaming import GeradorDocumentoStreaming
+    from pdf_abnt import GeradorPDF
+    from biblioteca_referencias import BibliotecaReferencias
+    from conferencia_citacoes import conferir_citacoes
+    from rastreamento import RASTREADOR_NULO, Rastreador
+    from cache_renderizacao import CacheRenderizacao, chave_renderizacao
+
+    nome = os.path.basename(os.path.normpath(caminho_pacote))
+    caminho_saida = os.path.join(pasta_saida, f"{nome}.pdf" if pdf else f"{nome}.docx")
+    inicio = time.perf_counter()
+    gerador = None
+    acervo = None
+    rastreador = Rastreador() if pasta_trace else None
+    documento = None
+    compressao = compressao or COMPRESSAO_PADRAO
+
+    try:
+        dados, textos = ler_pacote(caminho_pacote)
+        palavras_chave = dados.get('palavras_chave', '')
+
+        if cache:
+            documentos = CacheRenderizacao(cache)
+            chave = chave_renderizacao(
+                dados, textos['resumo'], palavras_chave, textos['conteudo'], textos['referencias'],
+                streaming=streaming, biblioteca=bool(biblioteca), compressao=compressao, pdf=pdf
+            )
+            if rastreador is None:
+                documento = documentos.obter(chave)
+
+        if documento is not None:
+            with open(caminho_saida, 'wb') as f:
+                f.write(documento)
+        else:
+            if biblioteca:
+                acervo = BibliotecaReferencias(biblioteca)
+            if pdf:
+                gerador = GeradorPDF()
+            elif streaming:
+                gerador = GeradorDocumentoStreaming(caminho_saida, compressao)
+            gerador = gerar_trabalho(
+                dados,
+                resumo=textos['resumo'],
+                palavras_chave=palavras_chave,
+                conteudo=textos['conteudo'],
+                referencias=textos['referencias'],
+                gerador=gerador,
+                biblioteca=acervo,
+                rastreador=rastreador
+            )
+            gerador.salvar(caminho_saida, compressao)
+            if cache:
+                with open(caminho_saida, 'rb') as f:
+                    documentos.guardar(chave, f.read())
+
+        medidor = rastreador or RASTREADOR_NULO
+        with medidor.etapa('Conferência de citações'):
+            conferencia = conferir_citacoes(textos['conteudo'], textos['referencias'])
+        medidor.contar('citacoes', conferencia['citacoes'])
+
+        if rastreador is not None:
+            rastreador.exportar_chrome(os.path.join(pasta_trace, f"{nome}.trace.json"))
+    except Exception as e:
+        if isinstance(gerador, GeradorDocumentoStreaming):
+            gerador.descartar()
+        return {
+            'nome': nome,
+            'sucesso': False,
+            'tempo': time.perf_counter() - inicio,
+            'saida': None,
+            'erro': f"{type(e).__name__}: {e}",
+            'conferencia': None,
+            'rastreamento': None,
+            'cache': False
+        }
+    finally:
+        if acervo is not None:
+            acervo.fechar()
+
+    return {
+        'nome': nome,
+        'sucesso': True,
+        'tempo': time.perf_counter() - inicio,
+        'saida': caminho_saida,
+        'erro': None,
+        'conferencia': conferencia,
+        'rastreamento': rastreador.resumo() if rastreador is not None else None,
+        'cache': documento is not None
+    }
+
+
+def executar_lote(pasta_entrada, pasta_saida, processos=None, ao_concluir=None,
+                  streaming=False, biblioteca=None, pasta_trace=None, cache=None, compressao=None,
+                  pdf=False):
+    """
+    Renderiza todos os trabalhos de pasta_entrada em paralelo
+    ao_concluir(resultado) é chamado a cada documento finalizado
+    Retorna a lista de resultados na ordem dos pacotes
+    """
+    pacotes = listar_pacotes(pasta_entrada)
+    os.makedirs(pasta_saida, exist_ok=True)
+    if pasta_trace:
+        os.makedirs(pasta_trace, exist_ok=True)
+
+    resultados = {}
+    with ProcessPoolExecutor(max_workers=processos or os.cpu_count()) as executor:
+        futuros = {
+            executor.submit(renderizar_pacote, pacote, pasta_saida, streaming, biblioteca,
+                            pasta_trace, cache, compressao, pdf): pacote
+            for pacote in pacotes
+        }
+
+        for futuro in as_completed(futuros):
+            pacote = futuros[futuro]
+            try:
+                resultado = futuro.result()
+            except Exception as e:
+                # Falha do próprio processo (ex: processo encerrado)
+                resultado = {
+                    'nome': os.path.basename(os.path.normpath(pacote)),
+                    'sucesso': False,
+                    'tempo': 0.0,
+                    'saida': None,
+                    'erro': f"{type(e).__name__}: {e}",
+                    'conferencia': None,
+                    'rastreamento': None,
+                    'cache': False
+                }
+
+            resultados[pacote] = resultado
+            if ao_concluir:
+                ao_concluir(resultado)
+
+    return [resultados[pacote] for pacote in pacotes]
+
+
+def imprimir_resultado(resultado):
+    """Imprime uma linha por documento"""
+    if resultado['sucesso']:
+        origem = ", cache" if resultado['cache'] else ""
+        print(f"✅ {resultado['nome']} ({resultado['tempo']:.2f}s{origem})")
+
+        conferencia = resultado['conferencia']
+        if conferencia['sem_referencia'] or conferencia['nao_citadas']:
+            print(f"   ⚠️ {len(conferencia['sem_referencia'])} citações sem referência, "
+                  f"{len(conferencia['nao_citadas'])} referências não citadas")
+    else:
+        print(f"❌ {resultado['nome']} ({resultado['tempo']:.2f}s): {resultado['erro']}")
+
+
+def main(argv=None):
+    """Função principal"""
+    from motor_abnt import COMPRESSAO_PADRAO, PERFIS_COMPRESSAO
+
+    parser = argparse.ArgumentParser(
+        description="Gera documentos ABNT em lote a partir de uma pasta de trabalhos"
+    )
+    parser.add_argument('entrada', help="pasta com uma subpasta por trabalho")
+    parser.add_argument('-o', '--saida', required=True, help="pasta onde os documentos serão gravados")
+    parser.add_argument('-j', '--processos', type=int, default=None,
+                        help="número de processos (padrão: todos os núcleos)")
+    parser.add_argument('--relatorio', help="grava o relatório do lote em JSON")
+    formato = parser.add_mutually_exclusive_group()
+    formato.add_argument('--streaming', action='store_true',
+                         help="grava o document.xml em fluxo (memória constante em trabalhos longos)")
+    formato.add_argument('--pdf', action='store_true',
+                         help="gera PDF em vez de .docx (sem Word ou LibreOffice)")
+    parser.add_argument('--biblioteca',
+                        help="biblioteca de referências (SQLite) com os campos já analisados")
+    parser.add_argument('--trace', metavar='PASTA',
+                        help="mede as etapas de cada documento e grava os traces (Chrome Trace) na pasta")
+    parser.add_argument('--cache', metavar='PASTA',
+                        help="reaproveita documentos de trabalhos sem alterações (cache em disco)")
+    parser.add_argument('--compressao', choices=PERFIS_COMPRESSAO, default=COMPRESSAO_PADRAO,
+                        help="compressão do .docx: armazenado (mais rápido, maior) a maxima "
+                             f"(mais lento, menor); padrão: {COMPRESSAO_PADRAO}")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.entrada):
+        print(f"❌ Pasta de entrada não encontrada: {args.entrada}")
+        return 1
+
+    inicio = time.perf_counter()
+    resultados = executar_lote(
+        args.entrada, args.saida,
+        processos=args.processos,
+        ao_concluir=imprimir_resultado,
+        streaming=args.streaming,
+        biblioteca=args.biblioteca,
+        pasta_trace=args.trace,
+        cache=args.cache,
+        compressao=args.compressao,
+        pdf=args.pdf
+    )
+    tempo_total = time.perf_counter() - inicio
+
+    falhas = [r for r in resultados if not r['sucesso']]
+    print()
+    print(f"📄 {len(resultados) - len(falhas)}/{len(resultados)} documentos gerados em {tempo_total:.2f}s")
+
+    if args.relatorio:
+        with open(args.relatorio, 'w', encoding='utf-8') as f:
+            json.dump({
+                'tempo_total': tempo_total,
+                'documentos': resultados
+            }, f, ensure_ascii=False, indent=2)
+
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
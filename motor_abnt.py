@@ -0,0 +1,958 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de formatação ABNT (sem interface gráfica)
+FormatadorABNT, GeradorDocumentoABNT e gerar_trabalho podem ser importados por
+processos de lote/serviço sem carregar Tk. O python-docx só é importado quando o
+primeiro documento é criado.
+"""
+
+import copy
+import io
+import os
+import re
+import zipfile
+from collections import OrderedDict
+from functools import lru_cache
+
+from estrutura_abnt import (
+    CITACAO_LONGA, LISTA, PARAGRAFO, analisar_conteudo, analisar_titulo, percorrer_secoes
+)
+from rastreamento import RASTREADOR_NULO
+from varredura_citacoes import e_citacao_et_al, varrer_citacoes
+
+
+# Padrões de citação (compilados uma única vez); as citações em si são localizadas
+# por varredura_citacoes, em tempo linear
+_RE_ANO_AUTOR = re.compile(r',\s*\d{4}')
+_RE_ANO_ET_AL = re.compile(r',\s*(\d{4}[a-z]?(?:,\s*p\.\s*\d+(?:-\d+)?)?)')
+_RE_SUFIXO_ANO = re.compile(r',\s*\d{4}.*$')
+_PALAVRAS_ET_AL = frozenset(['et', 'al', 'al.'])
+
+# Referência NBR 6023: "AUTOR. Título. Restante (edição, local, editora, ano)."
+_RE_REFERENCIA = re.compile(r'^([A-ZÀÁÂÃÄÅÇÈÉÊËÌÍÎÏÑÒÓÔÕÖÙÚÛÜÝ][^.]+\.)\s*([^.]+\.)\s*(.*)$')
+_RE_ANO_REFERENCIA = re.compile(r'\b(1[5-9]\d{2}|20\d{2})[a-z]?\b')
+# Início dos dados de acesso de documentos online (a data de acesso não é o ano da obra)
+_RE_ACESSO_REFERENCIA = re.compile(r'\b(?:Dispon[íi]vel\s+em|Acesso\s+em)\b', re.IGNORECASE)
+
+
+def titulo_secao(titulo, nivel):
+    """Título como aparece no documento e no sumário: MAIÚSCULAS só na seção primária (NBR 6024)"""
+    return titulo.upper() if nivel == 1 else titulo
+
+
+class FormatadorABNT:
+    """Classe responsável pela formatação completa ABNT"""
+
+    @staticmethod
+    def _maiusculas_autor(nome):
+        """SOBRENOME em maiúsculas, preservando "et al." em minúsculas"""
+        return ' '.join(
+            p.lower() if p.lower() in _PALAVRAS_ET_AL else p.upper()
+            for p in nome.split()
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def _formatar_citacao(citacao):
+        """
+        Reescreve o conteúdo de uma citação entre parênteses em uma única passagem:
+        autores em MAIÚSCULAS e, com 4 ou mais autores, "PRIMEIRO et al., ano"
+        Em cache: a mesma citação se repete ao longo do texto
+        """
+        autores_formatados = []
+
+        for autor in citacao.split(';'):
+            autor = autor.strip()
+            ano = _RE_ANO_AUTOR.search(autor)
+
+            if ano:
+                nome = autor[:ano.start()].strip()
+                autores_formatados.append(
+                    FormatadorABNT._maiusculas_autor(nome) + autor[ano.start():]
+                )
+            else:
+                autores_formatados.append(FormatadorABNT._maiusculas_autor(autor))
+
+        conteudo = '; '.join(autores_formatados)
+
+        # Converte múltiplos autores para et al. (4+)
+        if len(autores_formatados) >= 4 and e_citacao_et_al(conteudo):
+            ano_match = _RE_ANO_ET_AL.search(conteudo)
+            if ano_match:
+                primeiro = _RE_SUFIXO_ANO.sub('', autores_formatados[0].strip()).strip()
+                return f"({primeiro} et al., {ano_match.group(1)})"
+
+        return f"({conteudo})"
+
+    @staticmethod
+    def formatar_citacoes(texto, rastreador=RASTREADOR_NULO):
+        """
+        Formata citações conforme NBR 10520
+        - Curtas: até 3 linhas, entre aspas
+        - Longas: >3 linhas, recuo 4cm, sem aspas
+        - Autor em MAIÚSCULAS
+        Percorre o texto uma única vez, em tempo linear para qualquer entrada
+        rastreador: conta as citações reescritas ('citacoes_reescritas')
+        """
+        partes = []
+        copiado = 0
+        reescritas = 0
+        for inicio, fim in varrer_citacoes(texto):
+            partes.append(texto[copiado:inicio])
+            citacao = FormatadorABNT._formatar_citacao(texto[inicio + 1:fim - 1])
+            if rastreador.ativo and citacao != texto[inicio:fim]:
+                reescritas += 1
+            partes.append(citacao)
+            copiado = fim
+
+        rastreador.contar('citacoes_reescritas', reescritas)
+        if not partes:
+            return texto
+        partes.append(texto[copiado:])
+        return ''.join(partes)
+
+    @staticmethod
+    def formatar_referencias(texto):
+        """
+        Formata referências conforme NBR 6023
+        SOBRENOME, Nome. Título: subtítulo. Edição. Local: Editora, ano.
+        """
+        linhas = texto.split('\n')
+        referencias_formatadas = []
+
+        for linha in linhas:
+            if linha.strip():
+                # Aplica formatação básica de referência
+                referencias_formatadas.append(linha.strip())
+
+        return '\n'.join(referencias_formatadas)
+
+    @staticmethod
+    def analisar_referencia(referencia):
+        """
+        Separa os campos NBR 6023 de uma referência
+        Retorna {'texto', 'autor', 'titulo', 'resto', 'sobrenome', 'ano'}; autor e título
+        ficam vazios quando a referência não segue o padrão "AUTOR. Título. Restante"
+        """
+        texto = referencia.strip()
+        match = _RE_REFERENCIA.match(texto)
+        autor, titulo, resto = match.groups() if match else ('', '', '')
+
+        # Entrada da referência: sobrenome do primeiro autor ou entidade (ex: BRASIL)
+        sobrenome = autor.split(',')[0].split(';')[0].rstrip('.').strip()
+        # Ano de publicação: o último da imprenta, antes de "Disponível em"/"Acesso em"
+        anos = _RE_ANO_REFERENCIA.findall(_RE_ACESSO_REFERENCIA.split(texto, 1)[0])
+
+        return {
+            'texto': texto,
+            'autor': autor,
+            'titulo': titulo,
+            'resto': resto,
+            'sobrenome': sobrenome,
+            'ano': anos[-1] if anos else ''
+        }
+
+
+class FormatadorIncremental:
+    """
+    Formatação de citações incremental: só reformata os blocos alterados
+    Um bloco é uma linha, ou várias linhas quando um parêntese aberto continua na
+    linha seguinte (uma citação nunca atravessa a fronteira entre blocos), de modo
+    que o resultado é idêntico a FormatadorABNT.formatar_citacoes no texto inteiro.
+    """
+
+    def __init__(self, limite_cache=20000):
+        # bloco original -> bloco formatado (LRU)
+        self._cache = OrderedDict()
+        self.limite_cache = limite_cache
+
+    @staticmethod
+    def dividir_blocos(texto):
+        """Divide o texto em blocos de linhas; retorna lista de (linha inicial, [linhas])"""
+        blocos = []
+        atual = []
+        inicio = 0
+        aberto = False
+
+        for indice, linha in enumerate(texto.split('\n')):
+            if not atual:
+                inicio = indice
+            atual.append(linha)
+
+            # O último parêntese da linha decide se uma citação pode continuar
+            ultimo = max(linha.rfind('('), linha.rfind(')'))
+            if ultimo >= 0:
+                aberto = linha[ultimo] == '('
+
+            if not aberto:
+                blocos.append((inicio, atual))
+                atual = []
+
+        if atual:
+            blocos.append((inicio, atual))
+        return blocos
+
+    def formatar_bloco(self, bloco):
+        """Formata um bloco usando o cache"""
+        formatado = self._cache.get(bloco)
+        if formatado is not None:
+            self._cache.move_to_end(bloco)
+            return formatado
+
+        formatado = FormatadorABNT.formatar_citacoes(bloco) if '(' in bloco else bloco
+        self._cache[bloco] = formatado
+        # O resultado já formatado também é um bloco estável
+        self._cache[formatado] = formatado
+        while len(self._cache) > self.limite_cache:
+            self._cache.popitem(last=False)
+        return formatado
+
+    def alteracoes(self, texto):
+        """
+        Blocos cujo texto muda ao formatar
+        Retorna lista de (linha inicial, número de linhas, texto formatado), linhas a partir de 0
+        """
+        resultado = []
+        for inicio, linhas in self.dividir_blocos(texto):
+            bloco = '\n'.join(linhas)
+            formatado = self.formatar_bloco(bloco)
+            if formatado != bloco:
+                resultado.append((inicio, len(linhas), formatado))
+        return resultado
+
+    def formatar(self, texto):
+        """Texto completo formatado (equivalente a FormatadorABNT.formatar_citacoes)"""
+        return '\n'.join(
+            self.formatar_bloco('\n'.join(linhas))
+            for _, linhas in self.dividir_blocos(texto)
+        )
+
+
+def dividir_em_secoes(conteudo):
+    """
+    Divide o conteúdo nos títulos de seção de qualquer nível (mesma detecção de
+    adicionar_conteudo)
+    Retorna lista de (título, texto): cada texto começa na linha do título; o texto antes
+    do primeiro título, se houver, vem com título ''. '\n'.join dos textos é o conteúdo
+    """
+    secoes = []
+    titulo = ''
+    linhas = []
+
+    for linha in conteudo.split('\n'):
+        if analisar_titulo(linha.strip()):
+            if linhas:
+                secoes.append((titulo, '\n'.join(linhas)))
+            titulo = linha.strip()
+            linhas = []
+        linhas.append(linha)
+
+    secoes.append((titulo, '\n'.join(linhas)))
+    return secoes
+
+
+# Estilos ABNT nomeados (NBR 14724, NBR 6023, NBR 10520)
+# Definidos uma única vez no documento; cada parágrafo apenas referencia o estilo.
+# Alterar a formatação de um elemento é uma edição somente nesta tabela.
+FONTE_ABNT = 'Arial'
+
+ESTILO_TEXTO = 'Texto ABNT'
+ESTILO_TITULO_SECAO = 'Título Seção ABNT'
+ESTILO_TITULO_SUBSECAO = 'Título Subseção ABNT'
+ESTILO_TITULO_CENTRALIZADO = 'Título Centralizado ABNT'
+ESTILO_RESUMO = 'Resumo ABNT'
+ESTILO_SUMARIO = 'Sumário ABNT'
+ESTILO_CITACAO_LONGA = 'Citação Longa ABNT'
+ESTILO_FONTE_CITACAO = 'Fonte Citação ABNT'
+ESTILO_ALINEA = 'Alínea ABNT'
+ESTILO_REFERENCIA = 'Referência ABNT'
+ESTILO_CAPA = 'Capa ABNT'
+ESTILO_TITULO_CAPA = 'Título Capa ABNT'
+ESTILO_NATUREZA = 'Natureza ABNT'
+ESTILO_NEGRITO = 'Negrito ABNT'
+
+# tamanho e espaços em pt, recuos em cm, entrelinhas em múltiplos de linha
+ESTILOS_ABNT = {
+    ESTILO_TEXTO: {
+        'id': 'TextoABNT', 'tipo': 'paragrafo', 'tamanho': 12,
+        'alinhamento': 'justificado', 'entrelinhas': 1.5, 'recuo_primeira_linha': 1.25
+    },
+    ESTILO_TITULO_SECAO: {
+        'id': 'TituloSecaoABNT', 'tipo': 'paragrafo', 'tamanho': 12, 'negrito': True,
+        'alinhamento': 'esquerda', 'entrelinhas': 1.5, 'espaco_antes': 24, 'espaco_depois': 12,
+        'nivel_estrutura': 0, 'manter_com_proximo': True
+    },
+    ESTILO_TITULO_SUBSECAO: {
+        'id': 'TituloSubsecaoABNT', 'tipo': 'paragrafo', 'tamanho': 12, 'negrito': True,
+        'alinhamento': 'esquerda', 'entrelinhas': 1.5, 'espaco_depois': 6,
+        'nivel_estrutura': 1, 'manter_com_proximo': True
+    },
+    ESTILO_TITULO_CENTRALIZADO: {
+        'id': 'TituloCentralizadoABNT', 'tipo': 'paragrafo', 'tamanho': 12, 'negrito': True,
+        'alinhamento': 'centro', 'entrelinhas': 1.5, 'espaco_depois': 18,
+        'manter_com_proximo': True
+    },
+    ESTILO_RESUMO: {
+        'id': 'ResumoABNT', 'tipo': 'paragrafo', 'tamanho': 12,
+        'alinhamento': 'justificado', 'entrelinhas': 1.5, 'espaco_depois': 18
+    },
+    ESTILO_SUMARIO: {
+        'id': 'SumarioABNT', 'tipo': 'paragrafo', 'tamanho': 12,
+        'alinhamento': 'esquerda', 'entrelinhas': 1.5, 'tabulacao_pontilhada': 16
+    },
+    ESTILO_CITACAO_LONGA: {
+        'id': 'CitacaoLongaABNT', 'tipo': 'paragrafo', 'tamanho': 10,
+        'alinhamento': 'justificado', 'entrelinhas': 1.0, 'recuo_esquerdo': 4
+    },
+    ESTILO_FONTE_CITACAO: {
+        'id': 'FonteCitacaoABNT', 'tipo': 'paragrafo', 'tamanho': 10,
+        'alinhamento': 'direita', 'entrelinhas': 1.0, 'recuo_esquerdo': 4
+    },
+    ESTILO_ALINEA: {
+        # NBR 6024: a partir da segunda linha, o texto começa sob o da própria alínea
+        'id': 'AlineaABNT', 'tipo': 'paragrafo', 'tamanho': 12,
+        'alinhamento': 'justificado', 'entrelinhas': 1.5,
+        'recuo_esquerdo': 1.88, 'recuo_primeira_linha': -0.63
+    },
+    ESTILO_REFERENCIA: {
+        'id': 'ReferenciaABNT', 'tipo': 'paragrafo', 'tamanho': 12,
+        'alinhamento': 'esquerda', 'entrelinhas': 1.0, 'espaco_depois': 6
+    },
+    ESTILO_CAPA: {
+        'id': 'CapaABNT', 'tipo': 'paragrafo', 'tamanho': 12,
+        'alinhamento': 'centro', 'entrelinhas': 1.5
+    },
+    ESTILO_TITULO_CAPA: {
+        'id': 'TituloCapaABNT', 'tipo': 'paragrafo', 'tamanho': 14, 'negrito': True,
+        'alinhamento': 'centro', 'entrelinhas': 1.5
+    },
+    ESTILO_NATUREZA: {
+        'id': 'NaturezaABNT', 'tipo': 'paragrafo', 'tamanho': 10,
+        'alinhamento': 'direita', 'entrelinhas': 1.0, 'recuo_esquerdo': 8
+    },
+    ESTILO_NEGRITO: {
+        'id': 'NegritoABNT', 'tipo': 'caractere', 'negrito': True
+    },
+}
+
+# Páginas pré-textuais (capa e folha de rosto) como fragmentos XML parametrizados
+# Cada linha: (estilo, campo de dados, negrito, linhas em branco antes)
+# O espaço vertical é aplicado como espaçamento antes do parágrafo (1 linha = 18pt,
+# Arial 12 com entrelinhas 1,5) em vez de parágrafos vazios.
+LINHA_ABNT_PT = 18
+
+FRAGMENTOS_PRE_TEXTUAIS = {
+    'capa': [
+        (ESTILO_CAPA, 'instituicao', True, 0),
+        (ESTILO_CAPA, 'curso', False, 0),
+        (ESTILO_CAPA, 'autor', True, 8),
+        (ESTILO_TITULO_CAPA, 'titulo', False, 4),
+        (ESTILO_CAPA, 'local', False, 8),
+        (ESTILO_CAPA, 'ano', False, 0),
+    ],
+    'folha_rosto': [
+        (ESTILO_CAPA, 'autor', True, 0),
+        (ESTILO_TITULO_CAPA, 'titulo', False, 8),
+        (ESTILO_NATUREZA, 'natureza', False, 4),
+        (ESTILO_CAPA, 'local', False, 6),
+        (ESTILO_CAPA, 'ano', False, 0),
+    ],
+}
+
+
+@lru_cache(maxsize=None)
+def _fragmento_pre_textual(nome):
+    """
+    Constrói uma única vez o XML de uma página pré-textual, terminada em quebra de página
+    Os campos ficam como marcadores {campo} a serem preenchidos em cada documento
+    """
+    from docx.oxml import parse_xml
+    from docx.oxml.ns import nsdecls
+
+    paragrafos = []
+    for estilo, campo, negrito, linhas_antes in FRAGMENTOS_PRE_TEXTUAIS[nome]:
+        ppr = '<w:pStyle w:val="%s"/>' % ESTILOS_ABNT[estilo]['id']
+        if linhas_antes:
+            ppr += f'<w:spacing w:before="{linhas_antes * LINHA_ABNT_PT * 20}"/>'
+        rpr = ''
+        if negrito:
+            rpr = '<w:rPr><w:rStyle w:val="%s"/></w:rPr>' % ESTILOS_ABNT[ESTILO_NEGRITO]['id']
+        paragrafos.append(f'<w:p><w:pPr>{ppr}</w:pPr><w:r>{rpr}<w:t>{{{campo}}}</w:t></w:r></w:p>')
+
+    paragrafos.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+    return parse_xml(f'<w:body {nsdecls("w")}>{"".join(paragrafos)}</w:body>')
+
+
+# Data fixa nas entradas do zip: o mesmo documento gera sempre os mesmos bytes
+# (é a data padrão do ZipInfo, usada também pelas entradas abertas com ZipFile.open)
+DATA_ZIP = (1980, 1, 1, 0, 0, 0)
+
+# Perfis de compressão do .docx: (método do zip, nível do deflate)
+PERFIS_COMPRESSAO = {
+    # Sem compressão: gravação mais rápida, arquivo maior
+    'armazenado': (zipfile.ZIP_STORED, None),
+    'rapida': (zipfile.ZIP_DEFLATED, 1),
+    # Nível padrão do zlib, o mesmo do python-docx e do Word
+    'padrao': (zipfile.ZIP_DEFLATED, None),
+    # Menor arquivo, gravação mais lenta
+    'maxima': (zipfile.ZIP_DEFLATED, 9),
+}
+COMPRESSAO_PADRAO = 'padrao'
+
+
+def _perfil_compressao(compressao):
+    """(método, nível) do perfil; ValueError para perfis desconhecidos"""
+    try:
+        return PERFIS_COMPRESSAO[compressao]
+    except KeyError:
+        raise ValueError(
+            f"compressão desconhecida: {compressao!r} (use {', '.join(PERFIS_COMPRESSAO)})"
+        ) from None
+
+
+def entrada_zip(nome, compressao=COMPRESSAO_PADRAO):
+    """
+    (entrada, nível) do zip: data fixa (saída reproduzível) e o método do perfil de
+    compressão; o nível vai para ZipFile.writestr(entrada, dados, compresslevel=nível)
+    """
+    info = zipfile.ZipInfo(nome, date_time=DATA_ZIP)
+    info.compress_type, nivel = _perfil_compressao(compressao)
+    info.external_attr = 0o600 << 16
+    return info, nivel
+
+
+class _EscritorZipReproduzivel:
+    """Grava as partes do pacote (interface PhysPkgWriter do python-docx) com data fixa"""
+
+    def __init__(self, destino, compressao):
+        self._zip = zipfile.ZipFile(destino, 'w')
+        self._compressao = compressao
+
+    def write(self, pack_uri, blob):
+        info, nivel = entrada_zip(pack_uri.membername, self._compressao)
+        self._zip.writestr(info, blob, compress_type=info.compress_type, compresslevel=nivel)
+
+    def close(self):
+        self._zip.close()
+
+
+def tamanho_gravado(destino):
+    """Bytes do arquivo salvo (caminho) ou posição final do fluxo"""
+    if isinstance(destino, (str, os.PathLike)):
+        return os.path.getsize(destino)
+    try:
+        return destino.tell()
+    except (AttributeError, OSError):
+        return 0
+
+
+class GeradorDocumentoABNT:
+    """Classe para gerar documentos Word completos conforme ABNT"""
+
+    # Medição de etapas e contadores (rastreamento.Rastreador); desligada por padrão
+    rastreador = RASTREADOR_NULO
+
+    def __init__(self):
+        from docx import Document
+
+        self.doc = Document()
+        # Novos elementos entram antes do w:sectPr, que fica sempre no fim do corpo
+        self._fim_corpo = self.doc.element.body.sectPr
+        self._configurar_documento()
+
+    def _configurar_documento(self):
+        """Configura margens e estilos padrão ABNT"""
+        from docx.shared import Pt, Cm
+
+        # Configurar margens (NBR 14724)
+        sections = self.doc.sections
+        for section in sections:
+            section.top_margin = Cm(3)
+            section.bottom_margin = Cm(2)
+            section.left_margin = Cm(3)
+            section.right_margin = Cm(2)
+            section.page_height = Cm(29.7)  # A4
+            section.page_width = Cm(21)
+
+        # Fonte padrão do documento (parágrafos sem estilo próprio)
+        normal = self.doc.styles['Normal']
+        normal.font.name = FONTE_ABNT
+        normal.font.size = Pt(12)
+
+        # Estilos ABNT nomeados
+        for nome, definicao in ESTILOS_ABNT.items():
+            self._criar_estilo(nome, definicao)
+
+    def _criar_estilo(self, nome, definicao):
+        """Cria um estilo nomeado a partir da sua definição em ESTILOS_ABNT"""
+        from docx.enum.style import WD_STYLE_TYPE
+        from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_TAB_ALIGNMENT, WD_TAB_LEADER
+        from docx.oxml import OxmlElement
+        from docx.oxml.ns import qn
+        from docx.shared import Pt, Cm
+
+        alinhamentos = {
+            'esquerda': WD_ALIGN_PARAGRAPH.LEFT,
+            'centro': WD_ALIGN_PARAGRAPH.CENTER,
+            'direita': WD_ALIGN_PARAGRAPH.RIGHT,
+            'justificado': WD_ALIGN_PARAGRAPH.JUSTIFY
+        }
+
+        if definicao['tipo'] == 'caractere':
+            estilo = self.doc.styles.add_style(nome, WD_STYLE_TYPE.CHARACTER)
+        else:
+            estilo = self.doc.styles.add_style(nome, WD_STYLE_TYPE.PARAGRAPH)
+            estilo.base_style = self.doc.styles['Normal']
+            estilo.quick_style = True
+
+        estilo.style_id = definicao['id']
+
+        if 'tamanho' in definicao:
+            estilo.font.name = FONTE_ABNT
+            estilo.font.size = Pt(definicao['tamanho'])
+        if definicao.get('negrito'):
+            estilo.font.bold = True
+
+        if definicao['tipo'] == 'caractere':
+            return
+
+        formato = estilo.paragraph_format
+        formato.alignment = alinhamentos[definicao['alinhamento']]
+        formato.line_spacing = definicao['entrelinhas']
+        formato.space_before = Pt(definicao.get('espaco_antes', 0))
+        formato.space_after = Pt(definicao.get('espaco_depois', 0))
+        if 'recuo_esquerdo' in definicao:
+            formato.left_indent = Cm(definicao['recuo_esquerdo'])
+        if 'recuo_primeira_linha' in definicao:
+            formato.first_line_indent = Cm(definicao['recuo_primeira_linha'])
+        if definicao.get('manter_com_proximo'):
+            formato.keep_with_next = True
+        if 'tabulacao_pontilhada' in definicao:
+            # Tabulação à direita com preenchimento pontilhado (número de página do sumário)
+            formato.tab_stops.add_tab_stop(
+                Cm(definicao['tabulacao_pontilhada']), WD_TAB_ALIGNMENT.RIGHT, WD_TAB_LEADER.DOTS
+            )
+
+        if 'nivel_estrutura' in definicao:
+            # Nível no painel de navegação / sumário do Word
+            nivel = OxmlElement('w:outlineLvl')
+            nivel.set(qn('w:val'), str(definicao['nivel_estrutura']))
+            estilo.element.get_or_add_pPr().append(nivel)
+
+    def _paragrafo(self, estilo, *trechos):
+        """
+        Adiciona um parágrafo que referencia um estilo ABNT nomeado
+        trechos: str (texto no estilo do parágrafo) ou (str, True) para negrito
+        """
+        from docx.oxml.parser import OxmlElement
+        from docx.text.paragraph import Paragraph
+
+        # O estilo é atribuído direto pelo id: a API por nome do python-docx
+        # percorre todos os estilos do documento a cada chamada
+        p = Paragraph(self._anexar_ao_corpo(OxmlElement('w:p')), self.doc._body)
+        p._p.style = ESTILOS_ABNT[estilo]['id']
+        self.rastreador.contar('paragrafos')
+
+        for trecho in trechos:
+            if isinstance(trecho, tuple):
+                texto, negrito = trecho
+            else:
+                texto, negrito = trecho, False
+
+            if not texto:
+                continue
+
+            r = p._p.add_r()
+            self.rastreador.contar('trechos')
+            if negrito:
+                r.style = ESTILOS_ABNT[ESTILO_NEGRITO]['id']
+
+            if '\n' in texto or '\t' in texto:
+                # Quebras de linha e tabulações viram <w:br/> e <w:tab/>
+                from docx.text.run import Run
+                Run(r, p).text = texto
+            else:
+                r.add_t(texto)
+
+        return p
+
+    def _anexar_ao_corpo(self, elemento):
+        """
+        Insere um elemento no fim do corpo (antes do w:sectPr) em tempo constante;
+        doc.add_paragraph procura o w:sectPr percorrendo o corpo inteiro a cada chamada
+        """
+        self._fim_corpo.addprevious(elemento)
+        return elemento
+
+    def _quebra_pagina(self):
+        """Adiciona quebra de página"""
+        from docx.oxml.parser import OxmlElement
+
+        p = self._anexar_ao_corpo(OxmlElement('w:p'))
+        p.add_r().add_br().type = 'page'
+        self.rastreador.contar('quebras_pagina')
+
+    @staticmethod
+    def _preencher_fragmento(nome, valores):
+        """Clona o fragmento pré-textual em cache e preenche os campos"""
+        from docx.oxml.ns import qn
+
+        fragmento = copy.deepcopy(_fragmento_pre_textual(nome))
+
+        for t in list(fragmento.iter(qn('w:t'))):
+            r = t.getparent()
+            valor = valores.get(t.text[1:-1], '')
+            if valor:
+                # Quebras de linha do valor viram <w:br/>
+                r.text = valor
+            else:
+                r.getparent().remove(r)
+
+        return fragmento
+
+    def _inserir_fragmento(self, nome, valores):
+        """Anexa ao corpo uma página pré-textual preenchida"""
+        elementos = list(self._preencher_fragmento(nome, valores))
+        for elemento in elementos:
+            self._anexar_ao_corpo(elemento)
+        self.rastreador.contar('paragrafos', len(elementos))
+
+    def adicionar_capa(self, dados):
+        """
+        Gera capa conforme ABNT
+        dados = {
+            'instituicao': str,
+            'curso': str,
+            'autor': str,
+            'titulo': str,
+            'local': str,
+            'ano': str
+        }
+        """
+        self._inserir_fragmento('capa', {
+            'instituicao': dados.get('instituicao', '').upper(),
+            'curso': dados.get('curso', '').upper(),
+            'autor': dados.get('autor', '').upper(),
+            'titulo': dados.get('titulo', '').upper(),
+            'local': dados.get('local', '').upper(),
+            'ano': dados.get('ano', '')
+        })
+
+    def adicionar_folha_rosto(self, dados):
+        """
+        Gera folha de rosto conforme ABNT
+        dados = {
+            'autor': str,
+            'titulo': str,
+            'natureza': str (ex: "Trabalho de Conclusão de Curso"),
+            'objetivo': str (ex: "Obtenção do título de Bacharel"),
+            'orientador': str,
+            'local': str,
+            'ano': str
+        }
+        """
+        # Natureza do trabalho (recuado à direita)
+        texto_natureza = f"{dados.get('natureza', '')}\n\n{dados.get('objetivo', '')}"
+        if dados.get('orientador'):
+            texto_natureza += f"\n\nOrientador: {dados.get('orientador', '')}"
+
+        self._inserir_fragmento('folha_rosto', {
+            'autor': dados.get('autor', '').upper(),
+            'titulo': dados.get('titulo', '').upper(),
+            'natureza': texto_natureza,
+            'local': dados.get('local', '').upper(),
+            'ano': dados.get('ano', '')
+        })
+
+    def adicionar_resumo(self, texto_resumo, palavras_chave, quebra_pagina=True):
+        """
+        Adiciona resumo formatado conforme ABNT
+        quebra_pagina: False mantém o texto na mesma página (artigos, NBR 6022)
+        """
+        # Título RESUMO
+        self._paragrafo(ESTILO_TITULO_CENTRALIZADO, 'RESUMO')
+
+        # Texto do resumo
+        self._paragrafo(ESTILO_RESUMO, texto_resumo)
+
+        # Palavras-chave (omitidas quando não informadas)
+        if palavras_chave.strip():
+            self._paragrafo(ESTILO_RESUMO, ('Palavras-chave: ', True), palavras_chave)
+
+        # Quebra de página
+        if quebra_pagina:
+            self._quebra_pagina()
+
+    def adicionar_cabecalho_artigo(self, dados):
+        """Título e autoria de um artigo em anais ou coletâneas (NBR 6022)"""
+        self._paragrafo(ESTILO_TITULO_CENTRALIZADO, dados.get('titulo', '').upper())
+        if dados.get('autor'):
+            self._paragrafo(ESTILO_CAPA, dados['autor'])
+
+    def adicionar_sumario(self, secoes):
+        """
+        Gera sumário automático
+        secoes = [{'numero': '1', 'titulo': 'INTRODUÇÃO', 'pagina': 10}, ...]
+        (as páginas reais podem ser obtidas com layout_abnt.calcular_sumario)
+        """
+        # Título SUMÁRIO
+        self._paragrafo(ESTILO_TITULO_CENTRALIZADO, 'SUMÁRIO')
+
+        # Itens do sumário
+        for secao in secoes:
+            # Número e título; a tabulação pontilhada do estilo alinha a página à direita
+            texto = f"{secao['numero']}  {secao['titulo']}"
+            self._paragrafo(ESTILO_SUMARIO, f"{texto}\t{secao['pagina']}")
+
+        # Quebra de página
+        self._quebra_pagina()
+
+    def adicionar_secao(self, numero, titulo, texto, nivel=1):
+        """
+        Adiciona seção formatada conforme NBR 6024
+        texto: parágrafos separados por linha em branco, ou blocos da árvore de
+        estrutura_abnt.analisar_conteudo (parágrafos, citações longas e listas)
+        nivel: 1 (principal), 2 (subseção), 3 (sub-subseção)...
+        """
+        with self.rastreador.etapa('Seção', numero=numero):
+            # Título da seção (espaçamento antes/depois definido no estilo)
+            estilo_titulo = ESTILO_TITULO_SECAO if nivel == 1 else ESTILO_TITULO_SUBSECAO
+            self._paragrafo(estilo_titulo, f"{numero}  {titulo_secao(titulo, nivel)}")
+
+            if not isinstance(texto, str):
+                self._adicionar_blocos(texto)
+                return
+
+            # Texto da seção
+            paragrafos = texto.split('\n\n')
+            for paragrafo in paragrafos:
+                if paragrafo.strip():
+                    self._paragrafo(ESTILO_TEXTO, paragrafo.strip())
+
+    def _adicionar_blocos(self, blocos):
+        """Renderiza os blocos de uma seção da árvore de estrutura_abnt"""
+        for bloco in blocos:
+            if bloco[0] == PARAGRAFO:
+                self._paragrafo(ESTILO_TEXTO, bloco[1])
+            elif bloco[0] == CITACAO_LONGA:
+                self.adicionar_citacao_longa(*bloco[1:])
+            elif bloco[0] == LISTA:
+                self.adicionar_lista(bloco[1])
+
+    def adicionar_citacao_longa(self, texto_citacao, autor=None, ano=None, pagina=None):
+        """
+        Adiciona citação longa (>3 linhas) formatada conforme NBR 10520
+        Sem autor, só o texto (a fonte já vem no parágrafo anterior)
+        """
+        self._paragrafo(ESTILO_CITACAO_LONGA, texto_citacao)
+        if not autor:
+            return
+
+        # Referência da citação
+        ref = f"({autor.upper()}, {ano}"
+        if pagina:
+            ref += f", p. {pagina}"
+        ref += ")"
+
+        self._paragrafo(ESTILO_FONTE_CITACAO, ref)
+
+    def adicionar_lista(self, itens):
+        """
+        Adiciona uma lista em alíneas "a)", "b)"... (NBR 6024)
+        As letras fazem parte do texto: não há numeração automática do Word (numbering.xml)
+        """
+        for indice, item in enumerate(itens):
+            letras = ''
+            while True:
+                indice, resto = divmod(indice, 26)
+                letras = chr(ord('a') + resto) + letras
+                if not indice:
+                    break
+                indice -= 1
+            self._paragrafo(ESTILO_ALINEA, f"{letras}) {item}")
+
+    def adicionar_referencias(self, lista_referencias):
+        """
+        Adiciona seção de referências formatada conforme NBR 6023
+        lista_referencias = ['REF1', 'REF2', ...] ou campos já analisados
+        (FormatadorABNT.analisar_referencia / BibliotecaReferencias.resolver)
+        """
+        # Quebra de página antes
+        self._quebra_pagina()
+
+        # Título REFERÊNCIAS
+        self._paragrafo(ESTILO_TITULO_CENTRALIZADO, 'REFERÊNCIAS')
+
+        campos_referencias = [
+            referencia if isinstance(referencia, dict)
+            else FormatadorABNT.analisar_referencia(referencia)
+            for referencia in lista_referencias
+        ]
+
+        # Ordenar alfabeticamente
+        for campos in sorted(campos_referencias, key=lambda c: c['texto']):
+            if not campos['texto']:
+                continue
+
+            if campos['titulo']:
+                # Título em negrito
+                self._paragrafo(
+                    ESTILO_REFERENCIA,
+                    campos['autor'] + ' ',
+                    (campos['titulo'], True),
+                    ' ' + campos['resto'] if campos['resto'] else ''
+                )
+            else:
+                self._paragrafo(ESTILO_REFERENCIA, campos['texto'])
+
+    def adicionar_conteudo(self, conteudo, ao_adicionar_secao=None):
+        """
+        Adiciona as seções do conteúdo ao documento, em qualquer nível
+        conteudo: texto simples (títulos como "1 INTRODUÇÃO", "1.1 Contexto"; ver
+        estrutura_abnt) ou a árvore já analisada por estrutura_abnt.analisar_conteudo
+        ao_adicionar_secao(fracao): chamado antes de cada seção com a fração já processada
+        """
+        raiz = analisar_conteudo(conteudo) if isinstance(conteudo, str) else conteudo
+        secoes = list(percorrer_secoes(raiz))
+
+        for indice, (numero, titulo, nivel, blocos, _) in enumerate(secoes):
+            if ao_adicionar_secao:
+                ao_adicionar_secao(indice / len(secoes))
+            self.adicionar_secao(numero, titulo, blocos, nivel)
+
+    def salvar(self, caminho=None, compressao=COMPRESSAO_PADRAO):
+        """
+        Salva o documento
+        caminho: arquivo, fluxo binário (inclusive sem seek, ex: socket) ou None para
+        receber os bytes do .docx como retorno
+        compressao: perfil de PERFIS_COMPRESSAO ('armazenado' é o mais rápido,
+        'maxima' gera o menor arquivo)
+        A saída é reproduzível: o mesmo conteúdo gera sempre os mesmos bytes
+        """
+        from docx.opc.pkgwriter import PackageWriter
+
+        _perfil_compressao(compressao)
+        destino = io.BytesIO() if caminho is None else caminho
+
+        with self.rastreador.etapa('Salvar', compressao=compressao):
+            # Equivalente a Document.save, com as entradas do zip sem a hora atual
+            pacote = self.doc.part.package
+            for parte in pacote.parts:
+                parte.before_marshal()
+
+            escritor = _EscritorZipReproduzivel(destino, compressao)
+            PackageWriter._write_content_types_stream(escritor, pacote.parts)
+            PackageWriter._write_pkg_rels(escritor, pacote.rels)
+            PackageWriter._write_parts(escritor, pacote.parts)
+            escritor.close()
+
+        if self.rastreador.ativo:
+            self.rastreador.contar('bytes_gravados', tamanho_gravado(destino))
+        if caminho is None:
+            return destino.getvalue()
+
+
+class GeracaoCancelada(Exception):
+    """Levantada por gerar_trabalho quando a geração é cancelada"""
+
+
+# Etapas da geração e seu peso aproximado no tempo total (usado no progresso)
+ETAPAS_GERACAO = [
+    ('Capa', 1),
+    ('Folha de rosto', 1),
+    ('Resumo', 1),
+    ('Sumário', 1),
+    ('Conteúdo', 12),
+    ('Referências', 2),
+]
+
+
+def gerar_trabalho(dados, resumo='', palavras_chave='', conteudo='', referencias='',
+                   gerador=None, progresso=None, cancelar=None, incluir_sumario=True,
+                   biblioteca=None, rastreador=None, formatar_citacoes=False):
+    """
+    Monta o trabalho completo (sem interface gráfica)
+    dados: dicionário com os campos de capa/folha de rosto
+    resumo, palavras_chave, conteudo, referencias: texto simples (conteudo também pode ser
+    a árvore de estrutura_abnt.analisar_conteudo)
+    gerador: gerador a usar (padrão: novo GeradorDocumentoABNT), ex: GeradorDocumentoStreaming
+    progresso(etapa, fracao): chamado a cada etapa/seção, fracao de 0 a 1
+    cancelar: objeto com is_set() (ex: threading.Event); levanta GeracaoCancelada
+    incluir_sumario: False omite o sumário (usado pela estimativa de layout)
+    biblioteca: BibliotecaReferencias opcional; referências cadastradas usam os campos
+    NBR 6023 já armazenados em vez de serem analisadas novamente
+    rastreador: rastreamento.Rastreador opcional; mede etapas e contadores da geração
+    (e de salvar, que usa o rastreador do gerador)
+    formatar_citacoes: aplica FormatadorABNT.formatar_citacoes ao conteudo (texto) antes
+    da análise, contando as citações reescritas
+    Retorna o gerador pronto para salvar
+    """
+    peso_total = sum(peso for _, peso in ETAPAS_GERACAO)
+
+    def etapa(indice, fracao=0.0):
+        """Verifica cancelamento e informa o progresso"""
+        if cancelar is not None and cancelar.is_set():
+            raise GeracaoCancelada()
+        if progresso:
+            nome, peso = ETAPAS_GERACAO[indice]
+            concluido = sum(p for _, p in ETAPAS_GERACAO[:indice]) + peso * fracao
+            progresso(nome, concluido / peso_total)
+
+    # Criar gerador
+    if gerador is None:
+        with (rastreador or RASTREADOR_NULO).etapa('Inicialização'):
+            gerador = GeradorDocumentoABNT()
+    if rastreador is not None:
+        gerador.rastreador = rastreador
+    medir = gerador.rastreador.etapa
+
+    if formatar_citacoes and isinstance(conteudo, str):
+        with medir('Citações'):
+            conteudo = FormatadorABNT.formatar_citacoes(conteudo, gerador.rastreador)
+
+    # Estrutura do conteúdo: analisada uma vez e usada pelo sumário e pela renderização
+    with medir('Estrutura'):
+        estrutura = analisar_conteudo(conteudo) if isinstance(conteudo, str) else conteudo
+
+    # 1. Capa
+    etapa(0)
+    with medir('Capa'):
+        gerador.adicionar_capa(dados)
+
+    # 2. Folha de rosto
+    etapa(1)
+    with medir('Folha de rosto'):
+        gerador.adicionar_folha_rosto(dados)
+
+    # 3. Resumo
+    etapa(2)
+    if resumo.strip():
+        with medir('Resumo'):
+            gerador.adicionar_resumo(resumo, palavras_chave)
+
+    # 4. Sumário (páginas estimadas pelo layout, sem renderizar o trabalho duas vezes)
+    etapa(3)
+    if incluir_sumario:
+        from layout_abnt import calcular_sumario
+
+        with medir('Sumário'):
+            secoes_sumario = calcular_sumario(dados, resumo, palavras_chave, estrutura, referencias)
+            gerador.adicionar_sumario(secoes_sumario)
+
+    # 5. Conteúdo
+    etapa(4)
+    if estrutura[4]:
+        # Processar o conteúdo em seções
+        with medir('Conteúdo'):
+            gerador.adicionar_conteudo(estrutura, ao_adicionar_secao=lambda fracao: etapa(4, fracao))
+
+    # 6. Referências
+    etapa(5)
+    if referencias.strip():
+        with medir('Referências'):
+            lista_referencias = [ref.strip() for ref in referencias.split('\n') if ref.strip()]
+            if biblioteca is not None:
+                lista_referencias = biblioteca.resolver(lista_referencias)
+            gerador.adicionar_referencias(lista_referencias)
+
+    return gerador
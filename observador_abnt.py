@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modo de observação: regenera o documento a cada alteração nos arquivos do trabalho
+
+A pasta do trabalho tem o formato da geração em lote (dados.json, resumo.txt,
+conteudo.txt, referencias.txt). Quando um arquivo muda, o conteúdo é analisado de novo
+(estrutura_abnt, a mesma árvore de adicionar_conteudo) e só as seções alteradas, em
+qualquer nível, são renderizadas: o XML das demais, e o da lista de referências,
+é copiado da geração anterior.
+
+Só a renderização das seções é proporcional à edição. Cada gravação ainda analisa o
+texto inteiro, estima a paginação do trabalho inteiro para o sumário (rápidas, com as
+medidas de parágrafos em cache) e grava e comprime o .docx inteiro, que é a maior parte
+do tempo: a regeneração continua crescendo com o tamanho do trabalho, só bem mais devagar
+que a geração completa (num trabalho de 2000 páginas, cerca de um terço do tempo).
+
+Uso:
+    python observador_abnt.py PASTA_TRABALHO -o trabalho.docx [--intervalo 0.5]
+                              [--trace trabalho.trace.json]
+"""
+
+import argparse
+import copy
+import io
+import os
+import sys
+import time
+from functools import lru_cache
+
+from lote_abnt import ARQUIVO_DADOS, ARQUIVOS_TEXTO, ler_pacote
+from motor_abnt import GeradorDocumentoABNT, gerar_trabalho
+from rastreamento import Rastreador
+
+
+# Intervalo (s) entre verificações dos arquivos; uma alteração só é processada depois de
+# um intervalo sem novas gravações (editores costumam gravar em mais de uma etapa)
+INTERVALO_PADRAO = 0.5
+
+
+@lru_cache(maxsize=None)
+def _modelo_configurado():
+    """Documento ABNT vazio (margens e estilos já criados), gravado uma única vez"""
+    return GeradorDocumentoABNT().salvar()
+
+
+class GeradorIncremental(GeradorDocumentoABNT):
+    """
+    Gerador que reaproveita o XML de seções e referências inalteradas
+    blocos_anteriores: GeradorIncremental.blocos da geração anterior
+    """
+
+    def __init__(self, blocos_anteriores=None):
+        from docx import Document
+
+        # Parte do modelo já configurado em vez de recriar os estilos a cada geração
+        self.doc = Document(io.BytesIO(_modelo_configurado()))
+        self._fim_corpo = self.doc.element.body.sectPr
+        self._anteriores = blocos_anteriores or {}
+        # chave do bloco -> elementos do corpo (w:p) que ele produziu nesta geração
+        self.blocos = {}
+        self.reaproveitados = 0
+        self.renderizados = []
+
+    def _bloco(self, chave, renderizar):
+        """Anexa o bloco: cópia do XML já renderizado ou, se for novo, renderizar()"""
+        elementos = self.blocos.get(chave) or self._anteriores.get(chave)
+        if elementos is not None:
+            self.blocos[chave] = [self._anexar_ao_corpo(copy.deepcopy(e)) for e in elementos]
+            self.reaproveitados += 1
+            self.rastreador.contar('blocos_reaproveitados')
+            return
+
+        anterior = self._fim_corpo.getprevious()
+        renderizar()
+
+        elemento = anterior.getnext() if anterior is not None else self.doc.element.body[0]
+        novos = []
+        while elemento is not self._fim_corpo:
+            novos.append(elemento)
+            elemento = elemento.getnext()
+
+        self.blocos[chave] = novos
+        self.renderizados.append(chave)
+        self.rastreador.contar('blocos_renderizados')
+
+    def adicionar_secao(self, numero, titulo, texto, nivel=1):
+        self._bloco(
+            ('secao', numero, titulo, texto, nivel),
+            lambda: super(GeradorIncremental, self).adicionar_secao(numero, titulo, texto, nivel)
+        )
+
+    def adicionar_referencias(self, lista_referencias):
+        textos = tuple(r['texto'] if isinstance(r, dict) else r for r in lista_referencias)
+        self._bloco(
+            ('referencias', textos),
+            lambda: super(GeradorIncremental, self).adicionar_referencias(lista_referencias)
+        )
+
+
+def regenerar(pasta_trabalho, caminho_saida, blocos_anteriores=None, caminho_trace=None):
+    """
+    Gera o documento reaproveitando os blocos da geração anterior
+    caminho_trace: mede as etapas e grava o trace (Chrome Trace) desta geração
+    Retorna (blocos para a próxima geração, resumo da geração)
+    """
+    inicio = time.perf_counter()
+    rastreador = Rastreador() if caminho_trace else None
+    dados, textos = ler_pacote(pasta_trabalho)
+
+    gerador = gerar_trabalho(
+        dados,
+        resumo=textos['resumo'],
+        palavras_chave=dados.get('palavras_chave', ''),
+        conteudo=textos['conteudo'],
+        referencias=textos['referencias'],
+        gerador=GeradorIncremental(blocos_anteriores),
+        rastreador=rastreador
+    )
+
+    # O documento anterior continua íntegro até o novo estar completo
+    temporario = caminho_saida + '.tmp'
+    gerador.salvar(temporario)
+    os.replace(temporario, caminho_saida)
+    if rastreador is not None:
+        rastreador.exportar_chrome(caminho_trace)
+
+    return gerador.blocos, {
+        'tempo': time.perf_counter() - inicio,
+        'reaproveitados': gerador.reaproveitados,
+        'renderizados': [
+            f"{chave[1]} {chave[2]}" if chave[0] == 'secao' else 'REFERÊNCIAS'
+            for chave in gerador.renderizados
+        ]
+    }
+
+
+def _estado_arquivos(pasta_trabalho):
+    """Data de modificação e tamanho de cada arquivo do trabalho"""
+    estado = []
+    for nome in (ARQUIVO_DADOS, *ARQUIVOS_TEXTO.values()):
+        try:
+            info = os.stat(os.path.join(pasta_trabalho, nome))
+            estado.append((nome, info.st_mtime_ns, info.st_size))
+        except FileNotFoundError:
+            estado.append((nome, None, None))
+    return estado
+
+
+def observar(pasta_trabalho, caminho_saida, intervalo=INTERVALO_PADRAO, ao_gerar=None, parar=None,
+             caminho_trace=None):
+    """
+    Regenera caminho_saida a cada alteração na pasta do trabalho
+    ao_gerar(resumo, erro): chamado após cada geração (erro é None em caso de sucesso)
+    parar: objeto com is_set() (ex: threading.Event); sem ele, observa até Ctrl+C
+    caminho_trace: grava o trace da última geração nesse arquivo
+    """
+    blocos = None
+    estado_gerado = None
+
+    while parar is None or not parar.is_set():
+        estado = _estado_arquivos(pasta_trabalho)
+        if estado != estado_gerado:
+            # Espera as gravações terminarem
+            time.sleep(intervalo)
+            if _estado_arquivos(pasta_trabalho) != estado:
+                continue
+
+            estado_gerado = estado
+            try:
+                blocos, resumo = regenerar(pasta_trabalho, caminho_saida, blocos, caminho_trace)
+            except Exception as e:
+                # Arquivo incompleto ou inválido: espera a próxima gravação
+                if ao_gerar:
+                    ao_gerar(None, f"{type(e).__name__}: {e}")
+                continue
+
+            if ao_gerar:
+                ao_gerar(resumo, None)
+
+        time.sleep(intervalo)
+
+
+def main(argv=None):
+    """Função principal"""
+    parser = argparse.ArgumentParser(
+        description="Regenera o documento ABNT a cada alteração nos arquivos do trabalho"
+    )
+    parser.add_argument('trabalho', help=f"pasta com {ARQUIVO_DADOS}, resumo.txt, conteudo.txt e referencias.txt")
+    parser.add_argument('-o', '--saida', required=True, help="arquivo .docx gerado")
+    parser.add_argument('--intervalo', type=float, default=INTERVALO_PADRAO,
+                        help=f"segundos entre verificações (padrão: {INTERVALO_PADRAO})")
+    parser.add_argument('--trace', metavar='ARQUIVO',
+                        help="mede as etapas de cada geração e grava o trace (Chrome Trace) da última")
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(os.path.join(args.trabalho, ARQUIVO_DADOS)):
+        print(f"❌ {ARQUIVO_DADOS} não encontrado em {args.trabalho}")
+        return 1
+
+    def imprimir(resumo, erro):
+        hora = time.strftime('%H:%M:%S')
+        if erro:
+            print(f"❌ [{hora}] {erro}")
+            return
+
+        if not resumo['reaproveitados']:
+            detalhe = "geração completa"
+        else:
+            alteradas = ', '.join(resumo['renderizados']) or 'nenhuma seção'
+            detalhe = f"{resumo['reaproveitados']} blocos reaproveitados; renderizados: {alteradas}"
+        print(f"✅ [{hora}] {args.saida} em {resumo['tempo']:.2f}s ({detalhe})")
+
+    print(f"👀 Observando {args.trabalho} (Ctrl+C para sair)")
+    try:
+        observar(args.trabalho, args.saida, args.intervalo, ao_gerar=imprimir, caminho_trace=args.trace)
+    except KeyboardInterrupt:
+        print("\n👋 Observação encerrada")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""
+Backend PDF: gera o trabalho direto em PDF, sem Word nem LibreOffice instalados
+
+GeradorPDF recebe as mesmas operações adicionar_* de GeradorDocumentoABNT e herda a
+paginação de layout_abnt.EstimadorLayout: as linhas que o estimador conta são as que o
+PDF desenha, de modo que as páginas do sumário (calculadas pelo estimador) são as
+páginas reais do arquivo. Folha A4 com as margens da NBR 14724, estilos de ESTILOS_ABNT
+(texto justificado em entrelinhas 1,5, citações longas com recuo de 4 cm em fonte 10...)
+e número de página no canto superior direito a partir da primeira seção do texto.
+
+A Arial é referenciada sem ser embutida, com as larguras de layout_abnt (as mesmas da
+quebra de linhas): o leitor de PDF usa a Arial do sistema ou uma fonte de mesmas
+métricas. As larguras das palavras, a quebra de linhas e os operadores de cada parágrafo
+ficam em cache. Somente biblioteca padrão.
+"""
+
+import io
+import os
+import zipfile
+import zlib
+from functools import lru_cache
+
+from layout_abnt import (
+    CM, LARGURA_PADRAO, LARGURAS_ARIAL, LARGURAS_ARIAL_NEGRITO,
+    EstimadorLayout, largura_palavra, medidas_estilo, quebrar_linhas
+)
+from motor_abnt import (
+    COMPRESSAO_PADRAO, ESTILOS_ABNT, _perfil_compressao, tamanho_gravado
+)
+
+
+# Folha A4 e margens da NBR 14724, em pt
+LARGURA_PAGINA = 21 * CM
+ALTURA_PAGINA = 29.7 * CM
+MARGEM_ESQUERDA = 3 * CM
+MARGEM_SUPERIOR = 3 * CM
+
+# Número da página: a 2 cm das bordas superior e direita (NBR 14724)
+TAMANHO_NUMERO_PAGINA = 10
+DISTANCIA_NUMERO_PAGINA = 2 * CM
+
+# Descendente da Arial em em: a linha de base fica acima do pé da linha
+DESCENDENTE_ARIAL = 0.212
+ASCENDENTE_ARIAL = 0.905
+
+# Texto em WinAnsiEncoding (cp1252); caracteres fora dela saem como '?'
+CODIFICACAO = 'cp1252'
+
+FONTES = {False: 'F1', True: 'F2'}
+
+# Objetos fixos do arquivo; cada página ocupa dois objetos (página e conteúdo) a seguir
+_OBJETOS_FONTES = (
+    # (negrito, nome, objeto da fonte, objeto do descritor, métricas do descritor)
+    (False, 'Arial', 3, 4, '/Flags 32 /FontBBox [-665 -325 2000 1006] /ItalicAngle 0 '
+                           '/Ascent 905 /Descent -212 /CapHeight 716 /StemV 80'),
+    (True, 'Arial,Bold', 5, 6, '/Flags 32 /FontBBox [-628 -376 2000 1010] /ItalicAngle 0 '
+                               '/Ascent 905 /Descent -212 /CapHeight 716 /StemV 153 /FontWeight 700'),
+)
+_OBJETO_CATALOGO = 1
+_OBJETO_PAGINAS = 2
+_OBJETO_INFORMACOES = 7
+_PRIMEIRO_OBJETO_PAGINA = 8
+
+
+def _literal(texto):
+    """String literal do PDF em WinAnsi, com \\, ( e ) escapados"""
+    texto = texto.encode(CODIFICACAO, 'replace').decode('latin-1')
+    return '(' + texto.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') + ')'
+
+
+def _texto_informacao(texto):
+    """String do dicionário de informações (UTF-16 com BOM, aceita qualquer caractere)"""
+    return '<FEFF' + texto.encode('utf-16-be').hex().upper() + '>'
+
+
+def _larguras_fonte(tabela):
+    """/Widths dos códigos 32 a 255 da WinAnsi, com as larguras usadas na quebra de linhas"""
+    larguras = []
+    for codigo in range(32, 256):
+        try:
+            caractere = bytes([codigo]).decode(CODIFICACAO)
+        except UnicodeDecodeError:
+            caractere = None
+        larguras.append(str(tabela.get(caractere, LARGURA_PADRAO)))
+    return ' '.join(larguras)
+
+
+def _operadores_trechos(palavras, tamanho):
+    """Operadores Tf/Tj de uma linha; o espaço entre palavras vai no trecho anterior"""
+    trechos = []
+    for indice, palavra in enumerate(palavras):
+        if indice:
+            trechos[-1][1].append(' ')
+        for texto, negrito in palavra:
+            if trechos and trechos[-1][0] == negrito:
+                trechos[-1][1].append(texto)
+            else:
+                trechos.append((negrito, [texto]))
+
+    return ' '.join(
+        f"/{FONTES[negrito]} {tamanho} Tf {_literal(''.join(partes))} Tj"
+        for negrito, partes in trechos
+    )
+
+
+@lru_cache(maxsize=16384)
+def _linhas_pdf(trechos, estilo):
+    """
+    Linhas de um parágrafo prontas para desenhar: tupla de (x, operadores), com x
+    relativo à margem esquerda e os operadores de texto a partir da linha de base
+    Alinhamento e recuos do estilo; o justificado usa o espaçamento entre palavras (Tw)
+    """
+    definicao = ESTILOS_ABNT[estilo]
+    largura, recuo_primeira_linha, tamanho, negrito = medidas_estilo(estilo)
+    recuo_esquerdo = definicao.get('recuo_esquerdo', 0) * CM
+    alinhamento = definicao['alinhamento']
+    # Sumário: o número da página vai para a tabulação pontilhada, alinhado à direita
+    tabulacao = definicao.get('tabulacao_pontilhada')
+    if tabulacao and not any('\t' in texto for texto, _ in trechos):
+        tabulacao = None
+
+    linhas = []
+    inicio_segmento = True
+    for palavras, ocupado, ultima in quebrar_linhas(trechos, largura, recuo_primeira_linha, tamanho, negrito):
+        x = recuo_esquerdo + (recuo_primeira_linha if inicio_segmento else 0)
+        disponivel = largura - (recuo_primeira_linha if inicio_segmento else 0)
+        inicio_segmento = ultima
+        folga = disponivel - ocupado
+        espacos = 0.0
+
+        if not palavras:
+            linhas.append((x, ''))
+            continue
+        if tabulacao and ultima and len(palavras) > 1:
+            linhas.append((x, _operadores_tabulacao(palavras, tamanho, tabulacao * CM - x)))
+            continue
+        if alinhamento == 'justificado' and not ultima and len(palavras) > 1:
+            espacos = folga / (len(palavras) - 1)
+        elif alinhamento == 'centro':
+            x += folga / 2
+        elif alinhamento == 'direita':
+            x += folga
+
+        linhas.append((x, f"{espacos:.3f} Tw {_operadores_trechos(palavras, tamanho)}"))
+    return tuple(linhas)
+
+
+def _operadores_tabulacao(palavras, tamanho, posicao):
+    """Texto à esquerda, pontilhado e a última palavra alinhada à direita em posicao"""
+    while len(palavras) > 1 and not palavras[-2]:
+        palavras = palavras[:-2] + palavras[-1:]
+    esquerda, direita = palavras[:-1], palavras[-1:]
+
+    def medir(grupo):
+        return sum(largura_palavra(t, tamanho, n) for palavra in grupo for t, n in palavra) + \
+            largura_palavra(' ', tamanho) * (len(grupo) - 1)
+
+    ponto = largura_palavra('.', tamanho)
+    inicio_pontos = medir(esquerda) + ponto
+    inicio_direita = posicao - medir(direita)
+    pontos = int((inicio_direita - ponto - inicio_pontos) // ponto)
+
+    # Td desloca a partir do início da linha (ou do Td anterior), não do fim do texto
+    operadores = ["0.000 Tw", _operadores_trechos(esquerda, tamanho)]
+    if pontos > 0:
+        operadores.append(f"{inicio_pontos:.2f} 0 Td /F1 {tamanho} Tf {_literal('.' * pontos)} Tj")
+        inicio_direita -= inicio_pontos
+    operadores.append(f"{inicio_direita:.2f} 0 Td {_operadores_trechos(direita, tamanho)}")
+    return ' '.join(operadores)
+
+
+class GeradorPDF(EstimadorLayout):
+    """
+    Gera o trabalho em PDF, alimentado pelas mesmas operações adicionar_*
+    As páginas prontas ficam na memória como fluxos de conteúdo; salvar monta o arquivo
+    (pode ser chamado mais de uma vez)
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._paginas = []
+        self._conteudo = []
+        self._linhas = ()
+        self._numerar = False
+        self._secao_pendente = False
+        self._informacoes = {}
+
+    def _contar_linhas(self, estilo, trechos):
+        """Quebra as linhas (em cache) e guarda-as para _posicionar_linhas"""
+        self._linhas = _linhas_pdf(trechos, estilo)
+        return len(self._linhas)
+
+    def _posicionar_linhas(self, estilo, primeira, quantidade):
+        """Desenha as linhas na página atual, a partir de self.y"""
+        definicao = ESTILOS_ABNT[estilo]
+        altura_linha = self._altura_linha(estilo)
+        # Linha de base no pé da linha (o espaço da entrelinha fica acima do texto)
+        y = ALTURA_PAGINA - MARGEM_SUPERIOR - self.y - altura_linha + DESCENDENTE_ARIAL * definicao['tamanho']
+
+        for x, operadores in self._linhas[primeira:primeira + quantidade]:
+            if operadores:
+                self._conteudo.append(f"BT 1 0 0 1 {MARGEM_ESQUERDA + x:.2f} {y:.2f} Tm {operadores} ET\n")
+            y -= altura_linha
+
+        if self._secao_pendente:
+            # A numeração aparece a partir da página da primeira seção do texto
+            self._numerar = True
+            self._secao_pendente = False
+
+    def _pagina_atual(self):
+        """(conteúdo, número exibido ou None) da página em construção"""
+        return ''.join(self._conteudo), self.pagina - 1 if self._numerar else None
+
+    def _nova_pagina(self, y=0.0):
+        self._paginas.append(self._pagina_atual())
+        self._conteudo = []
+        super()._nova_pagina(y)
+
+    def _paragrafo(self, estilo, *trechos):
+        super()._paragrafo(estilo, *trechos)
+        self.rastreador.contar('paragrafos')
+
+    def adicionar_capa(self, dados):
+        self._informacoes = {'Title': dados.get('titulo', ''), 'Author': dados.get('autor', '')}
+        super().adicionar_capa(dados)
+
+    def adicionar_secao(self, numero, titulo, texto, nivel=1):
+        if not self._numerar:
+            self._secao_pendente = True
+        super().adicionar_secao(numero, titulo, texto, nivel)
+
+    def _objetos(self, paginas, nivel):
+        """Gera (número, conteúdo em bytes) de cada objeto do PDF"""
+        yield _OBJETO_CATALOGO, b'<< /Type /Catalog /Pages 2 0 R >>'
+
+        filhos = ' '.join(f"{_PRIMEIRO_OBJETO_PAGINA + 2 * i} 0 R" for i in range(len(paginas)))
+        fontes = ' '.join(f"/{FONTES[negrito]} {objeto} 0 R" for negrito, _, objeto, _, _ in _OBJETOS_FONTES)
+        yield _OBJETO_PAGINAS, (
+            f"<< /Type /Pages /Kids [{filhos}] /Count {len(paginas)} "
+            f"/MediaBox [0 0 {LARGURA_PAGINA:.2f} {ALTURA_PAGINA:.2f}] "
+            f"/Resources << /Font << {fontes} >> >> >>"
+        ).encode('ascii')
+
+        for negrito, nome, objeto, descritor, metricas in _OBJETOS_FONTES:
+            tabela = LARGURAS_ARIAL_NEGRITO if negrito else LARGURAS_ARIAL
+            yield objeto, (
+                f"<< /Type /Font /Subtype /TrueType /BaseFont /{nome} /Encoding /WinAnsiEncoding "
+                f"/FirstChar 32 /LastChar 255 /Widths [{_larguras_fonte(tabela)}] "
+                f"/FontDescriptor {descritor} 0 R >>"
+            ).encode('ascii')
+            yield descritor, f"<< /Type /FontDescriptor /FontName /{nome} {metricas} >>".encode('ascii')
+
+        informacoes = ' '.join(
+            f"/{chave} {_texto_informacao(valor)}" for chave, valor in self._informacoes.items() if valor
+        )
+        yield _OBJETO_INFORMACOES, f"<< {informacoes} /Producer (Formatador ABNT) >>".encode('ascii')
+
+        for indice, (conteudo, numero) in enumerate(paginas):
+            objeto = _PRIMEIRO_OBJETO_PAGINA + 2 * indice
+            yield objeto, f"<< /Type /Page /Parent 2 0 R /Contents {objeto + 1} 0 R >>".encode('ascii')
+
+            if numero is not None:
+                texto = str(numero)
+                x = LARGURA_PAGINA - DISTANCIA_NUMERO_PAGINA - largura_palavra(texto, TAMANHO_NUMERO_PAGINA)
+                y = ALTURA_PAGINA - DISTANCIA_NUMERO_PAGINA - ASCENDENTE_ARIAL * TAMANHO_NUMERO_PAGINA
+                conteudo += f"BT 0 Tw /F1 {TAMANHO_NUMERO_PAGINA} Tf 1 0 0 1 {x:.2f} {y:.2f} Tm ({texto}) Tj ET\n"
+
+            fluxo = conteudo.encode('latin-1')
+            filtro = ''
+            if nivel is not False:
+                fluxo = zlib.compress(fluxo, -1 if nivel is None else nivel)
+                filtro = ' /Filter /FlateDecode'
+            yield objeto + 1, b''.join([
+                f"<< /Length {len(fluxo)}{filtro} >>\nstream\n".encode('ascii'), fluxo, b'\nendstream'
+            ])
+
+    def salvar(self, caminho=None, compressao=COMPRESSAO_PADRAO):
+        """
+        Salva o PDF
+        caminho: arquivo, fluxo binário ou None para receber os bytes do PDF
+        compressao: perfil de motor_abnt.PERFIS_COMPRESSAO aplicado aos fluxos de
+        conteúdo das páginas ('armazenado' grava sem compressão)
+        A saída é reproduzível: o mesmo conteúdo gera sempre os mesmos bytes
+        """
+        metodo, nivel = _perfil_compressao(compressao)
+        if metodo == zipfile.ZIP_STORED:
+            nivel = False
+        paginas = self._paginas + [self._pagina_atual()]
+        self.rastreador.contar('paginas', len(paginas))
+
+        with self.rastreador.etapa('Salvar', compressao=compressao):
+            dados = io.BytesIO()
+            dados.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+            posicoes = {}
+            for objeto, conteudo in self._objetos(paginas, nivel):
+                posicoes[objeto] = dados.tell()
+                dados.write(b'%d 0 obj\n' % objeto + conteudo + b'\nendobj\n')
+
+            inicio_xref = dados.tell()
+            total = max(posicoes) + 1
+            dados.write(b'xref\n0 %d\n0000000000 65535 f \n' % total)
+            dados.write(b''.join(b'%010d 00000 n \n' % posicoes[objeto] for objeto in range(1, total)))
+            dados.write(
+                b'trailer\n<< /Size %d /Root 1 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                % (total, _OBJETO_INFORMACOES, inicio_xref)
+            )
+
+            if caminho is None:
+                documento = dados.getvalue()
+            elif isinstance(caminho, (str, os.PathLike)):
+                with open(caminho, 'wb') as f:
+                    f.write(dados.getbuffer())
+            else:
+                caminho.write(dados.getbuffer())
+
+        if self.rastreador.ativo:
+            self.rastreador.contar('bytes_gravados', len(documento) if caminho is None else tamanho_gravado(caminho))
+        if caminho is None:
+            return documento
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Arquivo de projeto do Formatador ABNT: diário (journal) somente de acréscimos
+
+O arquivo .abnt tem uma linha JSON por registro. A primeira é o estado completo do
+trabalho (dados, palavras-chave e os textos de resumo, conteúdo e referências, linha a
+linha); cada salvamento acrescenta uma única linha com o que mudou desde o anterior:
+os campos de dados alterados e, em cada texto, o trecho de linhas entre o início e o
+fim comuns. Salvar um trabalho longo grava só a edição, não o trabalho inteiro.
+
+Quando as alterações acumuladas passam do tamanho do estado, o diário é compactado
+numa thread: o estado é reescrito num arquivo novo, que substitui o anterior com
+os.replace. Um salvamento interrompido (queda de energia, processo encerrado) deixa
+no máximo uma linha incompleta no fim do arquivo, descartada ao abrir: o projeto
+volta ao último salvamento completo.
+
+Uso:
+    python projeto_abnt.py info trabalho.abnt
+    python projeto_abnt.py compactar trabalho.abnt
+    python projeto_abnt.py exportar trabalho.abnt PASTA_TRABALHO
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+
+EXTENSAO = '.abnt'
+VERSAO = 1
+
+CAMPOS_TEXTO = ('resumo', 'conteudo', 'referencias')
+
+# Compacta quando as alterações acumuladas passam do tamanho do estado (e deste mínimo)
+COMPACTAR_MINIMO_BYTES = 256 * 1024
+
+
+def _serializar(registro):
+    return (json.dumps(registro, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def _trecho_alterado(antigas, novas):
+    """
+    Trecho que transforma antigas em novas: (inicio, fim, linhas) tal que
+    antigas[inicio:fim] = linhas. Compara o início e o fim comuns (uma passagem)
+    """
+    limite = min(len(antigas), len(novas))
+    inicio = 0
+    while inicio < limite and antigas[inicio] == novas[inicio]:
+        inicio += 1
+
+    fim = 0
+    while fim < limite - inicio and antigas[-1 - fim] == novas[-1 - fim]:
+        fim += 1
+
+    return inicio, len(antigas) - fim, novas[inicio:len(novas) - fim]
+
+
+class ProjetoABNT:
+    """
+    Projeto aberto: estado atual e diário em disco
+    caminho: arquivo .abnt (criado se não existir)
+    compactar_automaticamente: compacta numa thread quando o diário cresce demais
+    """
+
+    def __init__(self, caminho, compactar_automaticamente=True):
+        self.caminho = caminho
+        self.compactar_automaticamente = compactar_automaticamente
+        self.registros_descartados = 0
+
+        self._trava = threading.Lock()
+        self._compactacao = None
+        self._dados = {}
+        self._palavras_chave = ''
+        self._linhas = {campo: [''] for campo in CAMPOS_TEXTO}
+        # Último texto registrado de cada campo: comparação rápida antes do trecho
+        self._textos = {campo: '' for campo in CAMPOS_TEXTO}
+
+        if os.path.exists(caminho):
+            self._carregar()
+        else:
+            self._reescrever(caminho, self._registro_estado(), b'')
+
+        self._arquivo = open(caminho, 'ab')
+
+    # Leitura
+
+    def _carregar(self):
+        """Aplica os registros do diário; uma linha final incompleta é descartada"""
+        with open(self.caminho, 'rb') as f:
+            conteudo = f.read()
+
+        posicao = 0
+        valido = 0
+        primeira = True
+        while posicao < len(conteudo):
+            fim_linha = conteudo.find(b'\n', posicao)
+            if fim_linha < 0:
+                break
+            try:
+                registro = json.loads(conteudo[posicao:fim_linha])
+            except ValueError:
+                break
+
+            if primeira:
+                if not isinstance(registro, dict) or 'estado' not in registro:
+                    raise ValueError(f"{self.caminho} não é um projeto do Formatador ABNT")
+                if registro.get('versao', VERSAO) > VERSAO:
+                    raise ValueError(f"{self.caminho} foi gravado por uma versão mais nova do formatador")
+                primeira = False
+            self._aplicar(registro)
+
+            posicao = valido = fim_linha + 1
+
+        if primeira:
+            raise ValueError(f"{self.caminho} não é um projeto do Formatador ABNT")
+
+        if valido < len(conteudo):
+            # Salvamento interrompido: remove o resto para que os próximos registros
+            # não sejam acrescentados a uma linha incompleta
+            resto = conteudo[valido:]
+            self.registros_descartados = resto.count(b'\n') + (not resto.endswith(b'\n'))
+            with open(self.caminho, 'r+b') as f:
+                f.truncate(valido)
+
+        self._tamanho_estado = conteudo.find(b'\n') + 1
+        self._tamanho_alteracoes = valido - self._tamanho_estado
+        for campo in CAMPOS_TEXTO:
+            self._textos[campo] = '\n'.join(self._linhas[campo])
+
+    def _aplicar(self, registro):
+        if 'estado' in registro:
+            estado = registro['estado']
+            self._dados = dict(estado['dados'])
+            self._palavras_chave = estado['palavras_chave']
+            for campo in CAMPOS_TEXTO:
+                self._linhas[campo] = list(estado[campo])
+            return
+
+        for alteracao in registro['alteracoes']:
+            campo = alteracao['campo']
+            if campo == 'dados':
+                self._dados.update(alteracao['valor'])
+            elif campo == 'palavras_chave':
+                self._palavras_chave = alteracao['valor']
+            else:
+                self._linhas[campo][alteracao['de']:alteracao['ate']] = alteracao['linhas']
+
+    def estado(self):
+        """Estado atual: dados, palavras_chave, resumo, conteudo e referencias"""
+        with self._trava:
+            return {
+                'dados': dict(self._dados),
+                'palavras_chave': self._palavras_chave,
+                **self._textos
+            }
+
+    # Gravação
+
+    def registrar(self, estado):
+        """
+        Acrescenta ao diário o que mudou em relação ao último registro
+        estado: mesmo formato de estado() (campos ausentes não são alterados)
+        Retorna o número de bytes gravados (0 se nada mudou)
+        """
+        with self._trava:
+            alteracoes = []
+
+            dados = {
+                chave: valor for chave, valor in estado.get('dados', {}).items()
+                if self._dados.get(chave) != valor
+            }
+            if dados:
+                alteracoes.append({'campo': 'dados', 'valor': dados})
+                self._dados.update(dados)
+
+            palavras_chave = estado.get('palavras_chave', self._palavras_chave)
+            if palavras_chave != self._palavras_chave:
+                alteracoes.append({'campo': 'palavras_chave', 'valor': palavras_chave})
+                self._palavras_chave = palavras_chave
+
+            for campo in CAMPOS_TEXTO:
+                texto = estado.get(campo, self._textos[campo])
+                if texto == self._textos[campo]:
+                    continue
+                novas = texto.split('\n')
+                inicio, fim, linhas = _trecho_alterado(self._linhas[campo], novas)
+                alteracoes.append({'campo': campo, 'de': inicio, 'ate': fim, 'linhas': linhas})
+                self._linhas[campo] = novas
+                self._textos[campo] = texto
+
+            if not alteracoes:
+                return 0
+
+            # Uma linha por salvamento: ou ele é aplicado por inteiro ao abrir, ou descartado
+            registro = _serializar({'alteracoes': alteracoes, 'data': round(time.time())})
+            self._arquivo.write(registro)
+            self._arquivo.flush()
+            os.fsync(self._arquivo.fileno())
+            self._tamanho_alteracoes += len(registro)
+
+        if self.compactar_automaticamente and self.precisa_compactar():
+            self.compactar_em_segundo_plano()
+        return len(registro)
+
+    def _registro_estado(self):
+        return _serializar({
+            'versao': VERSAO,
+            'estado': {
+                'dados': self._dados,
+                'palavras_chave': self._palavras_chave,
+                **{campo: self._linhas[campo] for campo in CAMPOS_TEXTO}
+            }
+        })
+
+    def _reescrever(self, caminho, registro_estado, alteracoes):
+        """Grava estado + alterações num temporário e o coloca no lugar de caminho"""
+        pasta = os.path.dirname(os.path.abspath(caminho))
+        descritor, temporario = tempfile.mkstemp(suffix=EXTENSAO + '.tmp', dir=pasta)
+        try:
+            with os.fdopen(descritor, 'wb') as f:
+                f.write(registro_estado)
+                f.write(alteracoes)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporario, caminho)
+        except BaseException:
+            os.unlink(temporario)
+            raise
+
+        self._tamanho_estado = len(registro_estado)
+        self._tamanho_alteracoes = len(alteracoes)
+
+    # Compactação
+
+    def precisa_compactar(self):
+        """As alterações acumuladas já ocupam mais que o próprio estado"""
+        return self._tamanho_alteracoes > max(self._tamanho_estado, COMPACTAR_MINIMO_BYTES)
+
+    def compactar(self):
+        """Reescreve o diário como um único registro de estado"""
+        with self._trava:
+            # Cópias rasas: os registros seguintes substituem as listas, não as alteram
+            linhas = {campo: list(self._linhas[campo]) for campo in CAMPOS_TEXTO}
+            dados, palavras_chave = dict(self._dados), self._palavras_chave
+            self._arquivo.flush()
+            inicio_pendentes = self._arquivo.tell()
+
+        # A serialização (a parte demorada) corre sem bloquear os salvamentos
+        registro_estado = _serializar({
+            'versao': VERSAO,
+            'estado': {'dados': dados, 'palavras_chave': palavras_chave, **linhas}
+        })
+
+        with self._trava:
+            # Alterações registradas durante a serialização seguem o novo estado
+            with open(self.caminho, 'rb') as f:
+                f.seek(inicio_pendentes)
+                pendentes = f.read()
+
+            self._arquivo.close()
+            try:
+                self._reescrever(self.caminho, registro_estado, pendentes)
+            finally:
+                self._arquivo = open(self.caminho, 'ab')
+
+    def compactar_em_segundo_plano(self):
+        """Inicia a compactação numa thread (se nenhuma estiver em andamento)"""
+        with self._trava:
+            if self._compactacao is not None and self._compactacao.is_alive():
+                return self._compactacao
+            self._compactacao = threading.Thread(target=self.compactar, daemon=True)
+            self._compactacao.start()
+            return self._compactacao
+
+    def salvar_como(self, caminho):
+        """Grava o estado compactado em caminho, que passa a ser o arquivo do projeto"""
+        self._aguardar_compactacao()
+        with self._trava:
+            self._reescrever(caminho, self._registro_estado(), b'')
+            self._arquivo.close()
+            self._arquivo = open(caminho, 'ab')
+            self.caminho = caminho
+
+    def _aguardar_compactacao(self):
+        compactacao = self._compactacao
+        if compactacao is not None:
+            compactacao.join()
+
+    def fechar(self):
+        """Aguarda a compactação em andamento e fecha o arquivo"""
+        self._aguardar_compactacao()
+        with self._trava:
+            self._arquivo.close()
+
+    def tamanhos(self):
+        """Bytes do registro de estado e das alterações acumuladas"""
+        with self._trava:
+            return {'estado': self._tamanho_estado, 'alteracoes': self._tamanho_alteracoes}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+
+def exportar_pacote(estado, pasta):
+    """Grava o estado no formato de pasta do lote_abnt (dados.json e os textos)"""
+    from lote_abnt import ARQUIVO_DADOS, ARQUIVOS_TEXTO
+
+    os.makedirs(pasta, exist_ok=True)
+    dados = dict(estado['dados'], palavras_chave=estado['palavras_chave'])
+    with open(os.path.join(pasta, ARQUIVO_DADOS), 'w', encoding='utf-8') as f:
+        json.dump(dados, f, ensure_ascii=False, indent=2)
+    for campo, nome in ARQUIVOS_TEXTO.items():
+        with open(os.path.join(pasta, nome), 'w', encoding='utf-8') as f:
+            f.write(estado[campo])
+
+
+def main(argv=None):
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Projetos do Formatador ABNT (.abnt)")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    info = comandos.add_parser('info', help="resume o projeto e o tamanho do diário")
+    info.add_argument('projeto')
+
+    compactar = comandos.add_parser('compactar', help="reescreve o diário como um único estado")
+    compactar.add_argument('projeto')
+
+    exportar = comandos.add_parser('exportar', help="grava o projeto no formato do lote_abnt.py")
+    exportar.add_argument('projeto')
+    exportar.add_argument('pasta')
+
+    args = parser.parse_args(argv)
+
+    if not os.path.isfile(args.projeto):
+        print(f"❌ Projeto não encontrado: {args.projeto}")
+        return 1
+
+    inicio = time.perf_counter()
+    try:
+        projeto = ProjetoABNT(args.projeto, compactar_automaticamente=False)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    tempo_abertura = time.perf_counter() - inicio
+
+    with projeto:
+        estado = projeto.estado()
+        if args.comando == 'info':
+            tamanhos = projeto.tamanhos()
+            print(f"📄 {estado['dados'].get('titulo') or '(sem título)'}")
+            print(f"   {len(estado['conteudo'].split())} palavras no conteúdo, "
+                  f"{sum(1 for r in estado['referencias'].split(chr(10)) if r.strip())} referências")
+            print(f"   diário: estado {tamanhos['estado'] / 1024:.1f} KB + "
+                  f"alterações {tamanhos['alteracoes'] / 1024:.1f} KB (aberto em {tempo_abertura * 1000:.0f} ms)")
+            if projeto.registros_descartados:
+                print("   ⚠️ último salvamento incompleto descartado")
+        elif args.comando == 'compactar':
+            antes = os.path.getsize(args.projeto)
+            projeto.compactar()
+            print(f"✅ {args.projeto}: {antes / 1024:.1f} KB → {os.path.getsize(args.projeto) / 1024:.1f} KB")
+        else:
+            exportar_pacote(estado, args.pasta)
+            print(f"✅ Projeto exportado para {args.pasta}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
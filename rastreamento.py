@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Medição de desempenho da geração de documentos (etapas e contadores)
+
+Rastreador registra a duração de cada etapa (capa, resumo, sumário, seções,
+referências, salvar...) e contadores (parágrafos, trechos, citações conferidas e
+reescritas, bytes gravados).
+O resultado pode ser exportado em JSON ou no formato Chrome Trace (chrome://tracing,
+Perfetto).
+
+Desligado, o gerador usa RASTREADOR_NULO, cujas operações não fazem nada.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+
+class Rastreador:
+    """Coleta etapas (com duração) e contadores de uma geração"""
+
+    ativo = True
+
+    def __init__(self):
+        self._origem = time.perf_counter()
+        self.eventos = []
+        self.contadores = Counter()
+
+    @contextmanager
+    def etapa(self, nome, **detalhes):
+        """Mede a duração do bloco; etapas podem ser aninhadas"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.eventos.append({
+                'nome': nome,
+                'inicio_s': inicio - self._origem,
+                'duracao_s': time.perf_counter() - inicio,
+                'thread': threading.get_ident(),
+                'detalhes': detalhes
+            })
+
+    def contar(self, nome, quantidade=1):
+        """Incrementa um contador"""
+        self.contadores[nome] += quantidade
+
+    def resumo(self):
+        """Totais por etapa (duração somada e número de chamadas) e contadores"""
+        por_etapa = {}
+        for evento in self.eventos:
+            total = por_etapa.setdefault(evento['nome'], {'chamadas': 0, 'duracao_s': 0.0})
+            total['chamadas'] += 1
+            total['duracao_s'] += evento['duracao_s']
+
+        return {
+            'total_s': time.perf_counter() - self._origem,
+            'etapas': por_etapa,
+            'contadores': dict(self.contadores)
+        }
+
+    def exportar_json(self, caminho):
+        """Grava resumo e eventos em JSON"""
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(dict(self.resumo(), eventos=self.eventos), f, ensure_ascii=False, indent=2)
+
+    def exportar_chrome(self, caminho):
+        """Grava no formato Chrome Trace (eventos completos 'X' e contadores 'C')"""
+        pid = os.getpid()
+        eventos = [
+            {
+                'name': evento['nome'],
+                'cat': 'abnt',
+                'ph': 'X',
+                'ts': evento['inicio_s'] * 1e6,
+                'dur': evento['duracao_s'] * 1e6,
+                'pid': pid,
+                'tid': evento['thread'],
+                'args': evento['detalhes']
+            }
+            for evento in sorted(self.eventos, key=lambda e: e['inicio_s'])
+        ]
+        fim = max((e['ts'] + e['dur'] for e in eventos), default=0)
+        eventos.append({
+            'name': 'contadores', 'ph': 'C', 'ts': fim, 'pid': pid, 'tid': 0,
+            'args': dict(self.contadores)
+        })
+
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': eventos, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+
+
+class _RastreadorNulo:
+    """Rastreador desligado: nenhuma medição, custo de uma chamada vazia"""
+
+    ativo = False
+    _CONTEXTO = nullcontext()
+
+    def etapa(self, nome, **detalhes):
+        return self._CONTEXTO
+
+    def contar(self, nome, quantidade=1):
+        pass
+
+
+RASTREADOR_NULO = _RastreadorNulo()
+
+
+def descrever_rastreamento(rastreador, caminho=None, limite=5):
+    """Resumo legível: tempo total, etapas mais demoradas e contadores"""
+    resumo = rastreador.resumo()
+    linhas = [f"📊 Geração medida em {resumo['total_s']:.2f} s"]
+
+    etapas = sorted(resumo['etapas'].items(), key=lambda item: -item[1]['duracao_s'])
+    for nome, total in etapas[:limite]:
+        chamadas = f" ({total['chamadas']}x)" if total['chamadas'] > 1 else ""
+        linhas.append(f"   • {nome}{chamadas}: {total['duracao_s'] * 1000:.0f} ms")
+
+    if resumo['contadores']:
+        linhas.append("   " + ", ".join(f"{nome}: {valor}" for nome, valor in sorted(resumo['contadores'].items())))
+    if caminho:
+        linhas.append(f"   Trace: {caminho}")
+    return '\n'.join(linhas)
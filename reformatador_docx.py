@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reformatação ABNT de um .docx existente, preservando todo o conteúdo
+
+Em vez de extrair o texto e gerar o trabalho de novo (o que perde tabelas, imagens e
+notas de rodapé), o pacote é copiado parte a parte e só as partes XML de estilos,
+corpo e notas são alteradas, com consultas XPath sobre a árvore lxml (sem o modelo de
+objetos do python-docx):
+    - word/styles.xml: Arial 12 em todos os estilos; Normal vira o texto ABNT
+      (justificado, entrelinhas 1,5, recuo de 1,25 cm), títulos e notas seguem
+      motor_abnt.ESTILOS_ABNT; o estilo de citação longa é acrescentado
+    - word/document.xml: folha A4 e margens da NBR 14724 em todas as seções; nos
+      parágrafos de texto sai a formatação direta de fonte, tamanho, entrelinhas e
+      recuo; parágrafos recuados 3,5 cm ou mais viram citações longas (4 cm, fonte 10);
+      tabelas ficam em espaçamento simples, sem recuo de primeira linha
+    - word/footnotes.xml e word/endnotes.xml: sem fonte direta (estilo de nota)
+As demais partes (imagens, cabeçalhos, numeração, comentários...) são copiadas sem
+serem lidas.
+
+Uso:
+    python reformatador_docx.py tese.docx [outra.docx ...] [-o PASTA] [--compressao rapida]
+                                [--trace PASTA_TRACE]
+"""
+
+import argparse
+import os
+import sys
+import time
+import zipfile
+
+from lxml import etree
+
+from importador_docx import niveis_estilos
+from motor_abnt import (
+    COMPRESSAO_PADRAO, ESTILO_CITACAO_LONGA, ESTILO_TEXTO, ESTILO_TITULO_SECAO,
+    ESTILO_TITULO_SUBSECAO, ESTILOS_ABNT, FONTE_ABNT, PERFIS_COMPRESSAO, entrada_zip
+)
+from rastreamento import RASTREADOR_NULO, Rastreador
+
+
+NAMESPACE_W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+W = '{%s}' % NAMESPACE_W
+NS = {'w': NAMESPACE_W}
+
+PARTE_DOCUMENTO = 'word/document.xml'
+PARTE_ESTILOS = 'word/styles.xml'
+PARTES_NOTAS = ('word/footnotes.xml', 'word/endnotes.xml')
+
+# Folha A4 e margens da NBR 14724 (superior/esquerda 3 cm, inferior/direita 2 cm), em twips
+A4 = (11906, 16838)
+MARGENS = {'top': 1701, 'left': 1701, 'bottom': 1134, 'right': 1134}
+# Recuo esquerdo a partir do qual um parágrafo de texto é tratado como citação longa
+RECUO_CITACAO = 1985  # 3,5 cm
+
+# Estilos de nota e legenda (pelo nome, em minúsculas): fonte 10, espaçamento simples
+ESTILO_NOTA = {'tamanho': 10, 'alinhamento': 'justificado', 'entrelinhas': 1.0}
+NOMES_NOTAS = {'footnote text', 'endnote text', 'caption', 'texto de nota de rodapé', 'legenda'}
+
+# Ordem dos filhos de w:pPr e w:rPr exigida pelo esquema OOXML (o Word recusa fora dela)
+_ORDEM_PPR = (
+    'pStyle', 'keepNext', 'keepLines', 'pageBreakBefore', 'framePr', 'widowControl', 'numPr',
+    'suppressLineNumbers', 'pBdr', 'shd', 'tabs', 'suppressAutoHyphens', 'kinsoku',
+    'wordWrap', 'overflowPunct', 'topLinePunct', 'autoSpaceDE', 'autoSpaceDN', 'bidi',
+    'adjustRightInd', 'snapToGrid', 'spacing', 'ind', 'contextualSpacing', 'mirrorIndents',
+    'suppressOverlap', 'jc', 'textDirection', 'textAlignment', 'textboxTightWrap',
+    'outlineLvl', 'divId', 'cnfStyle', 'rPr', 'sectPr', 'pPrChange'
+)
+_ORDEM_RPR = (
+    'rStyle', 'rFonts', 'b', 'bCs', 'i', 'iCs', 'caps', 'smallCaps', 'strike', 'dstrike',
+    'outline', 'shadow', 'emboss', 'imprint', 'noProof', 'snapToGrid', 'vanish',
+    'webHidden', 'color', 'spacing', 'w', 'kern', 'position', 'sz', 'szCs', 'highlight',
+    'u', 'effect', 'bdr', 'shd', 'fitText', 'vertAlign', 'rtl', 'cs', 'em', 'lang',
+    'eastAsianLayout', 'specVanish', 'oMath'
+)
+_ORDEM_SECAO = (
+    'headerReference', 'footerReference', 'footnotePr', 'endnotePr', 'type', 'pgSz', 'pgMar',
+    'paperSrc', 'pgBorders', 'lnNumType', 'pgNumType', 'cols', 'formProt', 'vAlign',
+    'noEndnote', 'titlePg', 'textDirection', 'bidi', 'rtlGutter', 'docGrid',
+    'printerSettings', 'sectPrChange'
+)
+_ORDEM_ESTILO = (
+    'name', 'aliases', 'basedOn', 'next', 'link', 'autoRedefine', 'hidden', 'uiPriority',
+    'semiHidden', 'unhideWhenUsed', 'qFormat', 'locked', 'personal', 'personalCompose',
+    'personalReply', 'rsid', 'pPr', 'rPr', 'tblPr', 'trPr', 'tcPr', 'tblStylePr'
+)
+_ALINHAMENTOS = {'esquerda': 'left', 'centro': 'center', 'direita': 'right', 'justificado': 'both'}
+# Alinhamentos diretos que o texto ABNT substitui (centralizado e à direita são mantidos)
+_ALINHAMENTOS_TEXTO = ('left', 'start', 'both', 'distribute', 'justify')
+_ATRIBUTOS_TEMA = ('asciiTheme', 'hAnsiTheme', 'eastAsiaTheme', 'cstheme')
+
+
+def _twips(cm):
+    return str(round(cm * 1440 / 2.54))
+
+
+def _filho(pai, nome, ordem):
+    """Filho w:nome de pai, criado na posição exigida pelo esquema se ainda não existir"""
+    elemento = pai.find(W + nome)
+    if elemento is not None:
+        return elemento
+
+    elemento = etree.Element(W + nome)
+    posicao = ordem.index(nome)
+    for existente in pai:
+        local = etree.QName(existente).localname if isinstance(existente.tag, str) else None
+        if local in ordem and ordem.index(local) > posicao:
+            existente.addprevious(elemento)
+            return elemento
+    pai.append(elemento)
+    return elemento
+
+
+def _ppr(paragrafo):
+    """w:pPr do parágrafo (sempre o primeiro filho), criado se não existir"""
+    ppr = paragrafo.find(W + 'pPr')
+    if ppr is None:
+        ppr = etree.Element(W + 'pPr')
+        paragrafo.insert(0, ppr)
+    return ppr
+
+
+def _substituir(pai, nome, ordem, **atributos):
+    """Troca o filho w:nome de pai por um novo com os atributos dados"""
+    antigo = pai.find(W + nome)
+    if antigo is not None:
+        pai.remove(antigo)
+    elemento = _filho(pai, nome, ordem)
+    for atributo, valor in atributos.items():
+        elemento.set(W + atributo, valor)
+    return elemento
+
+
+def _remover(elementos):
+    for elemento in elementos:
+        elemento.getparent().remove(elemento)
+
+
+def _fonte_abnt(rfonts):
+    """Arial em todos os alfabetos; atributos de tema têm precedência e são removidos"""
+    for atributo in _ATRIBUTOS_TEMA:
+        rfonts.attrib.pop(W + atributo, None)
+    for atributo in ('ascii', 'hAnsi', 'eastAsia', 'cs'):
+        rfonts.set(W + atributo, FONTE_ABNT)
+
+
+def _aplicar_definicao(estilo, definicao):
+    """Aplica a um w:style (ou w:pPr/w:rPr padrão) uma definição no formato de ESTILOS_ABNT"""
+    ppr = _filho(estilo, 'pPr', _ORDEM_ESTILO)
+    rpr = _filho(estilo, 'rPr', _ORDEM_ESTILO)
+
+    if definicao.get('manter_com_proximo'):
+        _filho(ppr, 'keepNext', _ORDEM_PPR)
+    _substituir(
+        ppr, 'spacing', _ORDEM_PPR,
+        before=str(definicao.get('espaco_antes', 0) * 20),
+        after=str(definicao.get('espaco_depois', 0) * 20),
+        line=str(round(240 * definicao['entrelinhas'])), lineRule='auto'
+    )
+    recuo = definicao.get('recuo_primeira_linha', 0)
+    _substituir(
+        ppr, 'ind', _ORDEM_PPR,
+        left=_twips(definicao.get('recuo_esquerdo', 0)),
+        **({'hanging': _twips(-recuo)} if recuo < 0 else {'firstLine': _twips(recuo)})
+    )
+    _substituir(ppr, 'jc', _ORDEM_PPR, val=_ALINHAMENTOS[definicao['alinhamento']])
+
+    _fonte_abnt(_filho(rpr, 'rFonts', _ORDEM_RPR))
+    tamanho = str(definicao['tamanho'] * 2)
+    _substituir(rpr, 'sz', _ORDEM_RPR, val=tamanho)
+    _substituir(rpr, 'szCs', _ORDEM_RPR, val=tamanho)
+    if definicao.get('negrito'):
+        _substituir(rpr, 'b', _ORDEM_RPR)
+        _substituir(rpr, 'bCs', _ORDEM_RPR)
+
+
+def _novo_estilo(nome, definicao, base):
+    """w:style de parágrafo a partir de uma definição de ESTILOS_ABNT, baseado em base"""
+    estilo = etree.Element(W + 'style', {W + 'type': 'paragraph', W + 'customStyle': '1',
+                                         W + 'styleId': definicao['id']})
+    etree.SubElement(estilo, W + 'name', {W + 'val': nome})
+    if base:
+        etree.SubElement(estilo, W + 'basedOn', {W + 'val': base})
+    etree.SubElement(estilo, W + 'qFormat')
+    _aplicar_definicao(estilo, definicao)
+    return estilo
+
+
+def reformatar_estilos(raiz, niveis):
+    """
+    Estilos ABNT em word/styles.xml
+    niveis: id de estilo -> nível de título (importador_docx.niveis_estilos)
+    Retorna o id do estilo Normal (padrão de parágrafo)
+    """
+    # Padrões do documento: Arial 12, sem espaço entre parágrafos
+    padroes = raiz.find(W + 'docDefaults')
+    if padroes is None:
+        padroes = etree.Element(W + 'docDefaults')
+        raiz.insert(0, padroes)
+    rpr = _filho(_filho(padroes, 'rPrDefault', ('rPrDefault', 'pPrDefault')), 'rPr', ('rPr',))
+    _fonte_abnt(_filho(rpr, 'rFonts', _ORDEM_RPR))
+    _substituir(rpr, 'sz', _ORDEM_RPR, val='24')
+    _substituir(rpr, 'szCs', _ORDEM_RPR, val='24')
+    ppr = _filho(_filho(padroes, 'pPrDefault', ('rPrDefault', 'pPrDefault')), 'pPr', ('pPr',))
+    _substituir(ppr, 'spacing', _ORDEM_PPR, after='0', line='240', lineRule='auto')
+
+    # Arial em todos os estilos que definem fonte própria
+    for rfonts in raiz.xpath('w:style/w:rPr/w:rFonts', namespaces=NS):
+        _fonte_abnt(rfonts)
+
+    normal = None
+    for estilo in raiz.xpath('w:style[@w:type="paragraph"]', namespaces=NS):
+        id_estilo = estilo.get(W + 'styleId')
+        nome = estilo.find(W + 'name')
+        nome = nome.get(W + 'val', '').lower() if nome is not None else ''
+
+        if estilo.get(W + 'default') in ('1', 'true', 'on'):
+            normal = id_estilo
+            _aplicar_definicao(estilo, ESTILOS_ABNT[ESTILO_TEXTO])
+        elif id_estilo in niveis:
+            nivel_titulo = ESTILO_TITULO_SECAO if niveis[id_estilo] == 1 else ESTILO_TITULO_SUBSECAO
+            _aplicar_definicao(estilo, ESTILOS_ABNT[nivel_titulo])
+            # Títulos em preto, sem itálico (os modelos do Word usam cor de tema)
+            _remover(estilo.xpath('w:rPr/w:color | w:rPr/w:i | w:rPr/w:iCs', namespaces=NS))
+        elif nome in NOMES_NOTAS:
+            _aplicar_definicao(estilo, ESTILO_NOTA)
+
+    citacao = ESTILOS_ABNT[ESTILO_CITACAO_LONGA]
+    if not raiz.xpath('w:style[@w:styleId=$id]', namespaces=NS, id=citacao['id']):
+        raiz.append(_novo_estilo(ESTILO_CITACAO_LONGA, citacao, normal))
+    return normal
+
+
+def _secao_abnt(sect_pr):
+    """Folha A4 (mantendo a orientação) e margens ABNT em um w:sectPr"""
+    tamanho = _filho(sect_pr, 'pgSz', _ORDEM_SECAO)
+    largura, altura = A4
+    if tamanho.get(W + 'orient') == 'landscape':
+        largura, altura = altura, largura
+    tamanho.set(W + 'w', str(largura))
+    tamanho.set(W + 'h', str(altura))
+
+    margens = _filho(sect_pr, 'pgMar', _ORDEM_SECAO)
+    for lado, valor in MARGENS.items():
+        margens.set(W + lado, str(valor))
+    margens.set(W + 'gutter', '0')
+    for lado in ('header', 'footer'):
+        if margens.get(W + lado) is None:
+            margens.set(W + lado, '709')
+
+
+def reformatar_corpo(raiz, normal):
+    """
+    Margens e formatação de texto ABNT em word/document.xml
+    normal: id do estilo Normal (parágrafos com ele, ou sem estilo, são texto)
+    Retorna contagens das alterações
+    """
+    secoes = raiz.xpath('//w:sectPr', namespaces=NS)
+    for sect_pr in secoes:
+        _secao_abnt(sect_pr)
+
+    # Fonte: Arial em tudo (formatação direta de fonte sai de todos os trechos)
+    _remover(raiz.xpath('//w:rPr/w:rFonts', namespaces=NS))
+
+    # Tabelas: espaçamento simples e sem recuo de primeira linha; os tamanhos são mantidos
+    celulas = raiz.xpath('//w:tbl//w:p', namespaces=NS)
+    for paragrafo in celulas:
+        ppr = _ppr(paragrafo)
+        _substituir(ppr, 'spacing', _ORDEM_PPR, before='0', after='0', line='240', lineRule='auto')
+        ind = _filho(ppr, 'ind', _ORDEM_PPR)
+        ind.attrib.pop(W + 'hanging', None)
+        ind.set(W + 'firstLine', '0')
+
+    # Fora das tabelas, o tamanho vem dos estilos
+    # (filtrar os w:rPr, e não partir de //w:p: a união de descendentes cresce mais que linearmente)
+    _remover(raiz.xpath('//w:rPr/*[self::w:sz or self::w:szCs][not(ancestor::w:tbl)]',
+                        namespaces=NS))
+
+    # Parágrafos de texto: filhos do corpo (ou de um controle de conteúdo no corpo), logo
+    # fora de tabelas e caixas de texto, com estilo Normal ou nenhum
+    # Cada seleção é uma única consulta; o Python só percorre o que muda
+    texto = ('(/w:document/w:body | /w:document/w:body/w:sdt/w:sdtContent)/w:p'
+             '[not(w:pPr/w:pStyle) or w:pPr/w:pStyle/@w:val=$normal]')
+    variaveis = {'namespaces': NS, 'normal': normal or '', 'recuo': RECUO_CITACAO}
+    paragrafos = int(raiz.xpath(f'count({texto})', **variaveis))
+    figuras = raiz.xpath(texto + '[.//w:drawing or .//w:pict]', **variaveis)
+    citacoes = raiz.xpath(texto + '[w:pPr/w:ind[@w:left >= $recuo or @w:start >= $recuo]]',
+                          **variaveis)
+
+    # Sem entrelinhas, recuo e alinhamento diretos (centralizado e à direita ficam)
+    alinhamentos = ' or '.join(f'@w:val="{valor}"' for valor in _ALINHAMENTOS_TEXTO)
+    _remover(raiz.xpath(
+        texto + '[not(.//w:drawing or .//w:pict)]/w:pPr/'
+        f'*[self::w:spacing or self::w:ind or self::w:jc[{alinhamentos}]]',
+        **variaveis
+    ))
+
+    id_citacao = ESTILOS_ABNT[ESTILO_CITACAO_LONGA]['id']
+    for paragrafo in citacoes:
+        _substituir(_ppr(paragrafo), 'pStyle', _ORDEM_PPR, val=id_citacao)
+
+    # Figuras: sem o recuo de primeira linha do texto
+    for paragrafo in figuras:
+        ind = _filho(_ppr(paragrafo), 'ind', _ORDEM_PPR)
+        ind.attrib.pop(W + 'hanging', None)
+        ind.set(W + 'firstLine', '0')
+
+    return {
+        'secoes': len(secoes),
+        'paragrafos': paragrafos,
+        'citacoes_longas': len(citacoes),
+        'figuras': len(figuras),
+        'paragrafos_tabelas': len(celulas),
+    }
+
+
+def reformatar_notas(raiz):
+    """Notas de rodapé/fim: fonte e tamanho vêm do estilo de nota"""
+    _remover(raiz.xpath('//w:rPr/*[self::w:rFonts or self::w:sz or self::w:szCs]', namespaces=NS))
+
+
+def _serializar(raiz):
+    return etree.tostring(raiz, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def reformatar_docx(origem, destino, compressao=COMPRESSAO_PADRAO, rastreador=RASTREADOR_NULO):
+    """
+    Aplica a formatação ABNT a um .docx existente e grava o resultado em destino
+    origem, destino: caminhos ou fluxos binários (destino pode ser o mesmo arquivo
+    apenas se for gravado em um temporário antes)
+    compressao: perfil de motor_abnt.PERFIS_COMPRESSAO para as partes alteradas; as
+    demais são copiadas com a compressão original
+    rastreador: rastreamento.Rastreador opcional; mede as etapas e conta as alterações
+    Retorna contagens das alterações
+    """
+    parser = etree.XMLParser(huge_tree=True, remove_blank_text=False)
+    medir = rastreador.etapa
+
+    with zipfile.ZipFile(origem) as pacote:
+        nomes = set(pacote.namelist())
+        niveis = niveis_estilos(pacote)
+
+        partes = {}
+        normal = None
+        if PARTE_ESTILOS in nomes:
+            with medir('Estilos'):
+                estilos = etree.fromstring(pacote.read(PARTE_ESTILOS), parser)
+                normal = reformatar_estilos(estilos, niveis)
+                partes[PARTE_ESTILOS] = _serializar(estilos)
+
+        with medir('Corpo'):
+            documento = etree.fromstring(pacote.read(PARTE_DOCUMENTO), parser)
+            resultado = reformatar_corpo(documento, normal)
+            partes[PARTE_DOCUMENTO] = _serializar(documento)
+
+        for nome in PARTES_NOTAS:
+            if nome in nomes:
+                with medir('Notas', parte=nome):
+                    notas = etree.fromstring(pacote.read(nome), parser)
+                    reformatar_notas(notas)
+                    partes[nome] = _serializar(notas)
+
+        for contador, quantidade in resultado.items():
+            rastreador.contar(contador, quantidade)
+
+        with medir('Salvar', compressao=compressao), zipfile.ZipFile(destino, 'w') as saida:
+            for info in pacote.infolist():
+                if info.filename in partes:
+                    entrada, nivel = entrada_zip(info.filename, compressao)
+                    saida.writestr(entrada, partes[info.filename], compress_type=entrada.compress_type,
+                                   compresslevel=nivel)
+                else:
+                    saida.writestr(info, pacote.read(info))
+
+    return resultado
+
+
+def caminho_saida(origem, pasta=None):
+    """tese.docx -> tese_abnt.docx (na mesma pasta ou em pasta)"""
+    base, _ = os.path.splitext(os.path.basename(origem))
+    return os.path.join(pasta or os.path.dirname(os.path.abspath(origem)), f"{base}_abnt.docx")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('arquivos', nargs='+', help="documentos .docx a reformatar")
+    parser.add_argument('-o', '--saida', help="pasta de saída (padrão: ao lado de cada original)")
+    parser.add_argument('--compressao', choices=list(PERFIS_COMPRESSAO), default=COMPRESSAO_PADRAO)
+    parser.add_argument('--trace', metavar='PASTA',
+                        help="mede as etapas de cada documento e grava os traces (Chrome Trace) na pasta")
+    args = parser.parse_args(argv)
+
+    for pasta in (args.saida, args.trace):
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+    falhas = 0
+    for origem in args.arquivos:
+        destino = caminho_saida(origem, args.saida)
+        inicio = time.perf_counter()
+        rastreador = Rastreador() if args.trace else RASTREADOR_NULO
+        try:
+            resultado = reformatar_docx(origem, destino, args.compressao, rastreador)
+        except (OSError, KeyError, zipfile.BadZipFile, etree.XMLSyntaxError) as e:
+            print(f"❌ {origem}: {e}")
+            falhas += 1
+            continue
+        print(f"✅ {destino} ({time.perf_counter() - inicio:.2f}s): "
+              f"{resultado['paragrafos']} parágrafos de texto, "
+              f"{resultado['citacoes_longas']} citações longas, "
+              f"{resultado['paragrafos_tabelas']} parágrafos em tabelas, "
+              f"{resultado['secoes']} seções")
+        if rastreador.ativo:
+            base, _ = os.path.splitext(os.path.basename(destino))
+            rastreador.exportar_chrome(os.path.join(args.trace, f"{base}.trace.json"))
+
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
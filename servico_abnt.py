@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serviço HTTP local do Formatador ABNT (somente biblioteca padrão + motor)
+
+Recebe um trabalho em JSON e devolve o .docx ou o PDF gerado (com --cache, trabalhos já
+renderizados são devolvidos do cache_renderizacao sem ocupar o pool). A renderização roda num pool
+limitado de processos; as requisições além da capacidade aguardam numa fila de
+tamanho fixo e, com a fila cheia, são recusadas com 503 (o cliente tenta de novo
+depois de Retry-After). Cada requisição tem um tempo limite.
+
+Endpoints:
+    POST /documento   corpo JSON: {"dados": {...}, "resumo": "", "palavras_chave": "",
+                      "conteudo": "", "referencias": "", "formatar_citacoes": true,
+                      "compressao": "padrao", "formato": "docx"}
+                      resposta: o .docx ou o PDF (200), 400/413/414/431 entrada inválida, 503 fila cheia,
+                      504 tempo esgotado
+    GET  /saude       {"status": "ok"}
+    GET  /metricas    contadores, fila, processos ocupados e latências
+
+Uso:
+    python servico_abnt.py [--host 127.0.0.1] [--porta 8765] [-j PROCESSOS]
+                           [--fila 16] [--tempo-limite 60] [--cache PASTA] [--cache-mb 256]
+                           [--compressao {armazenado,rapida,padrao,maxima}] [--trace PASTA_TRACE]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+import traceback
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+
+from cache_renderizacao import LIMITE_PADRAO_MB, CacheRenderizacao, chave_renderizacao
+from motor_abnt import COMPRESSAO_PADRAO, PERFIS_COMPRESSAO
+
+
+TIPO_DOCX = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+# Formatos de saída e seus tipos MIME
+FORMATOS = {'docx': TIPO_DOCX, 'pdf': 'application/pdf'}
+CAMPOS_TEXTO = ('resumo', 'palavras_chave', 'conteudo', 'referencias')
+
+TAMANHO_MAXIMO_CORPO = 20 * 1024 * 1024
+MAXIMO_CABECALHOS = 100
+# Tempo para o cliente enviar a requisição completa
+TEMPO_LEITURA_S = 30
+# Latências mantidas para os percentis de /metricas
+AMOSTRAS_LATENCIA = 1000
+
+
+class ErroRequisicao(Exception):
+    """Requisição inválida; respondida com o status informado"""
+
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+
+def _aquecer():
+    """Inicialização de cada processo: carrega o python-docx e o modelo ABNT uma única vez"""
+    from motor_abnt import GeradorDocumentoABNT
+    GeradorDocumentoABNT()
+
+
+async def _ler_linha(reader, status, mensagem):
+    """Uma linha da requisição; acima do limite do StreamReader (64 KB) responde com status"""
+    try:
+        return await reader.readline()
+    except ValueError:
+        # readline converte o LimitOverrunError em ValueError
+        raise ErroRequisicao(status, mensagem)
+
+
+def renderizar_documento(entrada, caminho_trace=None):
+    """
+    Gera o .docx (ou o PDF) de um trabalho validado (executado no processo de trabalho)
+    caminho_trace: mede as etapas e grava o trace (Chrome Trace) nesse arquivo
+    """
+    from motor_abnt import gerar_trabalho
+    from pdf_abnt import GeradorPDF
+    from rastreamento import Rastreador
+
+    rastreador = Rastreador() if caminho_trace else None
+    gerador = gerar_trabalho(
+        entrada['dados'],
+        resumo=entrada['resumo'],
+        palavras_chave=entrada['palavras_chave'],
+        conteudo=entrada['conteudo'],
+        referencias=entrada['referencias'],
+        gerador=GeradorPDF() if entrada['formato'] == 'pdf' else None,
+        formatar_citacoes=entrada['formatar_citacoes'],
+        rastreador=rastreador
+    )
+    documento = gerador.salvar(compressao=entrada['compressao'])
+    if rastreador is not None:
+        rastreador.exportar_chrome(caminho_trace)
+    return documento
+
+
+def validar_entrada(corpo, compressao=COMPRESSAO_PADRAO):
+    """
+    Converte o corpo JSON na entrada de renderizar_documento; levanta ErroRequisicao
+    compressao: perfil usado quando a requisição não informa um
+    """
+    try:
+        entrada = json.loads(corpo)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ErroRequisicao(HTTPStatus.BAD_REQUEST, f"JSON inválido: {e}")
+
+    if not isinstance(entrada, dict):
+        raise ErroRequisicao(HTTPStatus.BAD_REQUEST, "o corpo deve ser um objeto JSON")
+    if not isinstance(entrada.get('dados'), dict):
+        raise ErroRequisicao(HTTPStatus.BAD_REQUEST, "'dados' deve ser um objeto JSON")
+
+    validada = {
+        'dados': {chave: str(valor) for chave, valor in entrada['dados'].items()},
+        'formatar_citacoes': bool(entrada.get('formatar_citacoes', True)),
+        'compressao': entrada.get('compressao', compressao),
+        'formato': entrada.get('formato', 'docx')
+    }
+    if not isinstance(validada['compressao'], str) or validada['compressao'] not in PERFIS_COMPRESSAO:
+        raise ErroRequisicao(
+            HTTPStatus.BAD_REQUEST, f"'compressao' deve ser um de: {', '.join(PERFIS_COMPRESSAO)}"
+        )
+    if not isinstance(validada['formato'], str) or validada['formato'] not in FORMATOS:
+        raise ErroRequisicao(HTTPStatus.BAD_REQUEST, f"'formato' deve ser um de: {', '.join(FORMATOS)}")
+    for campo in CAMPOS_TEXTO:
+        valor = entrada.get(campo, '')
+        if not isinstance(valor, str):
+            raise ErroRequisicao(HTTPStatus.BAD_REQUEST, f"'{campo}' deve ser texto")
+        validada[campo] = valor
+    return validada
+
+
+class ServicoABNT:
+    """
+    Servidor HTTP assíncrono com pool de processos para a renderização
+    processos: tamanho do pool; limite_fila: requisições aguardando além das em execução
+    tempo_limite: segundos até a resposta 504
+    cache: CacheRenderizacao opcional
+    compressao: perfil de compressão das requisições que não informam um
+    pasta_trace: mede cada renderização e grava os traces (Chrome Trace) nessa pasta
+    """
+
+    def __init__(self, processos=None, limite_fila=16, tempo_limite=60.0, cache=None,
+                 compressao=COMPRESSAO_PADRAO, pasta_trace=None):
+        self.processos = processos or os.cpu_count()
+        self.limite_fila = limite_fila
+        self.tempo_limite = tempo_limite
+        self.cache = cache
+        self.compressao = compressao
+        self.pasta_trace = pasta_trace
+        self._traces = 0
+
+        self._pool = None
+        self._trava_pool = None
+        self._servidor = None
+        # Renderizações aceitas e ainda ocupando o pool (inclui as que esgotaram o tempo
+        # mas continuam rodando no processo), para que a fila reflita a carga real
+        self._pendentes = 0
+        self._inicio = time.monotonic()
+        self._contadores = Counter()
+        self._latencias = deque(maxlen=AMOSTRAS_LATENCIA)
+
+    async def iniciar(self, host='127.0.0.1', porta=8765):
+        """Cria o pool e começa a aceitar conexões; retorna (host, porta) efetivos"""
+        self._trava_pool = asyncio.Lock()
+        self._pool = await self._criar_pool()
+        self._servidor = await asyncio.start_server(self._atender, host, porta)
+        return self._servidor.sockets[0].getsockname()[:2]
+
+    async def _criar_pool(self):
+        """
+        Pool de processos já iniciados (e aquecidos)
+        Com forkserver, onde existe, os processos não herdam os sockets abertos do servidor:
+        criados por fork (no primeiro submit ou ao recriar o pool), herdariam o socket das
+        conexões em andamento, e esses clientes nunca receberiam o EOF
+        """
+        metodo = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else None
+        pool = ProcessPoolExecutor(max_workers=self.processos, initializer=_aquecer,
+                                   mp_context=multiprocessing.get_context(metodo))
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(pool, _aquecer) for _ in range(self.processos)))
+        return pool
+
+    async def _recriar_pool(self, quebrado):
+        """Troca o pool quebrado (processo encerrado à força) por um novo, uma única vez"""
+        async with self._trava_pool:
+            if self._pool is not quebrado:
+                return
+            quebrado.shutdown(wait=False, cancel_futures=True)
+            self._pool = await self._criar_pool()
+
+    async def _submeter(self, entrada):
+        """
+        Envia a renderização ao pool (recriando-o se estiver quebrado) e ocupa uma vaga
+        A vaga só é liberada quando o processo termina: cancel() não interrompe uma
+        renderização em andamento, que continua ocupando o processo após o 504
+        """
+        loop = asyncio.get_running_loop()
+        caminho_trace = None
+        if self.pasta_trace:
+            self._traces += 1
+            caminho_trace = os.path.join(
+                self.pasta_trace, f"{time.strftime('%Y%m%d-%H%M%S')}-{self._traces:06d}.trace.json"
+            )
+
+        pool = self._pool
+        try:
+            futuro = pool.submit(renderizar_documento, entrada, caminho_trace)
+        except BrokenProcessPool:
+            await self._recriar_pool(pool)
+            futuro = self._pool.submit(renderizar_documento, entrada, caminho_trace)
+
+        self._pendentes += 1
+        futuro.add_done_callback(lambda _: loop.call_soon_threadsafe(self._liberar))
+        return futuro
+
+    async def servir(self):
+        """Atende até ser cancelado"""
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    async def encerrar(self):
+        """Para de aceitar conexões e encerra o pool (renderizações na fila são canceladas)"""
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def metricas(self):
+        """Contadores, ocupação e latências (s) das renderizações concluídas"""
+        latencias = sorted(self._latencias)
+
+        def percentil(p):
+            return round(latencias[min(int(len(latencias) * p), len(latencias) - 1)], 4) if latencias else None
+
+        return {
+            'ativo_s': round(time.monotonic() - self._inicio, 1),
+            'processos': self.processos,
+            'em_execucao': min(self._pendentes, self.processos),
+            'na_fila': max(self._pendentes - self.processos, 0),
+            'limite_fila': self.limite_fila,
+            'requisicoes': dict(self._contadores),
+            'latencia_s': {'p50': percentil(0.5), 'p95': percentil(0.95), 'amostras': len(latencias)},
+            'cache': self.cache.estatisticas() if self.cache is not None else None
+        }
+
+    async def _atender(self, reader, writer):
+        """Uma requisição por conexão"""
+        try:
+            try:
+                metodo, caminho, corpo = await asyncio.wait_for(self._ler_requisicao(reader), TEMPO_LEITURA_S)
+                status, tipo, resposta, extras = await self._rotear(metodo, caminho, corpo)
+            except ErroRequisicao as e:
+                status, tipo, resposta, extras = self._erro(e.status, str(e))
+            except asyncio.TimeoutError:
+                status, tipo, resposta, extras = self._erro(HTTPStatus.REQUEST_TIMEOUT, "requisição incompleta")
+            except (ConnectionError, asyncio.IncompleteReadError):
+                raise
+            except Exception:
+                # Último recurso: a conexão nunca é fechada sem resposta
+                traceback.print_exc()
+                status, tipo, resposta, extras = self._erro(HTTPStatus.INTERNAL_SERVER_ERROR, "erro interno")
+
+            self._contadores[str(int(status))] += 1
+            await self._responder(writer, status, tipo, resposta, extras)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _ler_requisicao(reader):
+        """Linha de requisição, cabeçalhos e corpo (Content-Length)"""
+        linha = (await _ler_linha(reader, HTTPStatus.REQUEST_URI_TOO_LONG,
+                                  "linha de requisição longa demais")).decode('latin-1').split()
+        if len(linha) != 3:
+            raise ErroRequisicao(HTTPStatus.BAD_REQUEST, "linha de requisição inválida")
+        metodo, caminho, _ = linha
+
+        cabecalhos = {}
+        while True:
+            cabecalho = await _ler_linha(reader, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                         "cabeçalho longo demais")
+            if cabecalho in (b'\r\n', b'\n', b''):
+                break
+            if len(cabecalhos) >= MAXIMO_CABECALHOS:
+                raise ErroRequisicao(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "cabeçalhos demais")
+            nome, _, valor = cabecalho.decode('latin-1').partition(':')
+            cabecalhos[nome.strip().lower()] = valor.strip()
+
+        # Só dígitos: int() aceitaria "-5", "+5" e "1_000"
+        comprimento = cabecalhos.get('content-length', '0')
+        if not (comprimento.isascii() and comprimento.isdigit()):
+            raise ErroRequisicao(HTTPStatus.BAD_REQUEST, "Content-Length inválido")
+        tamanho = int(comprimento)
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            raise ErroRequisicao(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                 f"corpo maior que {TAMANHO_MAXIMO_CORPO // (1024 * 1024)} MB")
+
+        corpo = await reader.readexactly(tamanho) if tamanho else b''
+        return metodo, caminho.split('?', 1)[0], corpo
+
+    async def _rotear(self, metodo, caminho, corpo):
+        rotas = {
+            '/documento': ('POST', self._documento),
+            '/saude': ('GET', self._saude),
+            '/metricas': ('GET', self._metricas)
+        }
+        if caminho not in rotas:
+            raise ErroRequisicao(HTTPStatus.NOT_FOUND, f"caminho desconhecido: {caminho}")
+
+        metodo_esperado, funcao = rotas[caminho]
+        if metodo != metodo_esperado:
+            status, tipo, resposta, extras = self._erro(HTTPStatus.METHOD_NOT_ALLOWED, f"use {metodo_esperado}")
+            extras['Allow'] = metodo_esperado
+            return status, tipo, resposta, extras
+        return await funcao(corpo)
+
+    async def _saude(self, corpo):
+        return self._json(HTTPStatus.OK, {'status': 'ok'})
+
+    async def _metricas(self, corpo):
+        return self._json(HTTPStatus.OK, self.metricas())
+
+    async def _documento(self, corpo):
+        """Valida, enfileira no pool e aguarda a renderização (com tempo limite)"""
+        entrada = validar_entrada(corpo, self.compressao)
+        tipo = FORMATOS[entrada['formato']]
+        loop = asyncio.get_running_loop()
+
+        # Hash e leitura do disco fora do laço de eventos
+        if self.cache is not None:
+            chave = await loop.run_in_executor(None, lambda: chave_renderizacao(
+                entrada['dados'], entrada['resumo'], entrada['palavras_chave'],
+                entrada['conteudo'], entrada['referencias'],
+                formatar_citacoes=entrada['formatar_citacoes'], compressao=entrada['compressao'],
+                formato=entrada['formato']
+            ))
+            documento = await loop.run_in_executor(None, self.cache.obter, chave)
+            if documento is not None:
+                return HTTPStatus.OK, tipo, documento, {'X-Cache': 'acerto'}
+
+        # Contrapressão: pool ocupado e fila cheia
+        if self._pendentes >= self.processos + self.limite_fila:
+            status, tipo, resposta, extras = self._erro(HTTPStatus.SERVICE_UNAVAILABLE, "fila cheia")
+            extras['Retry-After'] = '1'
+            return status, tipo, resposta, extras
+
+        inicio = time.perf_counter()
+        pool = self._pool
+        futuro = await self._submeter(entrada)
+
+        try:
+            documento = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(futuro)), self.tempo_limite)
+        except asyncio.TimeoutError:
+            # Só desiste se ainda estiver na fila; em andamento, segue até terminar
+            futuro.cancel()
+            return self._erro(HTTPStatus.GATEWAY_TIMEOUT, f"renderização excedeu {self.tempo_limite:g}s")
+        except BrokenProcessPool as e:
+            await self._recriar_pool(pool)
+            return self._erro(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(e).__name__}: {e}")
+        except Exception as e:
+            return self._erro(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(e).__name__}: {e}")
+
+        self._latencias.append(time.perf_counter() - inicio)
+        if self.cache is None:
+            return HTTPStatus.OK, tipo, documento, {}
+
+        await loop.run_in_executor(None, self.cache.guardar, chave, documento)
+        return HTTPStatus.OK, tipo, documento, {'X-Cache': 'falha'}
+
+    def _liberar(self):
+        self._pendentes -= 1
+
+    @staticmethod
+    def _json(status, objeto):
+        return status, 'application/json; charset=utf-8', json.dumps(objeto, ensure_ascii=False).encode('utf-8'), {}
+
+    def _erro(self, status, mensagem):
+        return self._json(status, {'erro': mensagem})
+
+    @staticmethod
+    async def _responder(writer, status, tipo, corpo, extras):
+        cabecalhos = [
+            f"HTTP/1.1 {int(status)} {status.phrase}",
+            f"Content-Type: {tipo}",
+            f"Content-Length: {len(corpo)}",
+            "Connection: close",
+        ]
+        cabecalhos += [f"{nome}: {valor}" for nome, valor in extras.items()]
+        writer.write(('\r\n'.join(cabecalhos) + '\r\n\r\n').encode('latin-1') + corpo)
+        await writer.drain()
+
+
+async def _executar(args):
+    cache = CacheRenderizacao(args.cache, args.cache_mb) if args.cache else None
+    servico = ServicoABNT(processos=args.processos, limite_fila=args.fila, tempo_limite=args.tempo_limite,
+                          cache=cache, compressao=args.compressao, pasta_trace=args.trace)
+    if args.trace:
+        os.makedirs(args.trace, exist_ok=True)
+    host, porta = await servico.iniciar(args.host, args.porta)
+    print(f"🚀 Formatador ABNT em http://{host}:{porta} ({servico.processos} processos, fila de {args.fila})",
+          flush=True)
+
+    # SIGTERM/SIGINT encerram o serviço de forma ordenada (onde o sistema permite)
+    tarefa = asyncio.current_task()
+    loop = asyncio.get_running_loop()
+    for sinal in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sinal, tarefa.cancel)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    try:
+        await servico.servir()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await servico.encerrar()
+        print("👋 Serviço encerrado", flush=True)
+
+
+def main(argv=None):
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Serviço HTTP local do Formatador ABNT")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8765, help="0 escolhe uma porta livre")
+    parser.add_argument('-j', '--processos', type=int, default=None,
+                        help="processos de renderização (padrão: todos os núcleos)")
+    parser.add_argument('--fila', type=int, default=16,
+                        help="requisições em espera além das em execução (padrão: 16)")
+    parser.add_argument('--tempo-limite', type=float, default=60.0,
+                        help="segundos por requisição antes de responder 504 (padrão: 60)")
+    parser.add_argument('--cache', metavar='PASTA', help="devolve do cache trabalhos já renderizados")
+    parser.add_argument('--cache-mb', type=float, default=LIMITE_PADRAO_MB,
+                        help=f"tamanho máximo do cache em MB (padrão: {LIMITE_PADRAO_MB})")
+    parser.add_argument('--compressao', choices=PERFIS_COMPRESSAO, default=COMPRESSAO_PADRAO,
+                        help="compressão padrão do .docx: armazenado (mais rápido, maior) a maxima "
+                             f"(mais lento, menor); padrão: {COMPRESSAO_PADRAO}")
+    parser.add_argument('--trace', metavar='PASTA',
+                        help="mede cada renderização e grava os traces (Chrome Trace) na pasta")
+    args = parser.parse_args(argv)
+
+    asyncio.run(_executar(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+Conferência entre citações e referências (conferencia_citacoes.conferir_citacoes)
+"""
+
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from conferencia_citacoes import conferir_citacoes  # noqa: E402
+
+REFERENCIAS = "\n".join([
+    "SILVA, João. Livro. 2. ed. São Paulo: Atlas, 2018.",
+    "SOUZA, Maria. Artigo online. Revista X, v. 2, 2019. "
+    "Disponível em: http://x.org. Acesso em: 10 jan. 2024.",
+])
+
+
+def test_citacoes_conferem():
+    resultado = conferir_citacoes("Segundo (SILVA, 2018, p. 10), o tema. Souza (2019) concorda.", REFERENCIAS)
+    assert resultado['citacoes'] == 2
+    assert resultado['sem_referencia'] == []
+    assert resultado['nao_citadas'] == []
+
+
+def test_referencia_online_com_data_de_acesso():
+    resultado = conferir_citacoes("Segundo (SOUZA, 2019), o tema é relevante.", REFERENCIAS.splitlines()[1])
+    assert resultado['sem_referencia'] == []
+    assert resultado['nao_citadas'] == []
+
+
+def test_data_de_acesso_nao_e_ano_da_obra():
+    resultado = conferir_citacoes("Segundo (SOUZA, 2024), o tema é relevante.", REFERENCIAS.splitlines()[1])
+    assert len(resultado['sem_referencia']) == 1
+    assert len(resultado['nao_citadas']) == 1
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+Importação de .docx (importador_docx) até a árvore de seções (estrutura_abnt)
+"""
+
+import os
+import sys
+
+import docx
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from estrutura_abnt import analisar_conteudo, percorrer_secoes, verificar_estrutura  # noqa: E402
+from importador_docx import texto_para_conteudo  # noqa: E402
+
+
+def test_titulos_importados_viram_secoes(tmp_path):
+    documento = docx.Document()
+    documento.add_heading('Introdução: contexto da COVID-19', 1)
+    documento.add_paragraph('Texto da introdução.')
+    documento.add_heading('Objetivos', 2)
+    documento.add_paragraph('Texto dos objetivos.')
+    documento.add_heading('Metodologia (2020-2021)', 1)
+    documento.add_paragraph('Texto da metodologia.')
+    caminho = str(tmp_path / 'trabalho.docx')
+    documento.save(caminho)
+
+    raiz = analisar_conteudo(texto_para_conteudo(caminho))
+
+    assert raiz[3] == ()
+    assert [(s[0], s[1], s[2]) for s in percorrer_secoes(raiz)] == [
+        ('1', 'INTRODUÇÃO: CONTEXTO DA COVID-19', 1),
+        ('1.1', 'Objetivos', 2),
+        ('2', 'METODOLOGIA (2020-2021)', 1),
+    ]
+    assert verificar_estrutura(raiz) == []
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Análise de referências NBR 6023 (FormatadorABNT.analisar_referencia) e sua gravação na
+biblioteca de referências
+"""
+
+import os
+import sqlite3
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from biblioteca_referencias import BibliotecaReferencias  # noqa: E402
+from motor_abnt import FormatadorABNT  # noqa: E402
+
+REFERENCIA_ONLINE = ("SOUZA, Maria. Artigo online. Revista X, v. 2, 2019. "
+                     "Disponível em: http://x.org. Acesso em: 10 jan. 2024.")
+
+
+def test_ano_de_referencia_impressa():
+    campos = FormatadorABNT.analisar_referencia("SILVA, João. Livro. 2. ed. São Paulo: Atlas, 2018.")
+    assert (campos['sobrenome'], campos['ano']) == ('SILVA', '2018')
+
+
+def test_ano_de_referencia_online_ignora_data_de_acesso():
+    campos = FormatadorABNT.analisar_referencia(REFERENCIA_ONLINE)
+    assert (campos['sobrenome'], campos['ano']) == ('SOUZA', '2019')
+
+
+def test_biblioteca_grava_ano_da_imprenta():
+    biblioteca = BibliotecaReferencias(':memory:')
+    try:
+        biblioteca.adicionar([REFERENCIA_ONLINE])
+        assert [c['texto'] for c in biblioteca.buscar('2019')] == [REFERENCIA_ONLINE]
+        assert biblioteca.buscar('2024') == []
+    finally:
+        biblioteca.fechar()
+
+
+def test_biblioteca_reanalisa_banco_anterior(tmp_path):
+    caminho = str(tmp_path / 'referencias.sqlite3')
+    BibliotecaReferencias(caminho).fechar()
+    # Banco gravado pela análise anterior, que usava a data de acesso como ano
+    with sqlite3.connect(caminho) as conexao:
+        linha = BibliotecaReferencias._linha(REFERENCIA_ONLINE)
+        conexao.execute('INSERT INTO referencias (texto, chave_autor, ano, chave_titulo, campos) '
+                        'VALUES (?, ?, ?, ?, ?)', linha[:2] + ('2024',) + linha[3:])
+        conexao.execute('PRAGMA user_version = 0')
+    conexao.close()
+
+    biblioteca = BibliotecaReferencias(caminho)
+    try:
+        assert [c['ano'] for c in biblioteca.buscar('2019')] == ['2019']
+        assert biblioteca.buscar('2024') == []
+    finally:
+        biblioteca.fechar()
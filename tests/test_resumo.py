@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""
+Resumo (motor_abnt.adicionar_resumo): a linha de palavras-chave só sai quando informada
+"""
+
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from motor_abnt import GeradorDocumentoABNT  # noqa: E402
+
+
+@pytest.mark.parametrize('palavras_chave, linhas', [('ABNT; formatação', 1), ('', 0), ('  ', 0)])
+def test_linha_de_palavras_chave(palavras_chave, linhas):
+    gerador = GeradorDocumentoABNT()
+    gerador.adicionar_resumo('Texto do resumo.', palavras_chave, quebra_pagina=False)
+
+    textos = [p.text for p in gerador.doc.paragraphs]
+    assert 'Texto do resumo.' in textos
+    assert sum(t.startswith('Palavras-chave:') for t in textos) == linhas
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Regressão da varredura de citações (varredura_citacoes) contra as implementações anteriores
+mantidas nos benchmarks: formatar_citacoes de duas passagens de re.sub e as expressões
+regulares de bench_citacoes_adversarial, em texto corrido, nas entradas patológicas e em
+textos aleatórios com semente fixa.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, 'benchmarks'))
+
+from bench_citacoes import formatar_citacoes_duas_passagens  # noqa: E402
+from bench_citacoes_adversarial import FAMILIAS, conferir, texto_aleatorio  # noqa: E402
+from motor_abnt import FormatadorABNT  # noqa: E402
+from sintetico import texto_corrido  # noqa: E402
+
+# Tamanhos pequenos: as expressões anteriores retrocedem exponencialmente em algumas famílias
+TAMANHOS_PATOLOGICOS = (1, 2, 5, 12)
+
+EXEMPLOS = [
+    "Segundo (Silva, 2020), o tema é relevante.",
+    "(Silva; Souza, 2019, p. 12-15) e (Costa et al., 2021a).",
+    "(Silva; Souza; Costa; Lima, 2018, p. 3) analisaram os dados.",
+    "(Silva da Costa; Souza; Lima; Rocha, 2017) e (ANDRADE, 2015).",
+    "(Ávila; Érico; Ünal; Çelik, 2022) sem espaço(Silva,2020)fim",
+    "Texto sem citações, (entre parênteses) e (1999).",
+]
+
+
+@pytest.mark.parametrize('texto', EXEMPLOS + [texto_corrido(20000, densidade_citacoes=0.5)])
+def test_formatar_citacoes_igual_duas_passagens(texto):
+    assert FormatadorABNT.formatar_citacoes(texto) == formatar_citacoes_duas_passagens(texto)
+
+
+@pytest.mark.parametrize('n', TAMANHOS_PATOLOGICOS)
+@pytest.mark.parametrize('familia', FAMILIAS)
+def test_entradas_patologicas(familia, n):
+    texto = FAMILIAS[familia](n)
+    assert FormatadorABNT.formatar_citacoes(texto) == formatar_citacoes_duas_passagens(texto)
+    assert conferir(texto) == []
+
+
+def test_textos_aleatorios():
+    gerador = random.Random(0)
+    for _ in range(2000):
+        texto = texto_aleatorio(gerador)
+        for variante in (texto, texto.lstrip('('), texto.upper()):
+            formatado = FormatadorABNT.formatar_citacoes(variante)
+            assert formatado == formatar_citacoes_duas_passagens(variante), variante
+            assert conferir(variante) == [], variante
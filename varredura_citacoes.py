@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Varredura de citações em tempo linear, sem retrocesso
+
+Substitui as expressões regulares de citação do motor e da conferência: cada etapa
+avança por um trecho máximo de uma única classe de caracteres (letras, espaços,
+dígitos...) e nunca volta atrás. Como nenhum caractere entre um parêntese e o
+seguinte é examinado mais de uma vez por tentativa, o tempo é proporcional ao
+tamanho do texto para qualquer entrada, inclusive parênteses longos sem ano,
+listas enormes de autores ou espaços repetidos.
+
+O resultado é o mesmo das expressões regulares anteriores (conferido por
+benchmarks/bench_citacoes_adversarial.py, que as mantém como referência):
+    citação:  \\(([A-Za-zÀ-ÿ][A-Za-zÀ-ÿ\\s,;]+\\d{4}[a-z]?(?:,\\s*p\\.\\s*\\d+(?:-\\d+)?)?)\\)
+    et al.:   [A-ZÀ-Ü][A-Za-zÀ-ü]+(?:\\s+[a-zà-ü]+)*(?:;\\s*[A-ZÀ-Ü][A-Za-zÀ-ü]+(?:\\s+[a-zà-ü]+)*){3,}
+              [,\\s]+\\d{4}[a-z]?(?:,\\s*p\\.\\s*\\d+(?:-\\d+)?)?  (texto inteiro)
+    obras:    (?:^|;)\\s*([^\\d,;]+?)(?:;[^\\d,;]+?)*,\\s*(\\d{4})[a-z]?
+    et al. no nome:  \\s+et\\s+al\\.? (sem distinguir maiúsculas)
+"""
+
+import re
+
+
+# Trechos máximos de uma classe (um único laço em C, sem alternativas a tentar)
+_ESPACOS = re.compile(r'\s*')
+_DIGITOS = re.compile(r'\d*')
+_CORPO_CITACAO = re.compile(r'[A-Za-zÀ-ÿ\s,;]*')
+_LETRAS_AUTOR = re.compile(r'[A-Za-zÀ-ü]*')
+_MINUSCULAS = re.compile(r'[a-zà-ü]*')
+_SEPARADOR_ANO = re.compile(r'[,\s]*')
+_NOME_OBRA = re.compile(r'[^\d,;]*')
+_PROXIMO_ESPACO = re.compile(r'\s')
+
+
+def _fim(classe, texto, posicao):
+    """Fim do trecho máximo de classe que começa em posicao"""
+    return classe.match(texto, posicao).end()
+
+
+def _letra(caractere):
+    return 'A' <= caractere <= 'Z' or 'a' <= caractere <= 'z' or 'À' <= caractere <= 'ÿ'
+
+
+def _maiuscula(caractere):
+    return 'A' <= caractere <= 'Z' or 'À' <= caractere <= 'Ü'
+
+
+def _fim_ano(texto, posicao):
+    """
+    Fim de "2021", "2021a", "2021, p. 10" ou "2021, p. 10-12" a partir de posicao,
+    ou -1 (o que vem depois fica a cargo de quem chama)
+    """
+    if _fim(_DIGITOS, texto, posicao) - posicao < 4:
+        return -1
+    posicao += 4
+    if 'a' <= texto[posicao:posicao + 1] <= 'z':
+        posicao += 1
+
+    if not texto.startswith(',', posicao):
+        return posicao
+
+    # Página: ", p. 10" ou ", p. 10-12"
+    posicao = _fim(_ESPACOS, texto, posicao + 1)
+    if not texto.startswith('p.', posicao):
+        return -1
+    inicio = _fim(_ESPACOS, texto, posicao + 2)
+    posicao = _fim(_DIGITOS, texto, inicio)
+    if posicao == inicio:
+        return -1
+    if texto.startswith('-', posicao):
+        fim = _fim(_DIGITOS, texto, posicao + 1)
+        if fim > posicao + 1:
+            posicao = fim
+    return posicao
+
+
+def _fim_citacao(texto, abre):
+    """Fim (após o ')') da citação que começa no parêntese em abre, ou -1"""
+    if not _letra(texto[abre + 1:abre + 2]):
+        return -1
+
+    # Autores: letras, espaços, vírgulas e ponto e vírgula (nunca dígitos nem parênteses)
+    inicio_corpo = abre + 2
+    fim_corpo = _fim(_CORPO_CITACAO, texto, inicio_corpo)
+    if fim_corpo == inicio_corpo:
+        return -1
+
+    fim = _fim_ano(texto, fim_corpo)
+    if fim < 0 or not texto.startswith(')', fim):
+        return -1
+    return fim + 1
+
+
+def varrer_citacoes(texto):
+    """Gera (inicio, fim) de cada citação entre parênteses, da esquerda para a direita"""
+    abre = texto.find('(')
+    while abre >= 0:
+        fim = _fim_citacao(texto, abre)
+        if fim < 0:
+            abre = texto.find('(', abre + 1)
+        else:
+            yield abre, fim
+            abre = texto.find('(', fim)
+
+
+def _fim_autor_et_al(texto, posicao):
+    """Fim de um autor "SOBRENOME[ partícula...]" a partir de posicao, ou -1"""
+    if not _maiuscula(texto[posicao:posicao + 1]):
+        return -1
+    fim = _fim(_LETRAS_AUTOR, texto, posicao + 1)
+    if fim == posicao + 1:
+        return -1
+
+    # Partículas em minúsculas ("da", "de", "et al")
+    while True:
+        espacos = _fim(_ESPACOS, texto, fim)
+        minusculas = _fim(_MINUSCULAS, texto, espacos)
+        if espacos == fim or minusculas == espacos:
+            return fim
+        fim = minusculas
+
+
+def e_citacao_et_al(conteudo):
+    """Conteúdo de citação com 4 ou mais autores seguidos do ano (candidato a et al.)"""
+    posicao = _fim_autor_et_al(conteudo, 0)
+    coautores = 0
+    while posicao >= 0 and conteudo.startswith(';', posicao):
+        posicao = _fim_autor_et_al(conteudo, _fim(_ESPACOS, conteudo, posicao + 1))
+        coautores += 1
+
+    if posicao < 0 or coautores < 3:
+        return False
+
+    inicio_ano = _fim(_SEPARADOR_ANO, conteudo, posicao)
+    if inicio_ano == posicao:
+        return False
+    return _fim_ano(conteudo, inicio_ano) == len(conteudo)
+
+
+def obras_citadas(conteudo):
+    """
+    [(autor, ano)] de cada obra "AUTOR[; COAUTOR...], ano" dentro dos parênteses
+    Cada caractere é examinado uma vez: quando uma lista de autores não termina em
+    ", ano", nenhuma obra começa dentro dela e a busca continua depois da falha
+    """
+    obras = []
+    inicio = 1 if conteudo.startswith(';') else 0
+
+    while inicio >= 0:
+        fim_nome = _fim(_NOME_OBRA, conteudo, inicio)
+        falha = inicio
+
+        if fim_nome > inicio:
+            posicao = fim_nome
+            while conteudo.startswith(';', posicao):
+                fim = _fim(_NOME_OBRA, conteudo, posicao + 1)
+                if fim == posicao + 1:
+                    break
+                posicao = fim
+            falha = posicao
+
+            if conteudo.startswith(',', posicao):
+                inicio_ano = _fim(_ESPACOS, conteudo, posicao + 1)
+                falha = posicao + 1
+                if _fim(_DIGITOS, conteudo, inicio_ano) - inicio_ano >= 4:
+                    nome = conteudo[inicio:fim_nome]
+                    # Espaços iniciais ficam fora do autor (mas o autor tem ao menos um caractere)
+                    autor = nome.lstrip() or nome[-1]
+                    obras.append((autor, conteudo[inicio_ano:inicio_ano + 4]))
+
+                    falha = inicio_ano + 4
+                    if 'a' <= conteudo[falha:falha + 1] <= 'z':
+                        falha += 1
+
+        proximo = conteudo.find(';', falha)
+        inicio = proximo + 1 if proximo >= 0 else -1
+
+    return obras
+
+
+def remover_et_al(nome):
+    """Remove " et al." / " et al" (qualquer caixa) do nome"""
+    partes = []
+    copiado = 0
+    busca = _PROXIMO_ESPACO.search(nome)
+
+    while busca is not None:
+        inicio = busca.start()
+        posicao = _fim(_ESPACOS, nome, inicio)
+        fim = -1
+        if nome[posicao:posicao + 2].lower() == 'et':
+            segundo = _fim(_ESPACOS, nome, posicao + 2)
+            if segundo > posicao + 2 and nome[segundo:segundo + 2].lower() == 'al':
+                fim = segundo + 2
+                if nome.startswith('.', fim):
+                    fim += 1
+
+        if fim < 0:
+            busca = _PROXIMO_ESPACO.search(nome, posicao)
+        else:
+            partes.append(nome[copiado:inicio])
+            copiado = fim
+            busca = _PROXIMO_ESPACO.search(nome, fim)
+
+    if not partes:
+        return nome
+    partes.append(nome[copiado:])
+    return ''.join(partes)